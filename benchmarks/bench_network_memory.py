@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+"""
+bench_network_memory.py
+- Measures memory held by 1M network observations (e.g. 1000 APs x 1000
+  scans of history) as dict-per-observation rows versus Network records
+  produced by parse_nmcli_terse.
+- parse_nmcli_terse also interns strings and reuses int objects, so the dict
+  rows are measured both plain and with the same value sharing; the two
+  savings (value sharing, then the __slots__ layout) are reported separately.
+
+Usage:
+    python -m benchmarks.bench_network_memory [--aps 1000] [--scans 1000]
+"""
+import argparse
+import gc
+import tracemalloc
+from sys import intern
+
+from benchmarks.synthetic import synthetic_scan
+from src.scanner.wifi_scanner import parse_nmcli_terse
+
+
+def _dict_rows(raw: str, share: bool = False):
+    """
+    Dict-per-observation rows, as the scanner produced before Network existed.
+    With `share`, strings are interned and equal ints reused, like parse_nmcli_terse.
+    """
+    ints = {}
+    text = intern if share else str
+    number = (lambda v: ints.setdefault(v, int(v))) if share else int
+    rows = []
+    for line in raw.replace("\\:", "\x01").split("\n"):
+        parts = line.split(":")
+        if len(parts) != 8:
+            continue
+        ssid, bssid, security, signal, chan, freq, rate, mode = parts
+        rows.append({
+            "ssid": text(ssid), "security": text(security or "--"), "signal": number(signal),
+            "bssid": text(bssid.replace("\x01", ":")), "channel": number(chan),
+            "frequency": number(freq.split()[0]), "rate": number(rate.split()[0]), "mode": text(mode),
+        })
+    return rows
+
+
+def _shared_dict_rows(raw: str):
+    return _dict_rows(raw, share=True)
+
+
+def _measure(build, raw: str, scans: int):
+    gc.collect()
+    tracemalloc.start()
+    history = []
+    for _ in range(scans):
+        history.extend(build(raw))
+    current, _peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return len(history), current
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Memory per network observation")
+    parser.add_argument("--aps", type=int, default=1000)
+    parser.add_argument("--scans", type=int, default=1000)
+    args = parser.parse_args()
+
+    _tabular, terse = synthetic_scan(args.aps)
+    sizes = {}
+    for label, build in (("dict rows", _dict_rows), ("dict rows, shared", _shared_dict_rows),
+                         ("Network records", parse_nmcli_terse)):
+        count, size = _measure(build, terse, args.scans)
+        sizes[label] = size / count
+        print(f"{label:18s}: {count:,} observations, {size / 2**20:8.1f} MB, {size / count:6.0f} B/observation")
+    print(f"value sharing saves {sizes['dict rows'] - sizes['dict rows, shared']:.0f} B/observation; "
+          f"__slots__ layout saves {sizes['dict rows, shared'] - sizes['Network records']:.0f} B/observation")
+
+if __name__ == "__main__":
+    main()
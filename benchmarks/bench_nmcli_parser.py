@@ -0,0 +1,37 @@
+#!/usr/bin/env python3
+"""
+bench_nmcli_parser.py
+- Compares the tabular parser (parse_nmcli_output) with the terse parser
+  (parse_nmcli_terse) on the same synthetic scan rendered both ways.
+
+Usage:
+    python -m benchmarks.bench_nmcli_parser [--lines 100000] [--repeat 5]
+"""
+import argparse
+import timeit
+
+from benchmarks.synthetic import synthetic_scan
+from src.scanner.wifi_scanner import parse_nmcli_output, parse_nmcli_terse
+
+
+def _best_of(fn, arg, repeat: int) -> float:
+    # timeit disables the cyclic GC while timing, which keeps runs comparable
+    return min(timeit.repeat(lambda: fn(arg), number=1, repeat=repeat))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark nmcli output parsers")
+    parser.add_argument("--lines", type=int, default=100_000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    tabular, terse = synthetic_scan(args.lines)
+    t_tab = _best_of(parse_nmcli_output, tabular, args.repeat)
+    t_terse = _best_of(parse_nmcli_terse, terse, args.repeat)
+    print(f"parse_nmcli_output (tabular, 3 fields): {t_tab * 1000:8.1f} ms  ({args.lines / t_tab:,.0f} lines/s)")
+    print(f"parse_nmcli_terse  (terse, 8 fields):   {t_terse * 1000:8.1f} ms  ({args.lines / t_terse:,.0f} lines/s)")
+    print(f"speedup: {t_tab / t_terse:.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+"""
+bench_startup.py
+- Measures CLI cold-start cost with `python -X importtime` and checks it
+  against benchmarks/startup_budget.json.
+- For each scenario, only modules that a bare `python -c pass` does not
+  already import are counted, so interpreter/site start-up is excluded.
+- Exits non-zero when a scenario imports a forbidden heavy module (jinja2,
+  pandas, scapy, ...), imports more modules than budgeted, or exceeds its
+  import-time budget.
+
+Usage:
+    python -m benchmarks.bench_startup [--runs 5] [--update-budget]
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+from typing import Dict, List, Optional, Set, Tuple
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+BUDGET_FILE = os.path.join(ROOT, "benchmarks", "startup_budget.json")
+
+SCENARIOS = {
+    "import": ["-c", "import src.main"],
+    "help": ["-m", "src.main", "--help"],
+    "scan": ["-m", "src.main", "--scan", "--fresh"],
+}
+
+# headroom applied when --update-budget records new limits
+TIME_HEADROOM = 2.0
+MODULE_HEADROOM = 10
+
+
+def _importtime(argv: List[str], env: Optional[Dict[str, str]] = None) -> Dict[str, int]:
+    """Run python -X importtime (with `env` added to the environment) and return {module: self_us}."""
+    env = dict(os.environ, **(env or {}), PYTHONPATH=ROOT, PYTHONDONTWRITEBYTECODE="")
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", *argv],
+        cwd=ROOT, env=env, capture_output=True, text=True, timeout=60,
+    )
+    modules = {}
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "imported package" in line:
+            continue
+        self_us, _cumulative, name = line[len("import time:"):].split("|", 2)
+        modules[name.strip()] = int(self_us)
+    return modules
+
+
+def measure(argv: List[str], runs: int = 5, env: Optional[Dict[str, str]] = None) -> Tuple[int, Set[str]]:
+    """Best-of-`runs` import time (us) and the set of modules the scenario adds."""
+    baseline = set(_importtime(["-c", "pass"]))
+    best = None
+    extra: Set[str] = set()
+    for _ in range(runs):
+        modules = _importtime(argv, env)
+        extra = set(modules) - baseline
+        total = sum(modules[m] for m in extra)
+        best = total if best is None else min(best, total)
+    return best or 0, extra
+
+
+def load_budget() -> Dict:
+    with open(BUDGET_FILE) as fh:
+        return json.load(fh)
+
+
+def check(name: str, total_us: int, extra: Set[str], budget: Dict) -> List[str]:
+    problems = []
+    spec = budget["scenarios"].get(name, {})
+    loaded = {m.split(".")[0] for m in extra}
+    for mod in budget.get("forbidden_modules", []):
+        if mod in loaded:
+            problems.append(f"{name}: imports forbidden module {mod!r}")
+    if "max_modules" in spec and len(extra) > spec["max_modules"]:
+        problems.append(f"{name}: {len(extra)} modules imported (budget {spec['max_modules']})")
+    if "max_import_us" in spec and total_us > spec["max_import_us"]:
+        problems.append(f"{name}: {total_us / 1000:.1f} ms import time (budget {spec['max_import_us'] / 1000:.1f} ms)")
+    return problems
+
+
+def main():
+    parser = argparse.ArgumentParser(description="CLI start-up import budget")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--update-budget", action="store_true", help="Record current numbers (with headroom) as the budget")
+    args = parser.parse_args()
+
+    budget = load_budget()
+    problems = []
+    for name, argv in SCENARIOS.items():
+        total_us, extra = measure(argv, args.runs)
+        print(f"{name:8s}: {total_us / 1000:7.1f} ms, {len(extra):4d} modules")
+        if args.update_budget:
+            budget["scenarios"][name] = {
+                "max_import_us": int(total_us * TIME_HEADROOM),
+                "max_modules": len(extra) + MODULE_HEADROOM,
+            }
+        problems += check(name, total_us, extra, budget)
+
+    if args.update_budget:
+        with open(BUDGET_FILE, "w") as fh:
+            json.dump(budget, fh, indent=2)
+            fh.write("\n")
+        print(f"budget written to {BUDGET_FILE}")
+    for p in problems:
+        print(f"REGRESSION {p}")
+    sys.exit(1 if problems else 0)
+
+
+if __name__ == "__main__":
+    main()
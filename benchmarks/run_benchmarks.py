@@ -0,0 +1,151 @@
+#!/usr/bin/env python3
+"""
+run_benchmarks.py
+- Benchmark suite for the scanner, report and capture hot paths at several
+  input sizes, on seeded synthetic data (see synthetic.py).
+- Results are written as JSON so runs can be compared; --compare flags any
+  case that got slower than the baseline by more than --threshold and exits
+  non-zero.
+
+Usage:
+    python -m benchmarks.run_benchmarks [--profile quick|full] [--output results.json]
+    python -m benchmarks.run_benchmarks --compare baseline.json --threshold 1.25
+"""
+import argparse
+import json
+import os
+import platform
+import shutil
+import sys
+import tempfile
+import time
+import timeit
+from typing import Callable, Dict, List, Optional
+
+from benchmarks import synthetic
+from src.capture.pcap_parser import pcap_contains_handshake
+from src.report.report_generator import generate_report
+from src.scanner.encryption_parser import classify_batch, classify_security
+from src.scanner.signal_utils import signal_to_quality
+from src.scanner.wifi_scanner import parse_nmcli_output, parse_nmcli_terse
+
+PROFILES = {
+    "smoke": {"rows": [100], "reports": [100], "capture_mb": [1], "repeat": 1},
+    "quick": {"rows": [1_000, 10_000], "reports": [1_000, 10_000], "capture_mb": [1, 16], "repeat": 3},
+    "full": {"rows": [1_000, 10_000, 100_000], "reports": [1_000, 10_000, 100_000],
+             "capture_mb": [1, 16, 128], "repeat": 5},
+}
+
+
+class Case:
+    """One benchmark: `setup(size)` builds the input once, `run(data)` is timed."""
+
+    def __init__(self, name: str, sizes: List[int], setup: Callable, run: Callable, unit: str = "items"):
+        self.name = name
+        self.sizes = sizes
+        self.setup = setup
+        self.run = run
+        self.unit = unit
+
+
+def build_cases(profile: Dict, workdir: str) -> List[Case]:
+    rows, reports = profile["rows"], profile["reports"]
+
+    def report_case(ext):
+        def setup(n):
+            return synthetic.synthetic_networks(n), os.path.join(workdir, f"report-{n}.{ext}")
+        return Case(f"generate_report[{ext}]", reports, setup, lambda d: generate_report(*d), "networks")
+
+    def capture_setup(mb):
+        path = os.path.join(workdir, f"capture-{mb}.cap")
+        synthetic.write_synthetic_capture(path, mb * 1024 * 1024)
+        return path
+
+    return [
+        Case("parse_nmcli_output", rows, lambda n: synthetic.synthetic_scan(n)[0], parse_nmcli_output, "lines"),
+        Case("parse_nmcli_terse", rows, lambda n: synthetic.synthetic_scan(n)[1], parse_nmcli_terse, "lines"),
+        Case("classify_security", rows, synthetic.synthetic_security_strings,
+             lambda strings: [classify_security(s) for s in strings], "strings"),
+        Case("classify_batch", rows, synthetic.synthetic_security_strings, classify_batch, "strings"),
+        Case("signal_to_quality", rows, lambda n: [i % 101 for i in range(n)],
+             lambda signals: [signal_to_quality(s) for s in signals], "signals"),
+        report_case("json"),
+        report_case("html"),
+        Case("pcap_contains_handshake", profile["capture_mb"], capture_setup, pcap_contains_handshake, "MB"),
+    ]
+
+
+def run_suite(profile_name: str = "quick", only: Optional[str] = None) -> Dict:
+    profile = PROFILES[profile_name]
+    workdir = tempfile.mkdtemp(prefix="wifi-bench-")
+    results = []
+    try:
+        for case in build_cases(profile, workdir):
+            if only and only not in case.name:
+                continue
+            for size in case.sizes:
+                data = case.setup(size)
+                # timeit turns the cyclic GC off while timing, keeping runs comparable
+                times = timeit.repeat(lambda: case.run(data), number=1, repeat=profile["repeat"])
+                best = min(times)
+                results.append({
+                    "name": case.name,
+                    "size": size,
+                    "unit": case.unit,
+                    "best_s": best,
+                    "mean_s": sum(times) / len(times),
+                    "per_unit_us": best / size * 1e6,
+                    "repeat": profile["repeat"],
+                })
+                print(f"{case.name:28s} {size:>8} {case.unit:8s} best {best * 1000:9.2f} ms"
+                      f"  ({best / size * 1e6:8.3f} us/{case.unit[:-1] if case.unit.endswith('s') else case.unit})")
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+    return {
+        "meta": {
+            "timestamp": time.time(),
+            "profile": profile_name,
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+        },
+        "results": results,
+    }
+
+
+def compare(current: Dict, baseline: Dict, threshold: float) -> List[str]:
+    """Cases whose best time grew by more than `threshold` x versus the baseline."""
+    base = {(r["name"], r["size"]): r for r in baseline.get("results", [])}
+    regressions = []
+    for r in current["results"]:
+        old = base.get((r["name"], r["size"]))
+        if old and old["best_s"] > 0 and r["best_s"] / old["best_s"] > threshold:
+            regressions.append(
+                f"{r['name']}[{r['size']}]: {old['best_s'] * 1000:.2f} ms -> {r['best_s'] * 1000:.2f} ms "
+                f"({r['best_s'] / old['best_s']:.2f}x)")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark suite for scanner/report/capture hot paths")
+    parser.add_argument("--profile", choices=sorted(PROFILES), default="quick")
+    parser.add_argument("--only", type=str, help="Run only cases whose name contains this text")
+    parser.add_argument("--output", type=str, default="bench_results.json", help="Write results JSON here")
+    parser.add_argument("--compare", type=str, help="Baseline results JSON to compare against")
+    parser.add_argument("--threshold", type=float, default=1.25, help="Slowdown ratio flagged as a regression")
+    args = parser.parse_args()
+
+    current = run_suite(args.profile, args.only)
+    with open(args.output, "w") as fh:
+        json.dump(current, fh, indent=2)
+    print(f"results written to {args.output}")
+
+    if args.compare:
+        with open(args.compare) as fh:
+            regressions = compare(current, json.load(fh), args.threshold)
+        for line in regressions:
+            print(f"REGRESSION {line}")
+        sys.exit(1 if regressions else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+"""
+synthetic.py
+- Synthetic inputs shared by the benchmarks: nmcli output (tabular and
+  terse), network lists and libpcap capture files.
+- Access points come from src.scanner.replay.synthetic_access_points, the
+  generator behind --replay-synthetic, so benchmarks and replays see the
+  same data.
+- Everything is seeded, so runs on different machines/commits see the same data.
+"""
+import random
+import struct
+from typing import List
+
+from src.scanner.network import Network
+from src.scanner.replay import SYNTHETIC_CHANNELS as CHANNELS
+from src.scanner.replay import SYNTHETIC_SECURITIES as SECURITIES
+from src.scanner.replay import synthetic_access_points, synthetic_terse_scan
+
+
+def synthetic_scan(lines: int, seed: int = 0):
+    """Return (tabular, terse) renderings of the same `lines` access points."""
+    tabular = ["SSID                 SECURITY     SIGNAL"]
+    for ssid, _bssid, sec, sig, _chan, _freq in synthetic_access_points(lines, seed=seed):
+        tabular.append(f"{ssid:<20} {sec or '--':<12} {sig}")
+    return "\n".join(tabular) + "\n", synthetic_terse_scan(lines, seed=seed)
+
+
+def synthetic_networks(count: int, seed: int = 0) -> List[Network]:
+    """`count` Network records with realistic field variety."""
+    rnd = random.Random(seed)
+    nets = []
+    for i in range(count):
+        chan, freq = rnd.choice(CHANNELS)
+        nets.append(Network(
+            f"net-{i % 5000}", rnd.choice(SECURITIES) or "--", rnd.randint(5, 99),
+            bssid=":".join(f"{b:02x}" for b in i.to_bytes(6, "big")),
+            channel=chan, frequency=freq, rate=130, mode="Infra",
+        ))
+    return nets
+
+
+def synthetic_security_strings(count: int, seed: int = 0) -> List[str]:
+    rnd = random.Random(seed)
+    return [rnd.choice(SECURITIES) or "--" for _ in range(count)]
+
+
+RADIOTAP = b"\x00\x00\x08\x00\x00\x00\x00\x00"
+LLC_EAPOL = b"\xaa\xaa\x03\x00\x00\x00\x88\x8e"
+LLC_IPV4 = b"\xaa\xaa\x03\x00\x00\x00\x08\x00"
+STA = bytes.fromhex("66778899aabb")
+
+
+def _data_frame(bssid: bytes, payload: bytes, from_ap: bool = True) -> bytes:
+    if from_ap:
+        hdr = b"\x88\x02\x00\x00" + STA + bssid + bssid
+    else:
+        hdr = b"\x88\x01\x00\x00" + bssid + STA + bssid
+    return RADIOTAP + hdr + b"\x00\x00\x00\x00" + payload
+
+
+def _eapol(bssid: bytes, key_info: int, from_ap: bool) -> bytes:
+    body = b"\x02\x03\x00\x5f\x02" + struct.pack(">H", key_info) + b"\x00" * 93
+    return _data_frame(bssid, LLC_EAPOL + body, from_ap)
+
+
+def _record(frame: bytes) -> bytes:
+    return struct.pack("<IIII", 0, 0, len(frame), len(frame)) + frame
+
+
+def write_synthetic_capture(path: str, size_bytes: int, handshake_every: int = 256) -> int:
+    """Write a capture of roughly `size_bytes`; returns the number of records."""
+    filler = _record(_data_frame(bytes(6), LLC_IPV4 + b"\x45" + b"\x00" * 1400))
+    chunk = filler * handshake_every
+    records = 0
+    written = 0
+    ap = 0
+    with open(path, "wb") as fh:
+        fh.write(struct.pack("<IHHiIII", 0xA1B2C3D4, 2, 4, 0, 0, 65535, 127))
+        while written < size_bytes:
+            bssid = struct.pack(">HI", 0x0200, ap % 1024)
+            hs = b"".join(_record(_eapol(bssid, ki, ki & 0x80 != 0)) for ki in (0x008A, 0x010A, 0x13CA, 0x030A))
+            fh.write(chunk)
+            fh.write(hs)
+            written += len(chunk) + len(hs)
+            records += handshake_every + 4
+            ap += 1
+    return records
+
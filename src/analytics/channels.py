@@ -0,0 +1,204 @@
+"""
+channels.py
+- Channel occupancy and co-channel interference across a batch of scans,
+  computed on a history frame (signal_history.load_history/history_from_scans)
+  with vectorized pandas/NumPy operations only.
+- Band comes from the frequency (filled in from the channel number when the
+  scan did not report one): 2.4 GHz, 5 GHz or 6 GHz.
+- Overlap between two channels is 1 - |f1 - f2| / width, clipped to [0, 1],
+  with a 22 MHz width on 2.4 GHz (so 1/6/11 do not overlap, 1/2 mostly do)
+  and 20 MHz on 5/6 GHz (only co-channel APs interfere). Channels in different
+  bands never overlap.
+- Load of a channel = summed signal weight (signal / 100) of its APs, averaged
+  per scan. Congestion of a channel = its overlap-weighted sum of the loads of
+  every channel, i.e. "full-strength APs heard on or over this channel".
+- Everything is computed from per-scan channel totals (scan_loads), so long
+  history windows can be aggregated in SQL first (aggregated_channel_report).
+"""
+from typing import Dict, Iterable, List, Optional
+
+import numpy as np
+import pandas as pd
+
+BAND_24 = "2.4GHz"
+BAND_5 = "5GHz"
+BAND_6 = "6GHz"
+CHANNEL_WIDTH_MHZ = {BAND_24: 22.0, BAND_5: 20.0, BAND_6: 20.0}
+
+
+def channel_frequency(channel) -> np.ndarray:
+    """Centre frequency (MHz) of 2.4/5 GHz channel numbers; NaN where unknown."""
+    ch = np.asarray(channel, dtype=float)
+    return np.select(
+        [ch == 14, (ch >= 1) & (ch <= 13), (ch >= 32) & (ch <= 177)],
+        [2484.0, 2407.0 + 5 * ch, 5000.0 + 5 * ch], np.nan)
+
+
+def frequency_channel(frequency) -> np.ndarray:
+    """Channel number for a centre frequency (MHz); NaN outside the Wi-Fi bands."""
+    f = np.asarray(frequency, dtype=float)
+    return np.select(
+        [f == 2484, (f >= 2412) & (f <= 2472), (f >= 4910) & (f <= 5885), (f >= 5955) & (f <= 7115)],
+        [14.0, (f - 2407) / 5, (f - 5000) / 5, (f - 5950) / 5], np.nan)
+
+
+def frequency_band(frequency) -> np.ndarray:
+    """Band label per frequency ("" outside the Wi-Fi bands)."""
+    f = np.asarray(frequency, dtype=float)
+    return np.select(
+        [(f >= 2400) & (f < 2500), (f >= 4900) & (f < 5925), (f >= 5925) & (f <= 7125)],
+        [BAND_24, BAND_5, BAND_6], "")
+
+
+def _normalise(frame: pd.DataFrame) -> pd.DataFrame:
+    """
+    Rows of `frame` with a usable channel/frequency: fills each from the other,
+    adds "band" and drops rows outside the Wi-Fi bands.
+    """
+    freq = pd.to_numeric(frame["frequency"], errors="coerce").to_numpy(dtype=float)
+    chan = pd.to_numeric(frame["channel"], errors="coerce").to_numpy(dtype=float)
+    freq = np.where(np.isnan(freq), channel_frequency(chan), freq)
+    chan = np.where(np.isnan(chan), frequency_channel(freq), chan)
+    out = frame.assign(band=frequency_band(freq), channel=chan, frequency=freq)
+    out = out[(out["band"] != "") & out["channel"].notna()].reset_index(drop=True)
+    out["channel"] = out["channel"].astype("int64")
+    out["frequency"] = out["frequency"].astype("int64")
+    return out
+
+
+def channel_frame(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Observations of a history frame that have a usable channel/frequency.
+    Columns: ts, key, signal, channel, frequency, band, weight (signal / 100).
+    """
+    out = _normalise(pd.DataFrame({
+        "ts": df["ts"].to_numpy(),
+        "key": df["key"].astype("string").to_numpy(),
+        "signal": df["signal"].to_numpy(),
+        "channel": df["channel"].to_numpy(),
+        "frequency": df["frequency"].to_numpy(),
+    }))
+    out["weight"] = out["signal"].clip(0, 100).astype(float) / 100
+    return out
+
+
+def scan_loads(frame: pd.DataFrame) -> pd.DataFrame:
+    """
+    Per (ts, band, channel) totals of a normalised frame: frequency,
+    observations and weight (summed signal / 100). A channel_frame counts one
+    observation per row; pre-aggregated frames bring their own counts.
+    """
+    if "observations" not in frame:
+        frame = frame.assign(observations=1)
+    return frame.groupby(["ts", "band", "channel"], as_index=False).agg(
+        frequency=("frequency", "first"), observations=("observations", "sum"), weight=("weight", "sum"))
+
+
+def occupancy_histogram(loads: pd.DataFrame, aps: pd.DataFrame) -> pd.DataFrame:
+    """
+    Per (band, channel) occupancy from scan_loads and the distinct
+    (band, channel, key) sightings: frequency, observations, aps (distinct
+    networks), mean_aps and max_aps per scan.
+    """
+    scans = loads["ts"].nunique()
+    grouped = loads.groupby(["band", "channel"])
+    out = pd.DataFrame({
+        "frequency": grouped["frequency"].first(),
+        "observations": grouped["observations"].sum(),
+        "aps": aps.groupby(["band", "channel"])["key"].nunique(),
+        "max_aps": grouped["observations"].max(),
+    })
+    out["mean_aps"] = out["observations"] / scans if scans else 0.0
+    return out
+
+
+def overlap_matrix(frequency, band) -> np.ndarray:
+    """Pairwise spectral overlap (0..1) between channels given by centre frequency and band."""
+    f = np.asarray(frequency, dtype=float)
+    b = np.asarray(band)
+    width = pd.Series(b).map(CHANNEL_WIDTH_MHZ).to_numpy(dtype=float)
+    overlap = 1 - np.abs(f[:, None] - f[None, :]) / np.maximum(width[:, None], width[None, :])
+    overlap = np.clip(overlap, 0, 1)
+    overlap[b[:, None] != b[None, :]] = 0
+    return overlap
+
+
+def interference_matrix(loads: pd.DataFrame) -> pd.DataFrame:
+    """
+    Interference received on each channel (rows) from each channel (columns):
+    overlap x per-scan load of the source channel. Indexed by (band, channel).
+    """
+    scans = loads["ts"].nunique()
+    load = loads.groupby(["band", "channel"])["weight"].sum() / (scans or 1)
+    freq = loads.groupby(["band", "channel"])["frequency"].first()
+    overlap = overlap_matrix(freq.to_numpy(), load.index.get_level_values("band").to_numpy())
+    return pd.DataFrame(overlap * load.to_numpy()[None, :], index=load.index, columns=load.index)
+
+
+def congestion_scores(loads: pd.DataFrame) -> pd.DataFrame:
+    """Per (band, channel): load (own APs), adjacent (overlapping channels) and congestion (both)."""
+    matrix = interference_matrix(loads)
+    own = pd.Series(np.diag(matrix.to_numpy()), index=matrix.index)
+    total = matrix.sum(axis=1)
+    return pd.DataFrame({"load": own, "adjacent": total - own, "congestion": total})
+
+
+def _report(loads: pd.DataFrame, aps: pd.DataFrame, scans: int) -> Dict:
+    if loads.empty:
+        return {"scans": scans, "channels": [], "labels": [], "interference": []}
+    table = occupancy_histogram(loads, aps).join(congestion_scores(loads)).reset_index()
+    table[["mean_aps", "load", "adjacent", "congestion"]] = table[["mean_aps", "load", "adjacent", "congestion"]].round(3)
+    matrix = interference_matrix(loads)
+    labels = [f"{band}:{channel}" for band, channel in matrix.index]
+    rows: List[Dict] = table.to_dict("records")
+    return {
+        "scans": int(loads["ts"].nunique()),
+        "channels": rows,
+        "labels": labels,
+        "interference": matrix.round(3).to_numpy().tolist(),
+    }
+
+
+def channel_report(df: pd.DataFrame) -> Dict:
+    """
+    Report section for a history frame:
+    {"scans": n, "channels": [per-channel rows], "labels": ["2.4GHz:1", ...],
+     "interference": [[...]]}, rows/labels ordered by band then channel.
+    """
+    cf = channel_frame(df)
+    return _report(scan_loads(cf), cf[["band", "channel", "key"]], int(df["ts"].nunique()))
+
+
+def aggregated_channel_report(loads: Iterable[Dict], sightings: Iterable[Dict], scans: int) -> Dict:
+    """
+    channel_report() from pre-aggregated history (HistoryStore.channel_loads /
+    channel_sightings), so long windows never load every observation:
+    `loads` are {"ts", "channel", "frequency", "observations", "weight"} rows,
+    `sightings` distinct {"channel", "frequency", "key"} rows and `scans` the
+    number of scans in the window (reported when no channel is known).
+    """
+    columns = ["ts", "channel", "frequency", "observations", "weight"]
+    frame = _normalise(pd.DataFrame.from_records(loads, columns=columns))
+    aps = _normalise(pd.DataFrame.from_records(sightings, columns=["channel", "frequency", "key"]))
+    return _report(scan_loads(frame), aps, scans)
+
+
+def congestion_by_frequency(report: Dict) -> Dict[int, float]:
+    """Frequency (MHz) -> congestion score, for annotating per-network report rows."""
+    return {int(row["frequency"]): float(row["congestion"]) for row in report["channels"]}
+
+
+def row_frequency(frequency, channel) -> Optional[int]:
+    """
+    Frequency of one report row, normalised like channel_frame does: numeric
+    strings are accepted and a missing frequency is derived from the channel.
+    """
+    try:
+        return int(float(frequency))
+    except (TypeError, ValueError):
+        pass
+    try:
+        derived = float(channel_frequency(float(channel)))
+    except (TypeError, ValueError):
+        return None
+    return None if np.isnan(derived) else int(derived)
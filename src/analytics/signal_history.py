@@ -0,0 +1,88 @@
+"""
+signal_history.py
+- Loads scan history into a pandas DataFrame and computes signal analytics
+  with vectorized operations only (no per-row Python loops):
+  quality buckets, rolling signal mean/variance per network, and per-SSID
+  uptime and flap counts.
+"""
+from typing import Iterable, List, Tuple
+
+import numpy as np
+import pandas as pd
+
+from src.scanner.network import NetworkLike, as_dict
+from src.scanner.signal_utils import EXCELLENT_MIN, FAIR_MIN, GOOD_MIN, QUALITY_LABELS
+
+HISTORY_COLUMNS = ["ts", "ssid", "bssid", "security", "signal", "channel", "frequency"]
+
+
+def history_from_scans(scans: Iterable[Tuple[float, List[NetworkLike]]]) -> pd.DataFrame:
+    """Build a history frame from (unix_timestamp, networks) pairs, one per scan."""
+    rows = ((ts, as_dict(n)) for ts, networks in scans for n in networks)
+    return load_history({"ts": ts, **n} for ts, n in rows)
+
+
+def load_history(records: Iterable[dict]) -> pd.DataFrame:
+    """
+    Build a history frame from observation dicts carrying a "ts" (unix seconds).
+    Adds a "key" column with the network identity (lower-cased BSSID, else SSID),
+    matching scan_diff.network_key.
+    """
+    df = pd.DataFrame.from_records(records, columns=HISTORY_COLUMNS)
+    return prepare_history(df)
+
+
+def prepare_history(df: pd.DataFrame) -> pd.DataFrame:
+    """Normalise column types of a raw history frame and add the "key" column."""
+    df = df.copy()
+    df["ts"] = pd.to_datetime(df["ts"], unit="s") if df["ts"].dtype.kind in "if" else pd.to_datetime(df["ts"])
+    df["signal"] = pd.to_numeric(df["signal"], errors="coerce").fillna(0).astype("int16")
+    df["ssid"] = df["ssid"].astype("category")
+    df["security"] = df["security"].astype("category")
+    bssid = df["bssid"].astype("string").str.lower()
+    df["key"] = bssid.where(bssid.notna() & (bssid != ""), df["ssid"].astype("string")).astype("category")
+    return df
+
+
+def quality_buckets(signal: pd.Series) -> pd.Series:
+    """Vectorized signal_to_quality: Weak/Fair/Good/Excellent as a categorical series."""
+    bins = [-np.inf, FAIR_MIN, GOOD_MIN, EXCELLENT_MIN, np.inf]
+    return pd.cut(signal, bins=bins, labels=list(QUALITY_LABELS), right=False)
+
+
+def rolling_signal_stats(df: pd.DataFrame, window: int = 5) -> pd.DataFrame:
+    """
+    Rolling mean and variance of signal per network over the last `window` sightings.
+    Returns columns key, ts, signal, rolling_mean, rolling_var, sorted by key and ts.
+    """
+    ordered = df.sort_values(["key", "ts"], kind="stable")[["key", "ts", "signal"]].reset_index(drop=True)
+    roll = ordered.groupby("key", observed=True, sort=False)["signal"].rolling(window, min_periods=1)
+    ordered["rolling_mean"] = roll.mean().reset_index(level=0, drop=True)
+    ordered["rolling_var"] = roll.var().reset_index(level=0, drop=True)
+    return ordered
+
+
+def uptime_and_flaps(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Per-SSID availability over the scans in `df` (each distinct ts is one scan).
+    Columns: scans_seen, total_scans, uptime (fraction of scans the SSID was
+    present), flaps (times it disappeared and came back), first_seen, last_seen.
+    """
+    scan_idx = df["ts"].rank(method="dense").astype("int64") - 1
+    total = int(scan_idx.max()) + 1 if len(df) else 0
+    seen = (
+        pd.DataFrame({"ssid": df["ssid"], "scan": scan_idx, "ts": df["ts"]})
+        .drop_duplicates(["ssid", "scan"])
+        .sort_values(["ssid", "scan"], kind="stable")
+    )
+    gaps = seen.groupby("ssid", observed=True)["scan"].diff().gt(1)
+    grouped = seen.assign(gap=gaps).groupby("ssid", observed=True)
+    out = pd.DataFrame({
+        "scans_seen": grouped["scan"].size(),
+        "flaps": grouped["gap"].sum().astype("int64"),
+        "first_seen": grouped["ts"].min(),
+        "last_seen": grouped["ts"].max(),
+    })
+    out.insert(1, "total_scans", total)
+    out.insert(2, "uptime", out["scans_seen"] / total if total else 0.0)
+    return out
@@ -0,0 +1,118 @@
+"""
+capture_audit.py
+- Sweeps a capture folder and checks every capture file for a handshake,
+  including the gzip'd blobs of a CaptureStore.
+- Analysis is fanned out over a process pool; results are kept in an on-disk
+  JSON cache keyed by path, size and mtime so reruns only touch new or
+  changed files. Files that failed to read are not cached, so they are
+  retried on the next run.
+"""
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from src.capture.pcap_parser import capture_format, has_simulated_marker, scan_capture
+from src.capture.pcap_reader import has_handshake
+from src.utils.metrics import inc, span
+
+CAPTURE_EXTENSIONS = (".cap", ".pcap", ".pcapng", ".gz")
+CACHE_VERSION = 1
+# below this many stale files a process pool costs more than it saves
+POOL_THRESHOLD = 32
+
+
+def analyze_capture(path: str) -> Dict:
+    """Analyse one capture file. Never raises; errors are reported in the result."""
+    try:
+        # CaptureStore blobs are gzip'd; they are streamed, not unpacked to disk
+        fmt = capture_format(path)
+        if fmt:
+            bssids = scan_capture(path)
+            return {"format": fmt, "handshake": has_handshake(bssids), "bssids": bssids}
+        return {"format": "simulated", "handshake": has_simulated_marker(path), "bssids": {}}
+    except Exception as exc:
+        return {"format": "", "handshake": False, "bssids": {}, "error": str(exc)}
+
+
+def iter_capture_files(folder: str) -> Iterator[Tuple[str, int, int]]:
+    """Yield (path, size, mtime_ns) for capture files below `folder`."""
+    stack = [folder]
+    while stack:
+        try:
+            it = os.scandir(stack.pop())
+        except OSError:
+            continue
+        with it:
+            for entry in it:
+                if entry.is_dir(follow_symlinks=False):
+                    stack.append(entry.path)
+                elif entry.name.lower().endswith(CAPTURE_EXTENSIONS):
+                    try:
+                        st = entry.stat()
+                    except OSError:
+                        continue
+                    yield entry.path, st.st_size, st.st_mtime_ns
+
+
+def load_cache(cache_path: str) -> Dict[str, Dict]:
+    try:
+        with open(cache_path) as fh:
+            data = json.load(fh)
+    except (OSError, ValueError):
+        return {}
+    if data.get("version") != CACHE_VERSION:
+        return {}
+    return data.get("entries", {})
+
+
+def save_cache(cache_path: str, entries: Dict[str, Dict]):
+    folder = os.path.dirname(cache_path)
+    if folder:
+        os.makedirs(folder, exist_ok=True)
+    tmp = f"{cache_path}.tmp"
+    with open(tmp, "w") as fh:
+        json.dump({"version": CACHE_VERSION, "entries": entries}, fh, separators=(",", ":"))
+    os.replace(tmp, cache_path)
+
+
+def _analyze_all(paths: List[str], workers: Optional[int]) -> List[Dict]:
+    if len(paths) < POOL_THRESHOLD or workers == 1:
+        return [analyze_capture(p) for p in paths]
+    workers = workers or os.cpu_count() or 1
+    chunksize = max(1, min(256, len(paths) // (workers * 4)))
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        return list(pool.map(analyze_capture, paths, chunksize=chunksize))
+
+
+def audit_captures(folder: str, cache_path: str, workers: Optional[int] = None) -> Dict:
+    """
+    Audit every capture file under `folder`.
+    Returns {"results": {path: result}, "analyzed": n, "cached": n}.
+    """
+    cache = load_cache(cache_path)
+    entries: Dict[str, Dict] = {}
+    stale: List[Tuple[str, int, int]] = []
+    for path, size, mtime_ns in iter_capture_files(folder):
+        hit = cache.get(path)
+        if hit and hit["size"] == size and hit["mtime_ns"] == mtime_ns and "error" not in hit["result"]:
+            entries[path] = hit
+        else:
+            stale.append((path, size, mtime_ns))
+
+    with span("capture_audit"):
+        results = _analyze_all([p for p, _, _ in stale], workers)
+    inc("captures_audited_total", len(stale))
+    for (path, size, mtime_ns), result in zip(stale, results):
+        entries[path] = {"size": size, "mtime_ns": mtime_ns, "result": result}
+
+    # entries for deleted files are dropped by rebuilding from the sweep;
+    # failures may be transient (permissions, NFS), so they are retried next run
+    keep = {p: e for p, e in entries.items() if "error" not in e["result"]}
+    if stale or len(keep) != len(cache):
+        save_cache(cache_path, keep)
+    return {
+        "results": {p: e["result"] for p, e in entries.items()},
+        "analyzed": len(stale),
+        "cached": len(entries) - len(stale),
+    }
@@ -0,0 +1,126 @@
+"""
+capture_store.py
+- Content-addressed store for captured handshakes.
+- Each capture is hashed (SHA-256) and gzip-compressed in the same streaming
+  pass, then kept once under its digest: blobs/<d[:2]>/<digest>.cap.gz.
+  Identical captures from repeated runs or other sensors cost no extra space.
+- manifest.ndjson records every capture (ts, ssid, bssid, digest, sizes), so
+  SSIDs never need to be turned into file names.
+"""
+import hashlib
+import json
+import os
+import threading
+import time
+import zlib
+from typing import BinaryIO, Dict, Iterable, Iterator, Optional
+
+BLOB_DIR = "blobs"
+MANIFEST = "manifest.ndjson"
+BLOB_SUFFIX = ".cap.gz"
+CHUNK_SIZE = 1 << 20
+COMPRESS_LEVEL = 6
+
+
+class CaptureStore:
+    def __init__(self, root: str):
+        self.root = root
+        self.blob_dir = os.path.join(root, BLOB_DIR)
+        self.manifest_path = os.path.join(root, MANIFEST)
+        os.makedirs(self.blob_dir, exist_ok=True)
+        self._lock = threading.Lock()
+
+    def blob_path(self, digest: str) -> str:
+        return os.path.join(self.blob_dir, digest[:2], digest + BLOB_SUFFIX)
+
+    # --- writes ---
+    def put_chunks(self, chunks: Iterable[bytes], ssid: Optional[str] = None, bssid: Optional[str] = None,
+                   ts: Optional[float] = None, **extra) -> Dict:
+        """Store a capture given as byte chunks; returns its manifest entry."""
+        digest = hashlib.sha256()
+        gz = zlib.compressobj(COMPRESS_LEVEL, zlib.DEFLATED, 31)  # wbits 31: gzip container
+        size = stored = 0
+        tmp = os.path.join(self.blob_dir, f".incoming-{os.getpid()}-{threading.get_ident()}")
+        try:
+            with open(tmp, "wb") as out:
+                for chunk in chunks:
+                    digest.update(chunk)
+                    size += len(chunk)
+                    data = gz.compress(chunk)
+                    stored += len(data)
+                    out.write(data)
+                data = gz.flush()
+                stored += len(data)
+                out.write(data)
+            hexdigest = digest.hexdigest()
+            path = self.blob_path(hexdigest)
+            deduplicated = os.path.exists(path)
+            if deduplicated:
+                os.remove(tmp)
+            else:
+                os.makedirs(os.path.dirname(path), exist_ok=True)
+                os.replace(tmp, path)
+        except BaseException:
+            if os.path.exists(tmp):
+                os.remove(tmp)
+            raise
+        entry = {"ts": time.time() if ts is None else ts, "ssid": ssid, "bssid": bssid, "digest": hexdigest,
+                 "size": size, "stored": stored, "deduplicated": deduplicated, **extra}
+        line = json.dumps(entry) + "\n"
+        with self._lock, open(self.manifest_path, "a") as fh:
+            fh.write(line)  # one write per entry, so concurrent appenders do not interleave
+        return entry
+
+    def put_stream(self, fh: BinaryIO, **meta) -> Dict:
+        return self.put_chunks(iter(lambda: fh.read(CHUNK_SIZE), b""), **meta)
+
+    def put_file(self, path: str, **meta) -> Dict:
+        with open(path, "rb") as fh:
+            return self.put_stream(fh, **meta)
+
+    def put_bytes(self, data: bytes, **meta) -> Dict:
+        return self.put_chunks([data], **meta)
+
+    # --- reads ---
+    def iter_manifest(self) -> Iterator[Dict]:
+        try:
+            with open(self.manifest_path) as fh:
+                for line in fh:
+                    if line.strip():
+                        yield json.loads(line)
+        except FileNotFoundError:
+            return
+
+    def find(self, ssid: Optional[str] = None, bssid: Optional[str] = None,
+             since: Optional[float] = None, until: Optional[float] = None) -> Iterator[Dict]:
+        """Manifest entries matching every given filter (BSSID case-insensitive)."""
+        for entry in self.iter_manifest():
+            if ssid is not None and entry.get("ssid") != ssid:
+                continue
+            if bssid is not None and (entry.get("bssid") or "").lower() != bssid.lower():
+                continue
+            if since is not None and entry["ts"] < since:
+                continue
+            if until is not None and entry["ts"] > until:
+                continue
+            yield entry
+
+    def read(self, digest: str) -> bytes:
+        """Uncompressed content of a blob."""
+        import gzip
+        with gzip.open(self.blob_path(digest), "rb") as fh:
+            return fh.read()
+
+    def usage(self) -> Dict[str, int]:
+        """Capture count and logical vs on-disk bytes."""
+        captures = logical = 0
+        for entry in self.iter_manifest():
+            captures += 1
+            logical += entry["size"]
+        blobs = on_disk = 0
+        for root, _, files in os.walk(self.blob_dir):
+            for name in files:
+                if name.endswith(BLOB_SUFFIX):
+                    blobs += 1
+                    on_disk += os.path.getsize(os.path.join(root, name))
+        return {"captures": captures, "blobs": blobs, "logical_bytes": logical, "stored_bytes": on_disk}
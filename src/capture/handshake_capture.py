@@ -11,25 +11,45 @@ For safety, real-capture functions are NOT invoked unless you explicitly
 modify/enable them. The CLI provided in src.main requires an explicit confirmation
 string before unsafe operations are allowed.
 """
-import os
+import threading
 import time
-from typing import Dict
+from functools import lru_cache
+from typing import Dict, Optional
 
-def capture_handshake_simulated(network: Dict, cfg: Dict):
+from src.capture.capture_store import CaptureStore
+from src.scanner.network import NetworkLike
+from src.utils.metrics import inc, timed
+
+SIMULATED_CAPTURE_SECONDS = 0.5
+
+@lru_cache(maxsize=None)
+def capture_store(folder: str) -> CaptureStore:
+    """One CaptureStore per folder, shared by concurrent captures."""
+    return CaptureStore(folder)
+
+@timed("capture")
+def capture_handshake_simulated(network: NetworkLike, cfg: Dict,
+                                cancel: Optional[threading.Event] = None) -> Optional[str]:
     """
     Simulate capturing a handshake for the given network.
     This never touches the network interface.
+    The capture goes into the content-addressed CaptureStore in CAPTURE_FOLDER.
+    Returns the blob path, or None when `cancel` was set while "listening".
+    Prints nothing: it runs on CaptureScheduler worker threads, and results
+    are reported through the scheduler's progress callback.
     """
+    inc("captures_total", mode="simulated")
     ssid = network.get("ssid", "<unknown>")
-    print(f"[SIM] Attempting simulated handshake capture for SSID: {ssid}")
-    # Simulate time and write a placeholder file
-    cap_folder = cfg.get("CAPTURE_FOLDER", "data/captured_handshakes")
-    os.makedirs(cap_folder, exist_ok=True)
-    fname = os.path.join(cap_folder, f"{ssid.replace(' ','_')}_simulated.cap")
-    with open(fname, "w") as f:
-        f.write(f"SIMULATED HANDSHAKE FOR {ssid}\n")
-    time.sleep(0.5)
-    print(f"[SIM] Simulated handshake stored at: {fname}")
+    # Simulate listening time, then write a placeholder file
+    if cancel is not None:
+        if cancel.wait(SIMULATED_CAPTURE_SECONDS):
+            return None
+    else:
+        time.sleep(SIMULATED_CAPTURE_SECONDS)
+    store = capture_store(cfg.get("CAPTURE_FOLDER", "data/captured_handshakes"))
+    entry = store.put_bytes(f"SIMULATED HANDSHAKE FOR {ssid}\n".encode(), ssid=ssid,
+                            bssid=network.get("bssid"), mode="simulated")
+    return store.blob_path(entry["digest"])
 
 # Placeholder for real capture function (not active by default)
 def perform_real_capture(interface: str, target_bssid: str, channel: int, timeout: int = 30):
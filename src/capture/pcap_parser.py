@@ -1,19 +1,76 @@
 """
 pcap_parser.py
-- Lightweight parser to check for a simulated 'handshake' marker in .cap files.
-- For real-world parsing use scapy or pyshark.
+- Checks capture files for a WPA handshake.
+- Real libpcap/pcapng captures are walked record by record with the
+  mmap-backed reader in pcap_reader (no scapy, constant memory).
+- Anything else is treated as a simulated capture and checked for the
+  'SIMULATED HANDSHAKE' marker written by handshake_capture.
+- gzip-compressed captures (e.g. CaptureStore blobs) are decompressed as a
+  stream and fed to the record reader chunk by chunk; no uncompressed copy
+  is written to disk.
 """
-from typing import Dict
+from typing import BinaryIO, Dict
+import gzip
+import io
 import os
 
+from src.capture.pcap_reader import has_handshake, scan_eapol_file, scan_eapol_stream, sniff_bytes, sniff_format
+
+
+GZIP_MAGIC = b"\x1f\x8b"
+GZIP_READ_CHUNK = 1 << 20
+
+
+def is_gzip(filepath: str) -> bool:
+    try:
+        with open(filepath, "rb") as fh:
+            return fh.read(2) == GZIP_MAGIC
+    except OSError:
+        return False
+
+
+def open_capture(filepath: str) -> BinaryIO:
+    """Binary reader over the uncompressed bytes of `filepath` (gzip'd or not)."""
+    if is_gzip(filepath):
+        return io.BufferedReader(gzip.open(filepath, "rb"), GZIP_READ_CHUNK)
+    return open(filepath, "rb")
+
+
+def capture_format(filepath: str) -> str:
+    """sniff_format() that looks inside gzip'd captures."""
+    if not is_gzip(filepath):
+        return sniff_format(filepath)
+    with open_capture(filepath) as fh:
+        return sniff_bytes(fh.read(4))
+
+
+def scan_capture(filepath: str) -> Dict[str, Dict]:
+    """scan_eapol_file() for plain captures, streamed for gzip'd ones."""
+    if not is_gzip(filepath):
+        return scan_eapol_file(filepath)
+    with open_capture(filepath) as fh:
+        return scan_eapol_stream(fh)
+
+
+def has_simulated_marker(filepath: str) -> bool:
+    with open_capture(filepath) as fh:
+        data = fh.read(2048).decode(errors="ignore")
+    return "SIMULATED HANDSHAKE" in data
+
+
+def eapol_summary(filepath: str) -> Dict[str, Dict]:
+    """Per-BSSID EAPOL-Key tally for a pcap/pcapng file ({} for other files)."""
+    if not capture_format(filepath):
+        return {}
+    return scan_capture(filepath)
+
+
 def pcap_contains_handshake(filepath: str) -> bool:
     if not os.path.exists(filepath):
         return False
     try:
-        with open(filepath, "r", errors="ignore") as f:
-            data = f.read(2048)
-            if "SIMULATED HANDSHAKE" in data:
-                return True
+        if capture_format(filepath):
+            return has_handshake(scan_capture(filepath))
+        return has_simulated_marker(filepath)
     except Exception:
         return False
-    return False
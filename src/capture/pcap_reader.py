@@ -0,0 +1,356 @@
+"""
+pcap_reader.py
+- Record-level reader for libpcap (.cap/.pcap) and pcapng captures.
+- The file is memory-mapped and packet headers are decoded in place with
+  `struct.unpack_from`, so payloads are never copied and memory use stays
+  constant no matter how large the capture is.
+- Compressed captures are read as a stream instead (scan_eapol_stream):
+  one record at a time from a file object, so memory stays constant there too.
+- Only looks for EAPOL-Key frames (the WPA 4-way handshake) and tallies them
+  per BSSID. Does not depend on scapy.
+"""
+import mmap
+import os
+import struct
+from typing import BinaryIO, Dict, Iterable, Iterator, Optional, Tuple
+
+# libpcap magic numbers (microsecond / nanosecond resolution)
+PCAP_MAGIC_US = 0xA1B2C3D4
+PCAP_MAGIC_NS = 0xA1B23C4D
+# pcapng section header block type and byte-order magic
+PCAPNG_SHB = 0x0A0D0D0A
+PCAPNG_BOM = 0x1A2B3C4D
+
+# link-layer types we know how to walk down to an EAPOL frame
+LINKTYPE_ETHERNET = 1
+LINKTYPE_IEEE802_11 = 105
+LINKTYPE_PRISM = 119
+LINKTYPE_RADIOTAP = 127
+LINKTYPE_PPI = 192
+
+ETHERTYPE_EAPOL = 0x888E
+ETHERTYPE_VLAN = 0x8100
+LLC_SNAP_EAPOL = b"\xaa\xaa\x03\x00\x00\x00\x88\x8e"
+EAPOL_TYPE_KEY = 3
+
+# EAPOL-Key "key information" bits used to tell the four messages apart
+KEY_INFO_INSTALL = 0x0040
+KEY_INFO_ACK = 0x0080
+KEY_INFO_MIC = 0x0100
+KEY_INFO_SECURE = 0x0200
+
+PRISM_HEADER_LEN = 144
+# larger records/blocks are treated as corruption when streaming
+MAX_STREAM_RECORD = 1 << 24
+# smallest valid length of each pcapng packet block type (header + fixed fields + trailer)
+PCAPNG_MIN_BLOCK = {6: 32, 3: 16, 2: 32}
+
+
+class PcapFormatError(ValueError):
+    """Raised when a file is not a libpcap/pcapng capture."""
+
+
+def sniff_format(filepath: str) -> str:
+    """Return "pcap", "pcapng" or "" based on the first bytes of the file."""
+    try:
+        with open(filepath, "rb") as fh:
+            head = fh.read(4)
+    except OSError:
+        return ""
+    return sniff_bytes(head)
+
+
+def sniff_bytes(head: bytes) -> str:
+    """sniff_format() for the first 4 bytes of a capture."""
+    head = head[:4]
+    if len(head) < 4:
+        return ""
+    for endian in ("<", ">"):
+        magic = struct.unpack(endian + "I", head)[0]
+        if magic in (PCAP_MAGIC_US, PCAP_MAGIC_NS):
+            return "pcap"
+    if struct.unpack("<I", head)[0] == PCAPNG_SHB:
+        return "pcapng"
+    return ""
+
+
+def _iter_pcap(buf) -> Iterator[Tuple[int, int, int]]:
+    """Yield (linktype, offset, caplen) for each record of a libpcap file."""
+    if len(buf) < 24:
+        return
+    endian = "<" if struct.unpack_from("<I", buf, 0)[0] in (PCAP_MAGIC_US, PCAP_MAGIC_NS) else ">"
+    linktype = struct.unpack_from(endian + "I", buf, 20)[0] & 0x0FFFFFFF
+    rec = struct.Struct(endian + "IIII")
+    size = len(buf)
+    off = 24
+    while off + 16 <= size:
+        _ts_sec, _ts_frac, caplen, _origlen = rec.unpack_from(buf, off)
+        off += 16
+        if off + caplen > size:
+            break  # truncated capture (e.g. still being written)
+        yield linktype, off, caplen
+        off += caplen
+
+
+def _pcapng_packet(buf, off: int, blen: int, btype: int, endian: str,
+                   linktypes: list) -> Optional[Tuple[int, int, int]]:
+    """
+    (linktype, payload_offset, caplen) of the packet in the pcapng block at
+    `off`, if any. Blocks too short for their fixed fields are skipped.
+    """
+    if blen < PCAPNG_MIN_BLOCK.get(btype, 0):
+        return None
+    body = off + 8
+    if btype == 6:  # enhanced packet block
+        iface, _tsh, _tsl, caplen, _origlen = struct.unpack_from(endian + "IIIII", buf, body)
+        if iface < len(linktypes):
+            return linktypes[iface], body + 20, min(caplen, blen - 32)
+    elif btype == 3:  # simple packet block, always interface 0
+        origlen = struct.unpack_from(endian + "I", buf, body)[0]
+        if linktypes:
+            return linktypes[0], body + 4, min(origlen, blen - 16)
+    elif btype == 2:  # obsolete packet block
+        iface = struct.unpack_from(endian + "H", buf, body)[0]
+        caplen = struct.unpack_from(endian + "I", buf, body + 12)[0]
+        if iface < len(linktypes):
+            return linktypes[iface], body + 20, min(caplen, blen - 32)
+    return None
+
+
+def _iter_pcapng(buf) -> Iterator[Tuple[int, int, int]]:
+    """Yield (linktype, offset, caplen) for each packet block of a pcapng file."""
+    size = len(buf)
+    off = 0
+    endian = "<"
+    linktypes = []
+    while off + 12 <= size:
+        btype = struct.unpack_from(endian + "I", buf, off)[0]
+        if btype == PCAPNG_SHB:
+            # byte order is only known after reading the section header
+            bom = struct.unpack_from("<I", buf, off + 8)[0]
+            endian = "<" if bom == PCAPNG_BOM else ">"
+            linktypes = []
+        blen = struct.unpack_from(endian + "I", buf, off + 4)[0]
+        if blen < 12 or off + blen > size:
+            break
+        if btype == 1:  # interface description block
+            linktypes.append(struct.unpack_from(endian + "H", buf, off + 8)[0])
+        else:
+            packet = _pcapng_packet(buf, off, blen, btype, endian, linktypes)
+            if packet is not None:
+                yield packet
+        off += blen
+
+
+def iter_records(buf) -> Iterator[Tuple[int, int, int]]:
+    """
+    Walk the records of a pcap or pcapng buffer (bytes or mmap).
+    Yields (linktype, payload_offset, caplen); the payload itself is not copied.
+    """
+    if len(buf) < 4:
+        return iter(())
+    head = struct.unpack_from("<I", buf, 0)[0]
+    if head == PCAPNG_SHB:
+        return _iter_pcapng(buf)
+    if head in (PCAP_MAGIC_US, PCAP_MAGIC_NS) or struct.unpack_from(">I", buf, 0)[0] in (PCAP_MAGIC_US, PCAP_MAGIC_NS):
+        return _iter_pcap(buf)
+    raise PcapFormatError("not a pcap/pcapng capture")
+
+
+def _iter_pcap_stream(fh: BinaryIO, head: bytes) -> Iterator[Tuple[int, bytes]]:
+    """Yield (linktype, packet bytes) for each record of a libpcap stream."""
+    header = head + fh.read(24 - len(head))
+    if len(header) < 24:
+        return
+    endian = "<" if struct.unpack_from("<I", header, 0)[0] in (PCAP_MAGIC_US, PCAP_MAGIC_NS) else ">"
+    linktype = struct.unpack_from(endian + "I", header, 20)[0] & 0x0FFFFFFF
+    rec = struct.Struct(endian + "IIII")
+    while True:
+        hdr = fh.read(16)
+        if len(hdr) < 16:
+            return
+        caplen = rec.unpack(hdr)[2]
+        if caplen > MAX_STREAM_RECORD:
+            return
+        data = fh.read(caplen)
+        if len(data) < caplen:
+            return  # truncated capture
+        yield linktype, data
+
+
+def _iter_pcapng_stream(fh: BinaryIO, head: bytes) -> Iterator[Tuple[int, bytes]]:
+    """Yield (linktype, packet bytes) for each packet block of a pcapng stream."""
+    endian = "<"
+    linktypes = []
+    pending = head
+    while True:
+        start = pending + fh.read(12 - len(pending))
+        pending = b""
+        if len(start) < 12:
+            return
+        btype = struct.unpack_from(endian + "I", start, 0)[0]
+        if btype == PCAPNG_SHB:
+            endian = "<" if struct.unpack_from("<I", start, 8)[0] == PCAPNG_BOM else ">"
+            linktypes = []
+        blen = struct.unpack_from(endian + "I", start, 4)[0]
+        if blen < 12 or blen > MAX_STREAM_RECORD:
+            return
+        block = start + fh.read(blen - 12)
+        if len(block) < blen:
+            return
+        if btype == 1:  # interface description block
+            linktypes.append(struct.unpack_from(endian + "H", block, 8)[0])
+            continue
+        packet = _pcapng_packet(block, 0, blen, btype, endian, linktypes)
+        if packet is not None:
+            linktype, off, caplen = packet
+            yield linktype, block[off:off + caplen]
+
+
+def iter_stream_records(fh: BinaryIO) -> Iterator[Tuple[int, bytes]]:
+    """
+    Walk the records of a pcap or pcapng file object (e.g. a gzip stream),
+    reading one record at a time. Yields (linktype, packet bytes).
+    """
+    head = fh.read(4)
+    fmt = sniff_bytes(head)
+    if fmt == "pcapng":
+        return _iter_pcapng_stream(fh, head)
+    if fmt == "pcap":
+        return _iter_pcap_stream(fh, head)
+    raise PcapFormatError("not a pcap/pcapng capture")
+
+
+def _mac(buf, off: int) -> str:
+    return ":".join(f"{b:02x}" for b in buf[off:off + 6])
+
+
+def _key_message(key_info: int) -> int:
+    """Map EAPOL-Key info bits to the 4-way handshake message number (1-4)."""
+    if key_info & KEY_INFO_ACK:
+        return 3 if key_info & KEY_INFO_MIC else 1
+    if key_info & KEY_INFO_SECURE:
+        return 4
+    return 2
+
+
+def _eapol_from_80211(buf, off: int, end: int):
+    """Return (bssid, key_info) if the 802.11 frame at `off` is an EAPOL-Key frame."""
+    if off + 24 > end:
+        return None
+    fc0 = buf[off]
+    fc1 = buf[off + 1]
+    if (fc0 >> 2) & 0x3 != 2 or fc1 & 0x40:
+        return None  # not a data frame, or payload is encrypted
+    to_ds = fc1 & 0x01
+    from_ds = fc1 & 0x02
+    hdr = 24
+    if to_ds and from_ds:
+        hdr += 6
+    subtype = fc0 >> 4
+    if subtype & 0x08:  # QoS data
+        hdr += 2
+        if fc1 & 0x80:  # +HTC
+            hdr += 4
+    llc = off + hdr
+    if llc + 8 + 7 > end or buf[llc:llc + 8] != LLC_SNAP_EAPOL:
+        return None
+    if buf[llc + 9] != EAPOL_TYPE_KEY:
+        return None
+    if to_ds and not from_ds:
+        bssid_off = off + 4
+    elif from_ds and not to_ds:
+        bssid_off = off + 10
+    elif not to_ds:
+        bssid_off = off + 16
+    else:
+        bssid_off = off + 4  # WDS: no single BSSID, use receiver address
+    key_info = struct.unpack_from(">H", buf, llc + 13)[0]
+    return _mac(buf, bssid_off), key_info
+
+
+def _eapol_from_ethernet(buf, off: int, end: int):
+    if off + 14 > end:
+        return None
+    etype_off = off + 12
+    etype = struct.unpack_from(">H", buf, etype_off)[0]
+    if etype == ETHERTYPE_VLAN:
+        etype_off += 4
+        if etype_off + 2 > end:
+            return None
+        etype = struct.unpack_from(">H", buf, etype_off)[0]
+    eapol = etype_off + 2
+    if etype != ETHERTYPE_EAPOL or eapol + 7 > end or buf[eapol + 1] != EAPOL_TYPE_KEY:
+        return None
+    key_info = struct.unpack_from(">H", buf, eapol + 5)[0]
+    # the authenticator (AP) sends the frames with the Ack bit set
+    bssid_off = off + 6 if key_info & KEY_INFO_ACK else off
+    return _mac(buf, bssid_off), key_info
+
+
+def _eapol_from_record(buf, linktype: int, off: int, caplen: int):
+    end = off + caplen
+    if linktype == LINKTYPE_RADIOTAP:
+        if caplen < 4:
+            return None
+        off += struct.unpack_from("<H", buf, off + 2)[0]
+    elif linktype == LINKTYPE_PPI:
+        if caplen < 4:
+            return None
+        off += struct.unpack_from("<H", buf, off + 2)[0]
+    elif linktype == LINKTYPE_PRISM:
+        off += PRISM_HEADER_LEN
+    elif linktype == LINKTYPE_ETHERNET:
+        return _eapol_from_ethernet(buf, off, end)
+    elif linktype != LINKTYPE_IEEE802_11:
+        return None
+    return _eapol_from_80211(buf, off, end)
+
+
+def scan_eapol(buf) -> Dict[str, Dict]:
+    """
+    Tally EAPOL-Key frames per BSSID in a pcap/pcapng buffer.
+    Returns {bssid: {"frames": int, "messages": [sorted handshake message numbers]}}.
+    """
+    return _tally(_eapol_from_record(buf, linktype, off, caplen) for linktype, off, caplen in iter_records(buf))
+
+
+def scan_eapol_stream(fh: BinaryIO) -> Dict[str, Dict]:
+    """scan_eapol() for a file object, read record by record."""
+    return _tally(_eapol_from_record(data, linktype, 0, len(data)) for linktype, data in iter_stream_records(fh))
+
+
+def _tally(hits: Iterable[Optional[Tuple[str, int]]]) -> Dict[str, Dict]:
+    seen: Dict[str, Dict] = {}
+    for hit in hits:
+        if hit is None:
+            continue
+        bssid, key_info = hit
+        entry = seen.get(bssid)
+        if entry is None:
+            entry = seen[bssid] = {"frames": 0, "mask": 0}
+        entry["frames"] += 1
+        entry["mask"] |= 1 << _key_message(key_info)
+    return {
+        bssid: {"frames": e["frames"], "messages": [m for m in range(1, 5) if e["mask"] & (1 << m)]}
+        for bssid, e in seen.items()
+    }
+
+
+def scan_eapol_file(filepath: str) -> Dict[str, Dict]:
+    """Memory-map `filepath` and return the per-BSSID EAPOL tally (see scan_eapol)."""
+    if os.path.getsize(filepath) == 0:
+        return {}
+    with open(filepath, "rb") as fh:
+        with mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            if hasattr(mm, "madvise") and hasattr(mmap, "MADV_SEQUENTIAL"):
+                mm.madvise(mmap.MADV_SEQUENTIAL)
+            return scan_eapol(mm)
+
+
+def has_handshake(summary: Dict[str, Dict]) -> bool:
+    """
+    True if any BSSID has at least two distinct handshake messages, which is
+    the minimum (e.g. M1+M2 or M2+M3) needed to verify a passphrase offline.
+    """
+    return any(len(e["messages"]) >= 2 for e in summary.values())
@@ -0,0 +1,107 @@
+"""
+scheduler.py - run handshake captures concurrently.
+
+- CaptureScheduler runs a capture function over many networks on a bounded
+  thread pool (captures wait on radios/sleeps, not the CPU).
+- Each target gets its own stop event, set when its timeout expires or when
+  cancel() is called; capture functions check it cooperatively.
+- progress(done, total, result) is called from the thread that called run(),
+  once per finished target.
+"""
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Callable, Dict, List, Optional, Sequence
+
+from src.scanner.network import NetworkLike
+from src.utils.metrics import inc
+
+DEFAULT_WORKERS = 16
+DEFAULT_TIMEOUT = 30.0
+
+CaptureFn = Callable[..., Optional[str]]
+ProgressFn = Callable[[int, int, Dict], None]
+
+
+class CaptureScheduler:
+    def __init__(self, capture_fn: Optional[CaptureFn] = None, workers: int = DEFAULT_WORKERS,
+                 timeout: float = DEFAULT_TIMEOUT, progress: Optional[ProgressFn] = None):
+        if capture_fn is None:
+            from src.capture.handshake_capture import capture_handshake_simulated
+            capture_fn = capture_handshake_simulated
+        self.capture_fn = capture_fn
+        self.workers = max(1, workers)
+        self.timeout = timeout
+        self.progress = progress
+        self._cancelled = threading.Event()
+        self._lock = threading.Lock()
+        self._active = set()  # stop events of running targets
+
+    @property
+    def cancelled(self) -> bool:
+        return self._cancelled.is_set()
+
+    def cancel(self):
+        """Stop running targets and skip the ones not started yet."""
+        self._cancelled.set()
+        with self._lock:
+            for stop in self._active:
+                stop.set()
+
+    def _capture_one(self, network: NetworkLike, cfg: Dict) -> Dict:
+        result = {"ssid": network.get("ssid"), "bssid": network.get("bssid"), "path": None, "error": None}
+        if self._cancelled.is_set():
+            result["status"] = "cancelled"
+            return result
+        stop = threading.Event()
+        timer = threading.Timer(self.timeout, stop.set)
+        timer.daemon = True
+        with self._lock:
+            self._active.add(stop)
+        start = time.monotonic()
+        timer.start()
+        try:
+            result["path"] = self.capture_fn(network, cfg, cancel=stop)
+        except Exception as exc:
+            result["error"] = str(exc)
+        finally:
+            timer.cancel()
+            with self._lock:
+                self._active.discard(stop)
+        result["elapsed"] = time.monotonic() - start
+        if result["error"]:
+            result["status"] = "error"
+        elif self._cancelled.is_set() and stop.is_set():
+            result["status"] = "cancelled"
+        elif stop.is_set():
+            result["status"] = "timeout"
+        else:
+            result["status"] = "done"
+        return result
+
+    def run(self, networks: Sequence[NetworkLike], cfg: Dict) -> List[Dict]:
+        """Capture every network; results come back in input order."""
+        total = len(networks)
+        results: List[Optional[Dict]] = [None] * total
+        with ThreadPoolExecutor(max_workers=min(self.workers, total or 1)) as pool:
+            futures = {pool.submit(self._capture_one, net, cfg): i for i, net in enumerate(networks)}
+            try:
+                for done, fut in enumerate(as_completed(futures), 1):
+                    result = fut.result()
+                    results[futures[fut]] = result
+                    inc("capture_results_total", status=result["status"])
+                    if self.progress:
+                        self.progress(done, total, result)
+            except BaseException:
+                # Ctrl-C / progress callback failure: stop workers before the pool joins them
+                self.cancel()
+                raise
+        return results
+
+
+def summarize(results: Sequence[Dict]) -> Dict[str, int]:
+    """Count results by status."""
+    counts: Dict[str, int] = {}
+    for r in results:
+        counts[r["status"]] = counts.get(r["status"], 0) + 1
+    return counts
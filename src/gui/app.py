@@ -6,8 +6,9 @@ Usage:
 
 UI Controls:
 - Scan Networks: list nearby networks (uses nmcli if available, else simulated)
-- Simulate Capture: simulate handshake capture for selected networks (writes .cap)
-- Generate Report: create report.html (or report.json) from the displayed networks
+- Simulate Capture: simulate handshake capture for selected networks (stored in the capture store)
+- Cancel: stop a running capture pass
+- Generate Report: create report.html (or .json/.ndjson/.csv) from the displayed networks
 - Clear Log: clear the console log panel
 """
 import threading
@@ -20,20 +21,31 @@ from tkinter.scrolledtext import ScrolledText
 import ttkbootstrap as tb
 
 
-from src.scanner.wifi_scanner import scan_networks
-from src.capture.handshake_capture import capture_handshake_simulated
-from src.report.report_generator import generate_report
 from src.utils.config import load_config
+from src.gui.network_table import COLUMNS, NetworkTableModel, plan_updates
+from src.gui.log_pipeline import LogPipeline
+
+# Scanner, capture, report (jinja2) and history (sqlite3) modules are imported
+# in the worker that first needs them so the window appears as early as possible.
 
 LOG_POLL_INTERVAL_MS = 200
+FILTER_DEBOUNCE_MS = 150
 
 class GuiApp:
     def __init__(self, root):
         self.root = root
         self.root.title("WiFi Assessment Tool - GUI")
         self.cfg = load_config()
-        self.log_q = queue.Queue()
-        self.networks = []  # last scanned networks
+        self.log_q = queue.Queue()  # UI control messages from worker threads
+        self.logs = LogPipeline(max_lines=self.cfg["LOG_MAX_LINES"], rate_per_sec=self.cfg["LOG_RATE_LIMIT"],
+                                spill_path=self.cfg["LOG_FILE"] or None)
+        self.networks = []  # last scanned Network records
+        self.history = None  # HistoryStore, opened by the first scan when RECORD_HISTORY is set
+        self.scan_cache = None  # ScanCache shared by scan clicks (and CLI runs, if SCAN_CACHE_FILE is set)
+        self.table = NetworkTableModel()  # filtered/sorted/paged view of self.networks
+        self._rendered = {}  # iid -> values currently shown in the Treeview
+        self._filter_job = None
+        self.capture_scheduler = None  # CaptureScheduler of the running capture pass
 
         self._build_ui()
         # start log pump
@@ -50,6 +62,9 @@ class GuiApp:
         self.btn_capture = ttk.Button(top, text="Simulate Capture", command=self._on_simulate_capture)
         self.btn_capture.pack(side="left", padx=4)
 
+        self.btn_cancel = ttk.Button(top, text="Cancel", command=self._on_cancel_capture, state="disabled")
+        self.btn_cancel.pack(side="left", padx=4)
+
         self.btn_report = ttk.Button(top, text="Generate Report", command=self._on_generate_report)
         self.btn_report.pack(side="left", padx=4)
 
@@ -58,16 +73,30 @@ class GuiApp:
 
         ttk.Separator(self.root, orient="horizontal").pack(fill="x", pady=6)
 
+        # Filter / paging bar for the network table
+        bar = ttk.Frame(self.root, padding=(8,0,8,4))
+        bar.pack(fill="x")
+        ttk.Label(bar, text="Filter (SSID/security):").pack(side="left")
+        self.filter_var = tk.StringVar()
+        self.filter_var.trace_add("write", lambda *_: self._schedule_filter())
+        ttk.Entry(bar, textvariable=self.filter_var, width=24).pack(side="left", padx=4)
+        ttk.Label(bar, text="Min signal:").pack(side="left", padx=(8,0))
+        self.min_signal_var = tk.StringVar(value="0")
+        self.min_signal_var.trace_add("write", lambda *_: self._schedule_filter())
+        ttk.Spinbox(bar, from_=0, to=100, increment=5, width=5, textvariable=self.min_signal_var).pack(side="left", padx=4)
+        ttk.Button(bar, text="Next ▶", command=lambda: self._on_page(+1)).pack(side="right")
+        self.page_label = ttk.Label(bar, text="")
+        self.page_label.pack(side="right", padx=6)
+        ttk.Button(bar, text="◀ Prev", command=lambda: self._on_page(-1)).pack(side="right")
+
         # Middle: networks tree and details
         middle = ttk.Frame(self.root, padding=(8,0))
         middle.pack(fill="both", expand=True)
 
-        # Treeview for networks
-        cols = ("ssid", "security", "signal")
-        self.tree = ttk.Treeview(middle, columns=cols, show="headings", selectmode="extended", height=10)
-        self.tree.heading("ssid", text="SSID")
-        self.tree.heading("security", text="Security")
-        self.tree.heading("signal", text="Signal")
+        # Treeview for networks (click a heading to sort)
+        self.tree = ttk.Treeview(middle, columns=COLUMNS, show="headings", selectmode="extended", height=10)
+        for col, title in zip(COLUMNS, ("SSID", "Security", "Signal")):
+            self.tree.heading(col, text=title, command=lambda c=col: self._on_sort(c))
         self.tree.column("ssid", width=260)
         self.tree.column("security", width=120)
         self.tree.column("signal", width=80, anchor="center")
@@ -114,9 +143,19 @@ class GuiApp:
 
     def _scan_worker(self):
         try:
-            nets = scan_networks()
+            if self.scan_cache is None:
+                from src.scanner.scan_cache import ScanCache
+                self.scan_cache = ScanCache(self.cfg["SCAN_CACHE_TTL"], self.cfg["SCAN_CACHE_FILE"])
+            nets, cached = self.scan_cache.scan(self.cfg["SCAN_INTERFACES"], self.cfg["SCAN_TIMEOUT"])
             self.networks = nets
-            self._log(f"Scan finished — {len(nets)} networks found.")
+            if cached:
+                self._log(f"Reusing a scan from the last {self.cfg['SCAN_CACHE_TTL']:g}s.", source="scan")
+            elif self.cfg["RECORD_HISTORY"]:
+                if self.history is None:
+                    from src.storage.history_store import HistoryStore
+                    self.history = HistoryStore(self.cfg["HISTORY_DB"])
+                self.history.record_scan(nets)
+            self._log(f"Scan finished — {len(nets)} networks found.", source="scan")
             # update UI in main thread via queue
             self.log_q.put(("update_tree", nets))
         except Exception as e:
@@ -137,23 +176,39 @@ class GuiApp:
 
     def _simulate_capture_worker(self, selected_networks):
         try:
-            for net in selected_networks:
-                ssid = net.get("ssid")
-                self._log(f"[SIM] Capturing handshake for: {ssid}")
-                capture_handshake_simulated(net, self.cfg)
-                self._log(f"[SIM] Done for: {ssid}")
-            self._log("[SIM] All selected captures finished.")
+            from src.capture.scheduler import CaptureScheduler, summarize
+
+            def progress(done, total, result):
+                detail = f" ({result['error'] or result['path']})" if result["error"] or result["path"] else ""
+                self._log(f"[SIM] {result['ssid']}: {result['status']}{detail}", source="capture")
+                self.log_q.put(("capture_progress", (done, total)))
+
+            self.capture_scheduler = CaptureScheduler(workers=self.cfg["CAPTURE_WORKERS"],
+                                                      timeout=self.cfg["CAPTURE_TIMEOUT"], progress=progress)
+            self.log_q.put(("capture_started", None))
+            results = self.capture_scheduler.run(selected_networks, self.cfg)
+            counts = summarize(results)
+            self._log("[SIM] Capture pass finished: " + ", ".join(f"{n} {st}" for st, n in sorted(counts.items())))
         except Exception as e:
             self._log(f"[ERROR] Simulated capture failed: {e}")
         finally:
+            self.capture_scheduler = None
             self.log_q.put(("capture_done", None))
 
+    def _on_cancel_capture(self):
+        if self.capture_scheduler is not None:
+            self.capture_scheduler.cancel()
+            self._set_status("Cancelling capture...")
+            self._log("[SIM] Cancelling remaining captures...")
+            self.btn_cancel.config(state="disabled")
+
     def _on_generate_report(self):
         if not self.networks:
             messagebox.showinfo("No data", "No networks to report. Scan first.")
             return
         # ask for file name/location
-        filetypes = [("HTML report", "*.html"), ("JSON report", "*.json")]
+        filetypes = [("HTML report", "*.html"), ("JSON report", "*.json"),
+                     ("NDJSON report", "*.ndjson"), ("CSV report", "*.csv")]
         default = os.path.join(os.getcwd(), "report.html")
         path = filedialog.asksaveasfilename(title="Save report as", defaultextension=".html",
                                             initialfile="report.html", initialdir=os.getcwd(), filetypes=filetypes)
@@ -167,7 +222,8 @@ class GuiApp:
 
     def _generate_report_worker(self, path):
         try:
-            generate_report(self.networks, path)
+            from src.report.report_generator import generate_report_stream
+            generate_report_stream(self.networks, path)
             self.last_report = path
             self._log(f"Report saved to: {path}")
             self.log_q.put(("open_report_prompt", path))
@@ -194,17 +250,36 @@ class GuiApp:
             self.info_text.insert("end", "No network selected.")
         self.info_text.configure(state="disabled")
 
+    def _on_sort(self, column):
+        self.table.sort_by(column)
+        self._render_table()
+
+    def _on_page(self, step):
+        self.table.set_page(self.table.page + step)
+        self._render_table()
+
+    def _schedule_filter(self):
+        # debounce typing so each keystroke does not refilter a large table
+        if self._filter_job is not None:
+            self.root.after_cancel(self._filter_job)
+        self._filter_job = self.root.after(FILTER_DEBOUNCE_MS, self._apply_filter)
+
+    def _apply_filter(self):
+        self._filter_job = None
+        try:
+            min_signal = int(self.min_signal_var.get() or 0)
+        except ValueError:
+            min_signal = 0
+        self.table.set_filter(self.filter_var.get(), min_signal or None)
+        self._render_table()
+
     # --- helpers ---
     def _get_selected_networks(self):
-        items = self.tree.selection()
         selected = []
-        for iid in items:
-            try:
-                idx = int(iid)
-                if idx < len(self.networks):
-                    selected.append(self.networks[idx])
-            except Exception:
-                pass
+        for iid in self.tree.selection():
+            net = self.table.get(iid)
+            if net is not None:
+                selected.append(net)
         return selected
 
     def _set_buttons_state(self, disabled=False):
@@ -217,35 +292,50 @@ class GuiApp:
     def _set_status(self, text):
         self.status.config(text=text)
 
-    def _log(self, message):
-        # enqueue log to be displayed in main thread
-        self.log_q.put(("log", str(message)))
+    def _log(self, message, source="app"):
+        # batched into the log widget by _pump_log on the main thread
+        self.logs.put(message, source)
 
     def _clear_log(self):
         self.logbox.configure(state="normal")
         self.logbox.delete("1.0", "end")
         self.logbox.configure(state="disabled")
 
+    def _flush_log(self):
+        lines = self.logs.drain()
+        if not lines:
+            return
+        self.logbox.configure(state="normal")
+        self.logbox.insert("end", "\n".join(lines) + "\n")
+        # keep the widget bounded to the last LOG_MAX_LINES lines
+        excess = int(self.logbox.index("end-1c").split(".")[0]) - 1 - self.logs.max_lines
+        if excess > 0:
+            self.logbox.delete("1.0", f"{excess + 1}.0")
+        self.logbox.see("end")
+        self.logbox.configure(state="disabled")
+
     # Pump messages from worker threads into UI
     def _pump_log(self):
+        self._flush_log()
         try:
             while True:
                 item = self.log_q.get_nowait()
                 if not item:
                     continue
                 what, payload = item
-                if what == "log":
-                    self.logbox.configure(state="normal")
-                    self.logbox.insert("end", f"{payload}\n")
-                    self.logbox.see("end")
-                    self.logbox.configure(state="disabled")
-                elif what == "update_tree":
+                if what == "update_tree":
                     self._populate_tree(payload)
                 elif what == "scan_done":
                     self._set_status("Scan complete.")
                     self._set_buttons_state(disabled=False)
+                elif what == "capture_started":
+                    self.btn_cancel.config(state="normal")
+                elif what == "capture_progress":
+                    done, total = payload
+                    self._set_status(f"Simulating capture... {done}/{total}")
                 elif what == "capture_done":
                     self._set_status("Capture simulation finished.")
+                    self.btn_cancel.config(state="disabled")
                     self._set_buttons_state(disabled=False)
                 elif what == "report_done":
                     self._set_status("Report generation finished.")
@@ -265,15 +355,30 @@ class GuiApp:
         self.root.after(LOG_POLL_INTERVAL_MS, self._pump_log)
 
     def _populate_tree(self, networks):
-        # clear tree
-        for i in self.tree.get_children():
-            self.tree.delete(i)
-        # insert new network rows and use index as iid
-        for idx, n in enumerate(networks):
-            ssid = n.get("ssid", "<hidden>")
-            sec = n.get("security", "")
-            sig = n.get("signal", "")
-            self.tree.insert("", "end", iid=str(idx), values=(ssid, sec, sig))
+        self.table.set_networks(networks)
+        self._render_table()
+
+    def _render_table(self):
+        # only the current page lives in the Treeview; rows are keyed by network
+        # identity so unchanged rows (and their selection) are left alone
+        rows = self.table.visible_rows()
+        delete, update, insert = plan_updates(self._rendered, rows)
+        if delete:
+            self.tree.delete(*delete)
+        for iid in delete:
+            del self._rendered[iid]
+        for iid, values in update:
+            self.tree.item(iid, values=values)
+            self._rendered[iid] = values
+        for idx, iid, values in insert:
+            self.tree.insert("", idx, iid=iid, values=values)
+            self._rendered[iid] = values
+        order = [iid for iid, _ in rows]
+        if list(self.tree.get_children()) != order:
+            for idx, iid in enumerate(order):
+                self.tree.move(iid, "", idx)
+        self.page_label.config(
+            text=f"Page {self.table.page + 1}/{self.table.page_count} — {self.table.match_count} of {len(self.table)}")
 
 def main():
     root = tb.Window(themename="darkly")  # modern themed window
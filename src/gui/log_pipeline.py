@@ -0,0 +1,80 @@
+"""
+log_pipeline.py
+- Thread-safe, batched and bounded activity log for the GUI.
+- Worker threads put() messages; the Tk thread drain()s everything pending
+  once per tick and inserts it into the widget in one go.
+- Per-source token buckets rate-limit bursty producers (scan/capture
+  workers); suppressed messages are summarised instead of shown.
+- `max_lines` is how many lines the GUI keeps in the log widget (it trims
+  the widget itself, so no copy is kept here); optionally the full,
+  unthrottled log is spilled to a file.
+"""
+import threading
+import time
+from typing import Dict, List, Optional
+
+
+class _TokenBucket:
+    __slots__ = ("rate", "capacity", "tokens", "stamp")
+
+    def __init__(self, rate: float, capacity: float):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.stamp = time.monotonic()
+
+    def take(self, now: float) -> bool:
+        self.tokens = min(self.capacity, self.tokens + (now - self.stamp) * self.rate)
+        self.stamp = now
+        if self.tokens >= 1:
+            self.tokens -= 1
+            return True
+        return False
+
+
+class LogPipeline:
+    def __init__(self, max_lines: int = 5000, rate_per_sec: float = 50.0, burst: int = 200,
+                 spill_path: Optional[str] = None):
+        self.max_lines = max_lines
+        self.rate_per_sec = rate_per_sec
+        self.burst = burst
+        self._pending: List[str] = []
+        self._spill: List[str] = []
+        self._buckets: Dict[str, _TokenBucket] = {}
+        self._suppressed: Dict[str, int] = {}
+        self._lock = threading.Lock()
+        self._spill_fh = open(spill_path, "a", buffering=1 << 16) if spill_path else None
+
+    def put(self, message: str, source: str = "app") -> bool:
+        """Queue a message from any thread. Returns False if it was rate-limited."""
+        message = str(message)
+        with self._lock:
+            if self._spill_fh:
+                self._spill.append(message)
+            bucket = self._buckets.get(source)
+            if bucket is None:
+                bucket = self._buckets[source] = _TokenBucket(self.rate_per_sec, self.burst)
+            if not bucket.take(time.monotonic()):
+                self._suppressed[source] = self._suppressed.get(source, 0) + 1
+                return False
+            self._pending.append(message)
+            return True
+
+    def drain(self) -> List[str]:
+        """Take every pending line (plus suppression notices); call from the Tk thread."""
+        with self._lock:
+            lines, self._pending = self._pending, []
+            spill, self._spill = self._spill, []
+            suppressed, self._suppressed = self._suppressed, {}
+        for source, count in suppressed.items():
+            lines.append(f"[log] {count} message(s) from {source} suppressed (rate limit)")
+        if spill:
+            self._spill_fh.write("\n".join(spill) + "\n")
+            self._spill_fh.flush()
+        return lines
+
+    def close(self):
+        if self._spill_fh:
+            self.drain()
+            self._spill_fh.close()
+            self._spill_fh = None
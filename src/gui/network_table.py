@@ -0,0 +1,116 @@
+"""
+network_table.py
+- Tk-independent model behind the GUI network table.
+- Rows are keyed by network identity (scan_diff.network_key), so rescans only
+  update rows that changed and Treeview selection survives.
+- Filtering, sorting and paging happen here; the Treeview only ever holds one
+  page of rows.
+"""
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from src.scanner.network import NetworkLike
+from src.scanner.scan_diff import network_key
+
+COLUMNS = ("ssid", "security", "signal")
+DEFAULT_PAGE_SIZE = 500
+
+Row = Tuple[str, Tuple]
+
+
+def row_values(network: NetworkLike) -> Tuple:
+    return (network.get("ssid", "<hidden>"), network.get("security", ""), network.get("signal", ""))
+
+
+def plan_updates(rendered: Dict[str, Tuple], rows: Sequence[Row]):
+    """
+    Work out the minimal Treeview edits to go from `rendered` (iid -> values)
+    to `rows`. Returns (delete_iids, update_rows, insert_rows) where
+    insert_rows holds (index, iid, values).
+    """
+    wanted = {key for key, _ in rows}
+    delete = [iid for iid in rendered if iid not in wanted]
+    update = []
+    insert = []
+    for idx, (key, values) in enumerate(rows):
+        old = rendered.get(key)
+        if old is None:
+            insert.append((idx, key, values))
+        elif old != values:
+            update.append((key, values))
+    return delete, update, insert
+
+
+class NetworkTableModel:
+    def __init__(self, page_size: int = DEFAULT_PAGE_SIZE):
+        self.page_size = page_size
+        self.page = 0
+        self.filter_text = ""
+        self.min_signal: Optional[int] = None
+        self.sort_column: Optional[str] = None
+        self.sort_descending = False
+        self._rows: Dict[str, NetworkLike] = {}
+        self._view: List[str] = []
+
+    # --- data ---
+    def set_networks(self, networks: Sequence[NetworkLike]):
+        self._rows = {network_key(n): n for n in networks}
+        self._refresh()
+
+    def get(self, key: str) -> Optional[NetworkLike]:
+        return self._rows.get(key)
+
+    def __len__(self):
+        return len(self._rows)
+
+    # --- view controls ---
+    def set_filter(self, text: str = "", min_signal: Optional[int] = None):
+        """Case-insensitive substring match on SSID or security, plus an optional signal floor."""
+        self.filter_text = text.strip().casefold()
+        self.min_signal = min_signal
+        self.page = 0
+        self._refresh()
+
+    def sort_by(self, column: str):
+        """Sort by `column`; sorting by the same column again flips the direction."""
+        if column not in COLUMNS:
+            raise ValueError(f"unknown column: {column}")
+        if self.sort_column == column:
+            self.sort_descending = not self.sort_descending
+        else:
+            self.sort_column = column
+            self.sort_descending = column == "signal"  # strongest first is the useful default
+        self._refresh()
+
+    def set_page(self, page: int):
+        self.page = max(0, min(page, self.page_count - 1))
+
+    @property
+    def page_count(self) -> int:
+        return max(1, -(-len(self._view) // self.page_size))
+
+    @property
+    def match_count(self) -> int:
+        return len(self._view)
+
+    def visible_rows(self) -> List[Row]:
+        start = self.page * self.page_size
+        return [(key, row_values(self._rows[key])) for key in self._view[start:start + self.page_size]]
+
+    def _refresh(self):
+        rows = self._rows
+        keys = list(rows)
+        text = self.filter_text
+        if text:
+            keys = [k for k in keys
+                    if text in str(rows[k].get("ssid", "")).casefold()
+                    or text in str(rows[k].get("security", "")).casefold()]
+        if self.min_signal is not None:
+            floor = self.min_signal
+            keys = [k for k in keys if (rows[k].get("signal") or 0) >= floor]
+        col = self.sort_column
+        if col == "signal":
+            keys.sort(key=lambda k: rows[k].get("signal") or 0, reverse=self.sort_descending)
+        elif col:
+            keys.sort(key=lambda k: str(rows[k].get(col, "")).casefold(), reverse=self.sort_descending)
+        self._view = keys
+        self.set_page(self.page)
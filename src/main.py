@@ -6,34 +6,248 @@ Modes:
   --report <path>: save report (json/html)
   --simulate-capture : run capture in simulation mode (default)
   --unsafe-allow-capture : enable potentially dangerous capture (requires confirmation)
+  --watch        : rescan on an interval and print only what changed
+  --serve        : scan on an interval and serve latest/history/live deltas over HTTP
+  --record-scans / --replay-scans / --replay-synthetic : record raw nmcli scans, or
+                   replay recorded/synthetic ones in place of the radio
+  --fleet-reports <paths> : merge many sensors' reports into one --report
+  --audit-captures : check every file in CAPTURE_FOLDER for a handshake (cached)
+  --record-history : append scans to the SQLite history store (HISTORY_DB)
+  --report-from-history : build the report from stored history instead of a scan
+  --profile <path> : run under cProfile and write a pstats dump
+  --metrics-json / --metrics-prom <path> : write stage timings and counters
 """
 import argparse
-from src.scanner.wifi_scanner import scan_networks
-from src.report.report_generator import generate_report
 from src.utils.config import load_config
-from src.capture.handshake_capture import capture_handshake_simulated
+
+# Subsystems (scanner, report/jinja2, capture, history/sqlite, analytics) are
+# imported inside the branch that needs them: the CLI runs from cron and
+# monitoring hooks, where interpreter start-up dominates. See
+# benchmarks/bench_startup.py for the enforced import budget.
+
+def _parse_time(value):
+    """Unix seconds or an ISO-8601 timestamp."""
+    if value is None:
+        return None
+    try:
+        return float(value)
+    except ValueError:
+        from datetime import datetime
+        return datetime.fromisoformat(value).timestamp()
+
+def print_networks(batch):
+    if batch["scanned"]:
+        print("Found networks:")
+        for n in batch["networks"]:
+            print(f"  - {n['ssid']!r} | {n['security']} ({n['category']}, risk {n['risk']}) | "
+                  f"signal={n.get('signal')} ({n['quality']})")
+        if batch["counts"]:
+            counts = ", ".join(f"{n} {category}" for category, n in sorted(batch["counts"].items()))
+            print(f"Security: {counts}; highest risk {batch['max_risk']}")
+
+def print_captures(batch):
+    counts = batch["captures"]
+    print("Captures: " + ", ".join(f"{n} {status}" for status, n in sorted(counts.items())))
+
+def print_capture_progress(done, total, result):
+    # called from the scheduler's calling thread only, one line per target
+    if result["status"] == "done":
+        print(f"[SIM] [{done}/{total}] {result['ssid']!r}: handshake stored at {result['path']}")
+    else:
+        print(f"[SIM] [{done}/{total}] {result['ssid']!r}: {result['status']} {result['error'] or ''}".rstrip())
+
+def watch_printer(args):
+    """(show, file) for --watch: print (and append as NDJSON) what changed since the previous batch."""
+    from src.scanner.scan_diff import append_events, diff_scans, format_event, index_networks
+    out = open(args.watch_output, "a") if args.watch_output else None
+    baseline = {}
+
+    def show(batch):
+        nonlocal baseline
+        events, baseline = diff_scans(baseline, index_networks(batch["networks"]), args.signal_threshold)
+        for ev in events:
+            print(format_event(ev), flush=True)
+        if out and events:
+            append_events(out, events, batch["ts"])
+    return show, out
+
+def run_assessment(args, cfg, scan, store, report):
+    """
+    Scan (once, or every --interval with --watch) -> classify -> capture ->
+    persist -> report, as concurrent pipeline stages with bounded queues.
+    """
+    from src.pipeline.assessment import (
+        capture_stage, classify_stage, new_batch, output_stage, persist_stage, report_stage, scan_batches,
+    )
+    from src.pipeline.stages import Pipeline
+
+    show, out = watch_printer(args) if args.watch else (print_networks, None)
+    stages = [classify_stage(), output_stage("output", show)]
+    if args.simulate_capture:
+        # simulated: will not perform real capture
+        stages += [capture_stage(cfg, args.capture_workers or cfg["CAPTURE_WORKERS"], print_capture_progress),
+                   output_stage("capture_summary", print_captures)]
+    if store is not None:
+        stages.append(persist_stage(store))
+    if report:
+        stages.append(report_stage(report, args.report_format))
+    pipeline = Pipeline(stages)
+    if args.scan or args.watch:
+        source = scan_batches(scan, pipeline.closing, args.interval if args.watch else None)
+    else:
+        source = [new_batch(0, [], scanned=False)]
+    try:
+        pipeline.run(source)
+    except KeyboardInterrupt:
+        # --watch runs until Ctrl-C; in-flight batches were finished first
+        if not args.watch:
+            raise
+    finally:
+        if out:
+            out.close()
+
+def run_serve(args, cfg, scan, store):
+    import asyncio
+    from src.server.api_server import ScanService, serve
+    service = ScanService(scan, args.interval, args.signal_threshold)
+    try:
+        asyncio.run(serve(service, args.serve_host or cfg["SERVER_HOST"], args.serve_port or cfg["SERVER_PORT"], store))
+    except KeyboardInterrupt:
+        pass
 
 def main():
     parser = argparse.ArgumentParser(description="WiFi Security Assessment Tool")
     parser.add_argument("--scan", action="store_true", help="Scan nearby WiFi networks")
     parser.add_argument("--report", type=str, help="Save report to given file (JSON/HTML)")
+    parser.add_argument("--report-format", type=str, choices=("json", "ndjson", "csv", "html", "html-sharded"),
+                        help="Report format (default: from the --report extension); html-sharded writes a folder")
     parser.add_argument("--simulate-capture", action="store_true", help="Simulate handshake capture")
     parser.add_argument("--unsafe-allow-capture", action="store_true", help="Enable real capture (requires confirmation)")
+    parser.add_argument("--interfaces", type=str, help="Comma-separated interfaces to scan concurrently (default: SCAN_INTERFACES)")
+    parser.add_argument("--scan-timeout", type=float, help="Per-interface nmcli timeout in seconds (default: SCAN_TIMEOUT)")
+    parser.add_argument("--fresh", action="store_true", help="Always rescan, ignoring results younger than SCAN_CACHE_TTL")
+    parser.add_argument("--watch", action="store_true", help="Rescan continuously and print only changes")
+    parser.add_argument("--interval", type=float, default=30.0, help="Seconds between scans in --watch/--serve mode")
+    parser.add_argument("--signal-threshold", type=int, default=5, help="Minimum signal change reported in --watch mode")
+    parser.add_argument("--watch-output", type=str, help="Append --watch changes to this file as NDJSON")
+    parser.add_argument("--serve", action="store_true", help="Scan every --interval seconds and serve results over HTTP (SSE for dashboards)")
+    parser.add_argument("--serve-host", type=str, help="Address for --serve (default: SERVER_HOST)")
+    parser.add_argument("--serve-port", type=int, help="Port for --serve (default: SERVER_PORT)")
+    parser.add_argument("--record-history", action="store_true", help="Append scans to the history store (default: RECORD_HISTORY)")
+    parser.add_argument("--report-from-history", action="store_true", help="Write --report from the history store")
+    parser.add_argument("--show-downgrades", action="store_true", help="List security downgrades found in the history store")
+    parser.add_argument("--since", type=str, help="History window start (unix seconds or ISO-8601)")
+    parser.add_argument("--until", type=str, help="History window end (unix seconds or ISO-8601)")
+    parser.add_argument("--capture-workers", type=int, help="Concurrent simulated captures (default: CAPTURE_WORKERS)")
+    parser.add_argument("--record-scans", type=str, help="Append every raw nmcli scan to this NDJSON file")
+    parser.add_argument("--replay-scans", type=str, help="Replay scans from a --record-scans file instead of nmcli")
+    parser.add_argument("--replay-synthetic", type=int, help="Replay synthetic scans with this many APs instead of nmcli")
+    parser.add_argument("--replay-rate", type=float, default=0.0, help="Replayed scans per second (0 = unthrottled)")
+    parser.add_argument("--replay-loop", action="store_true", help="Start a --replay-scans recording over when it ends")
+    parser.add_argument("--fleet-reports", nargs="+", metavar="PATH", help="Merge sensor JSON/NDJSON reports (files or folders) into --report")
+    parser.add_argument("--fleet-workers", type=int, default=None, help="Worker processes for --fleet-reports (default: CPU count)")
+    parser.add_argument("--audit-captures", action="store_true", help="Check all capture files in CAPTURE_FOLDER for handshakes")
+    parser.add_argument("--audit-workers", type=int, default=None, help="Worker processes for --audit-captures (default: CPU count)")
+    parser.add_argument("--profile", type=str, help="Run under cProfile and write the stats dump here")
+    parser.add_argument("--metrics-json", type=str, help="Write stage timings/counters as JSON (default: METRICS_JSON)")
+    parser.add_argument("--metrics-prom", type=str, help="Write stage timings/counters in Prometheus text format (default: METRICS_PROM)")
     args = parser.parse_args()
+    if args.report_from_history and not args.report:
+        parser.error("--report-from-history needs --report PATH")
 
     cfg = load_config()
-    networks = []
+    try:
+        if args.profile:
+            import cProfile
+            profiler = cProfile.Profile()
+            try:
+                profiler.runcall(run, args, cfg)
+            finally:
+                profiler.dump_stats(args.profile)
+                print(f"Profile written to {args.profile} (view with: python -m pstats {args.profile})")
+        else:
+            run(args, cfg)
+    finally:
+        write_metrics(args.metrics_json or cfg["METRICS_JSON"], args.metrics_prom or cfg["METRICS_PROM"])
 
-    if args.scan:
-        networks = scan_networks()
-        print("Found networks:")
-        for n in networks:
-            print(f"  - {n['ssid']!r} | {n['security']} | signal={n.get('signal')}")
+def write_metrics(json_path, prom_path):
+    if not (json_path or prom_path):
+        return
+    from src.utils.metrics import METRICS
+    if json_path:
+        METRICS.write_json(json_path)
+    if prom_path:
+        METRICS.write_prometheus(prom_path)
+
+def setup_replay(args):
+    """Install the replay backend and/or scan recorder asked for on the command line."""
+    if not (args.record_scans or args.replay_scans or args.replay_synthetic):
+        return None
+    from src.scanner import wifi_scanner
+    from src.scanner.replay import ReplayBackend, ScanRecorder
+    if args.replay_scans or args.replay_synthetic:
+        wifi_scanner.set_scan_backend(ReplayBackend(args.replay_scans, args.replay_synthetic or 0,
+                                                    args.replay_rate, args.replay_loop))
+    if not args.record_scans:
+        return None
+    recorder = ScanRecorder(args.record_scans)
+    wifi_scanner.set_scan_recorder(recorder)
+    return recorder
+
+def run(args, cfg):
+    recorder = setup_replay(args)
+    interfaces = args.interfaces.split(",") if args.interfaces else cfg["SCAN_INTERFACES"]
+    timeout = args.scan_timeout or cfg["SCAN_TIMEOUT"]
+    since, until = _parse_time(args.since), _parse_time(args.until)
+    use_history = args.record_history or cfg["RECORD_HISTORY"] or args.report_from_history or args.show_downgrades or args.serve
+    store = None
+    if use_history:
+        from src.storage.history_store import HistoryStore
+        store = HistoryStore(cfg["HISTORY_DB"])
+    record = store is not None and (args.record_history or cfg["RECORD_HISTORY"])
+
+    # --watch/--serve want every scan and replay/record must see every call, so they bypass the cache
+    cache = None
+    if cfg["SCAN_CACHE_TTL"] > 0 and not (args.watch or args.serve or args.replay_scans or args.replay_synthetic
+                                          or args.record_scans):
+        from src.scanner.scan_cache import ScanCache
+        cache = ScanCache(cfg["SCAN_CACHE_TTL"], cfg["SCAN_CACHE_FILE"])
+
+    def scan():
+        """(networks, from_cache)"""
+        if cache is not None:
+            nets, cached = cache.scan(interfaces, timeout, force=args.fresh)
+        else:
+            from src.scanner.wifi_scanner import scan_networks
+            nets, cached = scan_networks(interfaces, timeout), False
+        if cached:
+            print(f"(reusing a scan from the last {cfg['SCAN_CACHE_TTL']:g}s; --fresh to rescan)")
+        return nets, cached
+
+    if args.serve:
+        def scan_and_record():
+            nets, cached = scan()
+            if record and not cached:
+                store.record_scan(nets)
+            return nets
+        run_serve(args, cfg, scan_and_record, store)
+        if store:
+            store.close()
+        if recorder:
+            recorder.close()
+        return
+
+    # fleet and history reports are written from their own sources below
+    own_report = args.report and not (args.fleet_reports or args.report_from_history)
+    if args.scan or args.watch or args.simulate_capture or own_report:
+        run_assessment(args, cfg, scan, store if record else None, args.report if own_report else None)
+    if args.watch:
+        if store:
+            store.close()
+        if recorder:
+            recorder.close()
+        return
 
-    if args.simulate_capture:
-        # simulated: will not perform real capture
-        for n in networks:
-            capture_handshake_simulated(n, cfg)
     if args.unsafe_allow_capture:
         print("WARNING: You asked to allow real capture. Make sure you own the target networks.")
         confirm = input("Type 'I_HAVE_PERMISSION' to continue: ").strip()
@@ -42,9 +256,40 @@ def main():
         else:
             # Real capture code must be enabled by developer manually.
             print("Unsafe capture acknowledged. To enable, implement capture.handshake_capture.perform_real_capture()")
-    if args.report:
-        generate_report(networks, args.report)
+    if args.audit_captures:
+        from src.capture.capture_audit import audit_captures
+        audit = audit_captures(cfg["CAPTURE_FOLDER"], cfg["AUDIT_CACHE"], workers=args.audit_workers)
+        results = audit["results"]
+        with_hs = sorted(p for p, r in results.items() if r.get("handshake"))
+        print(f"Audited {len(results)} capture files ({audit['analyzed']} analysed, {audit['cached']} cached)")
+        print(f"Files with handshake: {len(with_hs)}")
+        for path in with_hs:
+            print(f"  - {path}")
+    if args.show_downgrades:
+        downgrades = store.security_downgrades(since, until)
+        print(f"Security downgrades: {len(downgrades)}")
+        from datetime import datetime
+        for d in downgrades:
+            when = datetime.fromtimestamp(d["ts"]).isoformat(timespec="seconds")
+            print(f"  - {when} {d['ssid']!r} ({d['key']}): {d['from_security']} -> {d['to_security']}")
+    if args.fleet_reports:
+        if not args.report:
+            print("--fleet-reports needs --report <output file>")
+        else:
+            from src.report.fleet import write_fleet_report
+            fleet = write_fleet_report(args.fleet_reports, args.report, args.report_format, args.fleet_workers)
+            print(f"Merged {fleet['reports']} reports into {len(fleet['networks'])} networks: {args.report}")
+            for path, error in sorted(fleet["errors"].items()):
+                print(f"  ! {path}: {error}")
+    elif args.report:
+        if args.report_from_history:
+            from src.report.report_generator import generate_report_from_history
+            generate_report_from_history(store, args.report, since, until, args.report_format)
         print(f"Report saved to {args.report}")
+    if store:
+        store.close()
+    if recorder:
+        recorder.close()
 
 if __name__ == "__main__":
     main()
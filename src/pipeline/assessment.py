@@ -0,0 +1,103 @@
+"""
+assessment.py
+- The CLI's scan -> classify -> capture -> persist -> report flow as
+  pipeline stages (see stages.py). Items are scan batches:
+  {"seq", "ts", "networks", "cached", "scanned"}. classify turns the
+  networks into dict rows carrying "category", "risk" and "quality" and adds
+  "counts"/"max_risk" (encryption_parser.classify_scan); persist and report
+  reuse those instead of classifying again. capture adds "captures"
+  (status counts).
+- With an interval, scan_batches keeps scanning, so on multi-radio sensors
+  the next scan runs while earlier batches are still being captured,
+  stored and reported.
+"""
+import time
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+
+from src.pipeline.stages import Stage
+from src.scanner.network import NetworkLike, as_dict
+from src.utils.metrics import span
+
+ScanFn = Callable[[], Tuple[List[NetworkLike], bool]]
+
+
+def new_batch(seq: int, networks: List[NetworkLike], cached: bool = False, scanned: bool = True) -> Dict:
+    return {"seq": seq, "ts": time.time(), "networks": networks, "cached": cached, "scanned": scanned}
+
+
+def scan_batches(scan_fn: ScanFn, closing, interval: Optional[float] = None,
+                 max_batches: Optional[int] = None) -> Iterator[Dict]:
+    """
+    Batches from scan_fn() -> (networks, from_cache): one, or one every
+    `interval` seconds until `closing` (a threading.Event) is set. A replay
+    backend running out (EOFError) ends the stream.
+    """
+    seq = 0
+    while not closing.is_set():
+        started = time.monotonic()
+        try:
+            networks, cached = scan_fn()
+        except EOFError:
+            return
+        yield new_batch(seq, networks, cached)
+        seq += 1
+        if interval is None or (max_batches is not None and seq >= max_batches):
+            return
+        closing.wait(max(0.0, interval - (time.monotonic() - started)))
+
+
+def classify_stage() -> Stage:
+    def classify(batch: Dict) -> Dict:
+        from src.scanner.encryption_parser import classify_scan
+        from src.scanner.signal_utils import signal_to_quality
+
+        with span("classify"):
+            networks = batch["networks"]
+            assessment = classify_scan(networks)
+            rows = []
+            for n, (category, risk) in zip(networks, assessment["assessments"]):
+                row = dict(as_dict(n))
+                row["category"], row["risk"] = category, risk
+                row["quality"] = signal_to_quality(row.get("signal") or 0)
+                rows.append(row)
+        batch["networks"] = rows
+        batch["counts"], batch["max_risk"] = assessment["counts"], assessment["max_risk"]
+        return batch
+    return Stage("classify", classify)
+
+
+def capture_stage(cfg: Dict, workers: int, progress=None) -> Stage:
+    from src.capture.scheduler import CaptureScheduler, summarize
+    scheduler = CaptureScheduler(workers=workers, timeout=cfg["CAPTURE_TIMEOUT"], progress=progress)
+
+    def capture(batch: Dict) -> Dict:
+        batch["captures"] = summarize(scheduler.run(batch["networks"], cfg))
+        return batch
+    # cancelling the scheduler stops the captures of the batch in flight
+    return Stage("capture", capture, cancel=scheduler.cancel)
+
+
+def persist_stage(store) -> Stage:
+    def persist(batch: Dict) -> Dict:
+        # a scan reused from the cache was stored when it was taken
+        if batch["scanned"] and not batch["cached"]:
+            store.record_scan(batch["networks"], batch["ts"])
+        return batch
+    return Stage("persist", persist)
+
+
+def report_stage(outfile: str, fmt: Optional[str] = None) -> Stage:
+    """Write the report of each batch (continuous runs keep rewriting the latest one)."""
+    def report(batch: Dict) -> Dict:
+        from src.report.report_generator import generate_report
+        generate_report(batch["networks"], outfile, fmt)
+        return batch
+    return Stage("report", report)
+
+
+def output_stage(name: str, show: Callable[[Dict], None]) -> Stage:
+    """Call show(batch) (printing, watch deltas) and pass the batch on."""
+    def output(batch: Dict) -> Dict:
+        show(batch)
+        return batch
+    return Stage(name, output)
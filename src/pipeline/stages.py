@@ -0,0 +1,162 @@
+"""
+stages.py
+- A small staged pipeline: a source thread feeds items through a chain of
+  stages, each running its function on its own worker thread(s), connected
+  by bounded queues.
+- Backpressure: when a stage falls behind, its input queue fills and the
+  stages before it (and finally the source) block instead of buffering
+  without bound.
+- Shutdown:
+    close()  stop taking new items from the source; everything already in
+             flight is finished (first Ctrl-C in run()).
+    stop()   abandon queued items as soon as every worker notices, and call
+             each stage's cancel hook (second Ctrl-C, or a stage error).
+  Workers poll their queues, so neither waits on a blocked put/get forever.
+- Threads rather than processes: every stage either waits on I/O (nmcli
+  subprocesses, SQLite, report files, capture radios) or is a memoized
+  lookup, and items (scan batches) would cost more to pickle than to process.
+"""
+import queue
+import threading
+from typing import Any, Callable, Iterable, List, Optional, Sequence
+
+from src.utils.metrics import inc
+
+DEFAULT_QUEUE_SIZE = 4
+POLL_SECONDS = 0.1
+STOP = object()  # end-of-stream marker passed down the queues
+
+
+class Stage:
+    """One pipeline step: fn(item) on `workers` threads; returning None drops the item."""
+
+    def __init__(self, name: str, fn: Callable[[Any], Any], workers: int = 1,
+                 cancel: Optional[Callable[[], None]] = None):
+        self.name = name
+        self.fn = fn
+        self.workers = max(1, workers)
+        self.cancel = cancel
+
+
+class Pipeline:
+    def __init__(self, stages: Sequence[Stage], queue_size: int = DEFAULT_QUEUE_SIZE):
+        self.stages = list(stages)
+        self.queue_size = queue_size
+        self.closing = threading.Event()  # sources may wait on this between items
+        self._stopped = threading.Event()
+        self._lock = threading.Lock()
+        self.errors: List[BaseException] = []
+        self.completed = 0
+
+    @property
+    def stopped(self) -> bool:
+        return self._stopped.is_set()
+
+    def close(self):
+        self.closing.set()
+
+    def stop(self):
+        self.closing.set()
+        if self._stopped.is_set():
+            return
+        self._stopped.set()
+        for stage in self.stages:
+            if stage.cancel:
+                stage.cancel()
+
+    # --- queue helpers ---
+    def _put(self, q: queue.Queue, item) -> bool:
+        while not self.stopped:
+            try:
+                q.put(item, timeout=POLL_SECONDS)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def _get(self, q: queue.Queue):
+        while not self.stopped:
+            try:
+                return q.get(timeout=POLL_SECONDS)
+            except queue.Empty:
+                continue
+        return STOP
+
+    def _fail(self, exc: BaseException):
+        with self._lock:
+            self.errors.append(exc)
+        self.stop()
+
+    # --- threads ---
+    def _feed(self, source: Iterable, out: queue.Queue):
+        try:
+            for item in source:
+                if self.closing.is_set() or not self._put(out, item):
+                    break
+        except BaseException as exc:
+            self._fail(exc)
+        finally:
+            self._put(out, STOP)
+
+    def _work(self, stage: Stage, inq: queue.Queue, outq: Optional[queue.Queue], remaining: List[int]):
+        try:
+            while True:
+                item = self._get(inq)
+                if item is STOP:
+                    self._put(inq, STOP)  # let the other workers of this stage see it too
+                    break
+                result = stage.fn(item)
+                inc("pipeline_items_total", stage=stage.name)
+                if result is None:
+                    continue
+                if outq is None:
+                    with self._lock:
+                        self.completed += 1
+                elif not self._put(outq, result):
+                    break
+        except BaseException as exc:
+            self._fail(exc)
+        finally:
+            with self._lock:
+                remaining[0] -= 1
+                last = remaining[0] == 0
+            if last and outq is not None:
+                self._put(outq, STOP)
+
+    def run(self, source: Iterable) -> int:
+        """
+        Push every item of `source` through the stages; returns how many items
+        left the last stage. Re-raises the first stage error. On Ctrl-C the
+        pipeline drains what is in flight, then re-raises KeyboardInterrupt;
+        a second Ctrl-C abandons the remaining items.
+        """
+        queues = [queue.Queue(self.queue_size) for _ in self.stages]
+        threads = [threading.Thread(target=self._feed, args=(source, queues[0]), name="pipeline-source", daemon=True)]
+        for i, stage in enumerate(self.stages):
+            outq = queues[i + 1] if i + 1 < len(queues) else None
+            remaining = [stage.workers]
+            threads += [threading.Thread(target=self._work, args=(stage, queues[i], outq, remaining),
+                                         name=f"pipeline-{stage.name}-{n}", daemon=True)
+                        for n in range(stage.workers)]
+        for t in threads:
+            t.start()
+        try:
+            self._join(threads)
+        except KeyboardInterrupt:
+            self.close()
+            try:
+                self._join(threads)
+            except KeyboardInterrupt:
+                self.stop()
+                self._join(threads)
+            raise
+        if self.errors:
+            raise self.errors[0]
+        return self.completed
+
+    @staticmethod
+    def _join(threads: List[threading.Thread]):
+        # join with a timeout so Ctrl-C reaches the main thread
+        for t in threads:
+            while t.is_alive():
+                t.join(POLL_SECONDS)
@@ -0,0 +1,146 @@
+"""
+fleet.py
+- Combines the JSON/NDJSON reports written by many sensors into one
+  fleet-wide report.
+- Each report file is parsed and deduplicated in a worker process; the parent
+  only merges the per-file results, with a bounded number of files in flight,
+  so memory grows with the number of distinct networks, not with the number
+  or size of reports.
+- Networks are identified by BSSID, or by SSID + security when the BSSID is
+  missing. The strongest sighting wins; `sensors` counts the reports that saw
+  the network and `best_sensor` is the report (path without extension)
+  with the strongest signal.
+- Per-sensor fields (category/risk from each sensor's classifier version,
+  channel_congestion from each sensor's own RF view) are dropped from the
+  merged rows; category and risk are recomputed when the report is written.
+  CSV fleet reports use the fixed FLEET_COLUMNS header.
+"""
+import json
+import os
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence
+
+from src.report.report_generator import generate_report_stream
+from src.scanner.network import FIELD_NAMES
+from src.utils.metrics import inc, span
+
+REPORT_EXTENSIONS = (".json", ".ndjson", ".jsonl")
+# below this many reports a process pool costs more than it saves
+POOL_THRESHOLD = 8
+SENSOR_FIELDS = ("category", "risk", "channel_congestion")
+FLEET_COLUMNS = FIELD_NAMES + ("category", "risk", "sensors", "best_sensor")
+
+
+def fleet_key(row: Dict) -> str:
+    bssid = row.get("bssid")
+    if bssid:
+        return bssid.lower()
+    return f"{row.get('ssid') or '<hidden>'}|{row.get('security') or '--'}"
+
+
+def iter_report_files(paths: Iterable[str]) -> Iterator[str]:
+    """Report files among `paths`; directories are searched recursively."""
+    for path in paths:
+        if not os.path.isdir(path):
+            yield path
+            continue
+        for root, dirs, files in os.walk(path):
+            dirs.sort()
+            for name in sorted(files):
+                if name.lower().endswith(REPORT_EXTENSIONS):
+                    yield os.path.join(root, name)
+
+
+def iter_report_rows(path: str) -> Iterator[Dict]:
+    """Network rows of one report: a {"networks": [...]} JSON document or NDJSON."""
+    with open(path) as fh:
+        if path.lower().endswith(".json"):
+            yield from json.load(fh).get("networks", [])
+            return
+        for line in fh:
+            if line.strip():
+                yield json.loads(line)
+
+
+def _better(row: Dict, current: Dict) -> bool:
+    return (row.get("signal") or 0) > (current.get("signal") or 0)
+
+
+def parse_report(path: str) -> Dict:
+    """Deduplicated networks of one report. Never raises; errors are returned."""
+    # sensors often all write "report.json" into their own folder, so keep the path
+    sensor = os.path.splitext(path)[0]
+    merged: Dict[str, Dict] = {}
+    try:
+        for row in iter_report_rows(path):
+            if row.get("error"):
+                continue
+            key = fleet_key(row)
+            current = merged.get(key)
+            if current is None or _better(row, current):
+                for field in SENSOR_FIELDS:
+                    row.pop(field, None)
+                row["best_sensor"] = sensor
+                merged[key] = row
+    except (OSError, ValueError, AttributeError) as exc:
+        return {"path": path, "networks": {}, "error": str(exc)}
+    return {"path": path, "networks": merged, "error": None}
+
+
+def merge_into(fleet: Dict[str, Dict], networks: Dict[str, Dict]):
+    """Fold one report's deduplicated networks into the fleet map."""
+    for key, row in networks.items():
+        current = fleet.get(key)
+        if current is None:
+            row["sensors"] = 1
+            fleet[key] = row
+            continue
+        sensors = current["sensors"] + 1
+        if _better(row, current):
+            row["sensors"] = sensors
+            fleet[key] = row
+        else:
+            current["sensors"] = sensors
+
+
+def _parsed(paths: List[str], workers: Optional[int]) -> Iterator[Dict]:
+    """parse_report() results, at most 2 x workers reports in flight at once."""
+    if len(paths) < POOL_THRESHOLD or workers == 1:
+        yield from map(parse_report, paths)
+        return
+    workers = workers or os.cpu_count() or 1
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        pending = set()
+        for path in paths:
+            pending.add(pool.submit(parse_report, path))
+            if len(pending) >= workers * 2:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for fut in done:
+                    yield fut.result()
+        for fut in pending:
+            yield fut.result()
+
+
+def aggregate_reports(paths: Sequence[str], workers: Optional[int] = None) -> Dict:
+    """
+    Merge every report under `paths`.
+    Returns {"networks": {key: row}, "reports": n, "errors": {path: message}}.
+    """
+    files = list(iter_report_files(paths))
+    fleet: Dict[str, Dict] = {}
+    errors: Dict[str, str] = {}
+    with span("fleet_aggregate"):
+        for result in _parsed(files, workers):
+            if result["error"]:
+                errors[result["path"]] = result["error"]
+            merge_into(fleet, result["networks"])
+    inc("fleet_reports_total", len(files))
+    return {"networks": fleet, "reports": len(files), "errors": errors}
+
+
+def write_fleet_report(paths: Sequence[str], outfile: str, fmt: Optional[str] = None,
+                       workers: Optional[int] = None) -> Dict:
+    """Aggregate `paths` and write the fleet report; returns the aggregate summary."""
+    result = aggregate_reports(paths, workers)
+    generate_report_stream(result["networks"].values(), outfile, fmt, columns=FLEET_COLUMNS)
+    return result
@@ -0,0 +1,204 @@
+"""
+html_shards.py
+- Large HTML reports: a small index.html plus data shards with client-side
+  paging, sorting and search, so 100k-network reports open quickly.
+- Shards are JavaScript files (`wifiReport.addShard(rows)`) rather than
+  .json, because browsers refuse fetch()/XHR of local files opened via
+  file://, while <script src> works everywhere.
+- Shard files are named by the hash of their content: regenerating a report
+  rewrites only the shards whose rows changed, and shards no longer referenced
+  are removed once the new index.html has atomically replaced the old one.
+  Shards are hashed and written on a thread pool as rows stream in, with a
+  bounded number in flight.
+- The channel analysis, when given, is small and goes into index.html itself.
+"""
+import hashlib
+import json
+import os
+import threading
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from src.scanner.network import NetworkLike
+
+DEFAULT_SHARD_SIZE = 5000
+DEFAULT_PAGE_SIZE = 100
+SHARD_DIR = "shards"
+COLUMNS = ("ssid", "bssid", "security", "category", "risk", "signal", "channel", "frequency",
+           "channel_congestion")
+CHANNEL_COLUMNS = ("band", "channel", "aps", "mean_aps", "load", "adjacent", "congestion")
+SEARCH_COLUMNS = ("ssid", "bssid", "security", "category")
+
+INDEX_TEMPLATE = """<!doctype html>
+<html>
+<head>
+<meta charset="utf-8">
+<title>WiFi Assessment Report</title>
+<style>
+body{font-family:sans-serif;margin:1em}
+table{border-collapse:collapse;width:100%}
+th,td{border-bottom:1px solid #ddd;padding:2px 6px;text-align:left}
+th{cursor:pointer;background:#f4f4f4;user-select:none}
+#bar>*{margin-right:.5em}
+</style>
+</head>
+<body>
+<h1>WiFi Assessment Report</h1>
+<div id="bar"><input id="q" size="40" placeholder="Search SSID / BSSID / security">
+<button id="prev">&#9664;</button><span id="info">Loading&hellip;</span><button id="next">&#9654;</button></div>
+<table><thead><tr id="head"></tr></thead><tbody id="rows"></tbody></table>
+<h2 id="chan-title" hidden>Channels</h2>
+<table id="chan"></table>
+<script>
+var META = __META__;
+(function () {
+  var cols = META.columns, rows = [], view = [], page = 0, sortCol = -1, sortDir = 1, query = "", pending = false;
+  var search = META.search.map(function (c) { return cols.indexOf(c); });
+  function $(id) { return document.getElementById(id); }
+  function esc(v) {
+    return String(v == null ? "" : v).replace(/[&<>"]/g, function (c) {
+      return {"&": "&amp;", "<": "&lt;", ">": "&gt;", '"': "&quot;"}[c];
+    });
+  }
+  function cmp(a, b) {
+    if (a == null) return b == null ? 0 : -1;
+    if (b == null) return 1;
+    if (typeof a === "number" && typeof b === "number") return a - b;
+    return String(a).localeCompare(String(b));
+  }
+  function refresh() {
+    var q = query.toLowerCase();
+    view = !q ? rows.slice() : rows.filter(function (r) {
+      return search.some(function (i) { return r[i] != null && String(r[i]).toLowerCase().indexOf(q) >= 0; });
+    });
+    if (sortCol >= 0) view.sort(function (a, b) { return sortDir * cmp(a[sortCol], b[sortCol]); });
+    render();
+  }
+  function render() {
+    var pages = Math.max(1, Math.ceil(view.length / META.page_size));
+    page = Math.min(Math.max(page, 0), pages - 1);
+    var html = [], start = page * META.page_size;
+    view.slice(start, start + META.page_size).forEach(function (r) {
+      html.push("<tr><td>" + r.map(esc).join("</td><td>") + "</td></tr>");
+    });
+    $("rows").innerHTML = html.join("");
+    $("info").textContent = "Page " + (page + 1) + "/" + pages + " \\u2014 " + view.length + " of " + rows.length +
+      (rows.length < META.total ? " (loading " + META.total + ")" : "") + " networks";
+  }
+  function schedule() {
+    if (pending) return;
+    pending = true;
+    setTimeout(function () { pending = false; refresh(); }, 50);
+  }
+  window.wifiReport = {addShard: function (data) { for (var k = 0; k < data.length; k++) rows.push(data[k]); schedule(); }};
+  if (META.channels.length) {
+    $("chan-title").hidden = false;
+    $("chan").innerHTML = "<tr><th>" + META.channel_columns.map(esc).join("</th><th>") + "</th></tr>" +
+      META.channels.map(function (c) {
+        return "<tr><td>" + META.channel_columns.map(function (k) { return esc(c[k]); }).join("</td><td>") + "</td></tr>";
+      }).join("");
+  }
+  $("head").innerHTML = cols.map(function (c, i) { return '<th data-i="' + i + '">' + esc(c) + "</th>"; }).join("");
+  $("head").onclick = function (e) {
+    var i = +e.target.getAttribute("data-i");
+    if (isNaN(i)) return;
+    sortDir = sortCol === i ? -sortDir : 1;
+    sortCol = i;
+    refresh();
+  };
+  $("q").oninput = function () { query = this.value; page = 0; schedule(); };
+  $("prev").onclick = function () { page--; render(); };
+  $("next").onclick = function () { page++; render(); };
+  var next = 0;
+  (function loadNext() {
+    if (next >= META.shards.length) { refresh(); return; }
+    var s = document.createElement("script");
+    s.src = META.shards[next++];
+    s.onload = s.onerror = loadNext;
+    document.body.appendChild(s);
+  })();
+})();
+</script>
+</body>
+</html>
+"""
+
+
+def _shard_rows(rows: Iterable[Dict], shard_size: int) -> Iterable[List[List]]:
+    shard = []
+    for row in rows:
+        shard.append([row.get(c) for c in COLUMNS])
+        if len(shard) >= shard_size:
+            yield shard
+            shard = []
+    if shard:
+        yield shard
+
+
+def _write_shard(shard_dir: str, shard: List[List]) -> Tuple[str, int, bool]:
+    """Write one shard unless an identical one exists; returns (name, rows, written)."""
+    body = f"wifiReport.addShard({json.dumps(shard, separators=(',', ':'))});\n".encode()
+    name = f"shard-{hashlib.sha256(body).hexdigest()[:20]}.js"
+    path = os.path.join(shard_dir, name)
+    if os.path.exists(path):
+        return name, len(shard), False
+    # identical shards within one report may be written by two threads at once
+    tmp = f"{path}.{threading.get_ident()}.tmp"
+    with open(tmp, "wb") as fh:
+        fh.write(body)
+    os.replace(tmp, path)
+    return name, len(shard), True
+
+
+def write_sharded_html(networks: Iterable[NetworkLike], outdir: str, shard_size: int = DEFAULT_SHARD_SIZE,
+                       page_size: int = DEFAULT_PAGE_SIZE, workers: Optional[int] = None,
+                       channels: Optional[Dict] = None) -> Dict:
+    """
+    Write `outdir`/index.html and its shards (`channels`: optional channel
+    analysis from report_generator.channel_analysis). Returns
+    {"index": path, "shards": n, "written": n, "reused": n, "removed": n, "rows": n}.
+    """
+    from src.report.report_generator import report_rows
+
+    shard_dir = os.path.join(outdir, SHARD_DIR)
+    os.makedirs(shard_dir, exist_ok=True)
+    workers = workers or min(8, os.cpu_count() or 1)
+    results: Dict[int, Tuple[str, int, bool]] = {}
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        pending = {}
+        for i, shard in enumerate(_shard_rows(report_rows(networks, channels), shard_size)):
+            pending[pool.submit(_write_shard, shard_dir, shard)] = i
+            if len(pending) >= workers * 2:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for fut in done:
+                    results[pending.pop(fut)] = fut.result()
+        for fut, i in pending.items():
+            results[i] = fut.result()
+
+    names = [results[i][0] for i in range(len(results))]
+    meta = {
+        "columns": COLUMNS,
+        "search": SEARCH_COLUMNS,
+        "shards": [f"{SHARD_DIR}/{n}" for n in names],
+        "total": sum(r[1] for r in results.values()),
+        "page_size": page_size,
+        "channels": channels["channels"] if channels else [],
+        "channel_columns": CHANNEL_COLUMNS,
+    }
+    # swap in the new index before dropping old shards, so a browser (or a
+    # crash) never sees an index that references deleted shards
+    index = os.path.join(outdir, "index.html")
+    tmp = f"{index}.tmp"
+    with open(tmp, "w") as fh:
+        fh.write(INDEX_TEMPLATE.replace("__META__", json.dumps(meta).replace("</", "<\\/")))
+    os.replace(tmp, index)
+
+    keep = set(names)
+    removed = 0
+    for name in os.listdir(shard_dir):
+        if name.startswith("shard-") and name not in keep:
+            os.remove(os.path.join(shard_dir, name))
+            removed += 1
+    written = sum(1 for r in results.values() if r[2])
+    return {"index": index, "shards": len(names), "written": written, "reused": len(names) - written,
+            "removed": removed, "rows": meta["total"]}
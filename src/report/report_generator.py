@@ -1,14 +1,31 @@
 """
 report_generator.py
 
-Generates JSON or HTML reports for a list of network dicts.
-A minimal Jinja2 template is supported for HTML output.
+Generates JSON, NDJSON, CSV or HTML reports for Network records (or plain dicts).
+A minimal Jinja2 template is supported for HTML output; it is compiled once
+and cached.
+
+Every row carries the security `category` and `risk` score from
+encryption_parser (memoized, so the per-row cost is a cache lookup); rows
+that were already classified (e.g. by the CLI pipeline) keep theirs.
+
+Reports of a scan or of history also carry the channel occupancy and
+interference analysis from analytics.channels: a "channels" section in JSON
+and HTML, and a per-network `channel_congestion` column in every format.
+
+generate_report_stream() accepts any iterable (e.g. a generator) and writes
+rows as they arrive, so memory stays flat for very large network sets.
 """
+import csv
 import json
-from jinja2 import Template
-from typing import List, Dict
+from functools import lru_cache
+from typing import Dict, Iterable, List, Optional, Sequence
 import os
 
+from src.scanner.encryption_parser import security_risk
+from src.scanner.network import FIELD_NAMES, FIELD_SET, Network, NetworkLike
+from src.utils.metrics import inc, span
+
 DEFAULT_HTML_TEMPLATE = """
 <!doctype html>
 <html>
@@ -17,25 +34,154 @@ DEFAULT_HTML_TEMPLATE = """
   <h1>WiFi Assessment Report</h1>
   <ul>
   {% for n in networks %}
-    <li><strong>{{n.ssid}}</strong> — Security: {{n.security}} — Signal: {{n.signal}}</li>
+    <li><strong>{{n.ssid}}</strong> — Security: {{n.security}} ({{n.category}}, risk {{n.risk}}) — Signal: {{n.signal}}</li>
   {% endfor %}
   </ul>
+  {% if channels and channels.channels %}
+  <h2>Channels ({{channels.scans}} scans)</h2>
+  <table>
+    <tr><th>Band</th><th>Channel</th><th>APs</th><th>APs/scan</th><th>Load</th><th>Adjacent</th><th>Congestion</th></tr>
+    {% for c in channels.channels %}
+    <tr><td>{{c.band}}</td><td>{{c.channel}}</td><td>{{c.aps}}</td><td>{{c.mean_aps}}</td><td>{{c.load}}</td><td>{{c.adjacent}}</td><td>{{c.congestion}}</td></tr>
+    {% endfor %}
+  </table>
+  {% endif %}
 </body>
 </html>
 """
 
-def generate_report(networks: List[Dict], outfile: str = "report.json"):
-    if outfile.endswith(".json"):
-        with open(outfile, "w") as fh:
-            json.dump({"networks": networks}, fh, indent=2)
-        return outfile
-    if outfile.endswith(".html"):
-        tpl = Template(DEFAULT_HTML_TEMPLATE)
-        html = tpl.render(networks=networks)
-        with open(outfile, "w") as fh:
-            fh.write(html)
-        return outfile
-    # fallback to json
-    with open(outfile, "w") as fh:
-        json.dump({"networks": networks}, fh, indent=2)
+# html-sharded writes a directory (index.html + data shards), see html_shards.py
+REPORT_FORMATS = ("json", "ndjson", "csv", "html", "html-sharded")
+_EXTENSIONS = {".json": "json", ".ndjson": "ndjson", ".jsonl": "ndjson", ".csv": "csv", ".html": "html", ".htm": "html"}
+WRITE_BUFFER = 1 << 20
+
+@lru_cache(maxsize=None)
+def _html_template():
+    # jinja2 is only imported when an HTML report is actually rendered
+    from jinja2 import Environment
+    return Environment().from_string(DEFAULT_HTML_TEMPLATE)
+
+def report_rows(networks: Iterable[NetworkLike], channels: Optional[Dict] = None) -> Iterable[dict]:
+    """
+    Plain dict rows with the security category and risk score added, plus
+    `channel_congestion` (looked up by the row's frequency, or its channel when
+    the frequency is missing) when a channel analysis is given.
+    """
+    congestion = None
+    if channels is not None:
+        from src.analytics.channels import congestion_by_frequency, row_frequency
+        congestion = congestion_by_frequency(channels)
+    for n in networks:
+        # copy plain dicts so callers' rows are not modified
+        row = n.to_dict() if isinstance(n, Network) else dict(n)
+        if "category" not in row or "risk" not in row:
+            row["category"], row["risk"] = security_risk(row.get("security") or "")
+        if congestion is not None:
+            row["channel_congestion"] = congestion.get(row_frequency(row.get("frequency"), row.get("channel")))
+        yield row
+
+def channel_analysis(history) -> Dict:
+    """Channel occupancy/interference section for a signal_history frame."""
+    # pandas is only imported when a report is written
+    from src.analytics.channels import channel_report
+    with span("channels"):
+        return channel_report(history)
+
+def scan_channels(networks: List[NetworkLike]) -> Dict:
+    from src.analytics.signal_history import history_from_scans
+    return channel_analysis(history_from_scans([(0, networks)]))
+
+def history_channels(store, since: Optional[float] = None, until: Optional[float] = None) -> Dict:
+    """
+    Channel analysis across every scan a HistoryStore recorded in [since, until].
+    SQLite aggregates per scan and channel first, so memory follows the number
+    of scans x channels rather than every observation.
+    """
+    from src.analytics.channels import aggregated_channel_report
+    with span("channels"):
+        return aggregated_channel_report(store.channel_loads(since, until), store.channel_sightings(since, until),
+                                         store.scan_count(since, until))
+
+def report_format(outfile: str, fmt: Optional[str] = None) -> str:
+    """Explicit `fmt`, else the format implied by the extension (JSON by default)."""
+    if fmt:
+        if fmt not in REPORT_FORMATS:
+            raise ValueError(f"unsupported report format: {fmt}")
+        return fmt
+    return _EXTENSIONS.get(os.path.splitext(outfile)[1].lower(), "json")
+
+def generate_report(networks: List[NetworkLike], outfile: str = "report.json", fmt: Optional[str] = None):
+    """Report of one scan, including its channel analysis."""
+    fmt = report_format(outfile, fmt)
+    channels = scan_channels(networks)
+    if fmt not in ("json", "html"):
+        return generate_report_stream(networks, outfile, fmt, channels)
+    inc("reports_total", format=fmt)
+    with span("report"):
+        rows = report_rows(networks, channels)
+        if fmt == "json":
+            with open(outfile, "w") as fh:
+                json.dump({"networks": list(rows), "channels": channels}, fh, indent=2)
+        else:
+            html = _html_template().render(networks=rows, channels=channels)
+            with open(outfile, "w") as fh:
+                fh.write(html)
     return outfile
+
+def generate_report_stream(networks: Iterable[NetworkLike], outfile: str, fmt: Optional[str] = None,
+                           channels: Optional[Dict] = None, columns: Optional[Sequence[str]] = None):
+    """
+    Write a report incrementally from any iterable of networks.
+    The format comes from `fmt` or the file extension (json, ndjson, csv, html);
+    for fmt="html-sharded", `outfile` is a directory and index.html is returned.
+    `channels` is an optional channel_analysis() section to include.
+    `columns` fixes the CSV header; by default it is the Network fields plus
+    the extra keys of the first row.
+    """
+    fmt = report_format(outfile, fmt)
+    inc("reports_total", format=fmt)
+    if fmt == "html-sharded":
+        from src.report.html_shards import write_sharded_html
+        with span("report"):
+            return write_sharded_html(networks, outfile, channels=channels)["index"]
+    rows = report_rows(networks, channels)
+    with span("report"), open(outfile, "w", buffering=WRITE_BUFFER, newline="" if fmt == "csv" else None) as fh:
+        if fmt == "json":
+            fh.write('{"networks": [')
+            sep = "\n  "
+            for row in rows:
+                fh.write(sep)
+                fh.write(json.dumps(row))
+                sep = ",\n  "
+            if channels is not None:
+                fh.write('\n], "channels": ')
+                fh.write(json.dumps(channels))
+                fh.write("}\n")
+            else:
+                fh.write("\n]}\n")
+        elif fmt == "ndjson":
+            for row in rows:
+                fh.write(json.dumps(row))
+                fh.write("\n")
+        elif fmt == "csv":
+            first = next(rows, None)
+            if columns is None:
+                # extra columns (category/risk, first_seen/last_seen from history) come from the first row
+                columns = FIELD_NAMES + tuple(k for k in first if k not in FIELD_SET) if first else FIELD_NAMES
+            writer = csv.DictWriter(fh, fieldnames=columns, extrasaction="ignore")
+            writer.writeheader()
+            if first is not None:
+                writer.writerow(first)
+                writer.writerows(rows)
+        else:
+            _html_template().stream(networks=rows, channels=channels).dump(fh)
+    return outfile
+
+def generate_report_from_history(store, outfile: str, since: Optional[float] = None,
+                                 until: Optional[float] = None, fmt: Optional[str] = None):
+    """
+    Stream a report of the networks a HistoryStore saw in [since, until], with the
+    channel analysis computed across all the scans in that window.
+    """
+    channels = history_channels(store, since, until)
+    return generate_report_stream(store.networks_between(since, until), outfile, fmt, channels)
@@ -0,0 +1,78 @@
+"""
+async_scanner.py
+- Scans several WiFi interfaces concurrently with asyncio subprocesses.
+- Every nmcli call has its own timeout; on timeout or cancellation the
+  child process is killed so a hung radio cannot stall the caller.
+- Results from all radios are merged into one list, deduplicated by
+  network identity (BSSID when available), keeping the strongest signal.
+"""
+import asyncio
+import subprocess
+from typing import Dict, List, Sequence
+
+from src.scanner.network import Network
+from src.scanner.scan_diff import network_key
+from src.utils.metrics import inc, span
+from src.scanner.wifi_scanner import (
+    DEFAULT_SCAN_TIMEOUT, nmcli_command, parse_nmcli_terse, record_raw, simulated_networks,
+)
+
+
+async def nmcli_scan_async(interface: str, timeout: float = DEFAULT_SCAN_TIMEOUT) -> str:
+    """Return raw nmcli output for one interface or raise."""
+    cmd = nmcli_command(interface)
+    proc = await asyncio.create_subprocess_exec(
+        *cmd, stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.PIPE
+    )
+    try:
+        out, err = await asyncio.wait_for(proc.communicate(), timeout)
+    except (asyncio.TimeoutError, asyncio.CancelledError):
+        proc.kill()
+        await proc.wait()
+        raise
+    if proc.returncode != 0:
+        raise subprocess.CalledProcessError(proc.returncode, cmd, output=out, stderr=err)
+    return out.decode(errors="replace")
+
+
+def merge_networks(scans: Sequence[List[Network]]) -> List[Network]:
+    """Merge per-radio scan lists, keeping the strongest sighting of each network."""
+    merged: Dict[str, Network] = {}
+    for networks in scans:
+        for net in networks:
+            key = network_key(net)
+            seen = merged.get(key)
+            if seen is None or (net.get("signal") or 0) > (seen.get("signal") or 0):
+                merged[key] = net
+    return list(merged.values())
+
+
+async def scan_interfaces_async(interfaces: Sequence[str],
+                                timeout: float = DEFAULT_SCAN_TIMEOUT) -> List[Network]:
+    """Scan all `interfaces` at once and return the merged network list."""
+    with span("scan"):
+        results = await asyncio.gather(
+            *(nmcli_scan_async(iface, timeout) for iface in interfaces), return_exceptions=True
+        )
+    scans = []
+    errors = []
+    for iface, res in zip(interfaces, results):
+        if isinstance(res, FileNotFoundError):
+            # nmcli not available — same fallback as scan_networks()
+            return simulated_networks()
+        if isinstance(res, BaseException):
+            inc("scan_errors_total")
+        if isinstance(res, asyncio.TimeoutError):
+            errors.append(Network("(error)", "(none)", 0, error=f"{iface}: nmcli timed out after {timeout}s"))
+        elif isinstance(res, BaseException):
+            errors.append(Network("(error)", "(none)", 0, error=f"{iface}: {res}"))
+        else:
+            record_raw(res, iface)
+            with span("parse"):
+                scans.append(parse_nmcli_terse(res))
+    return merge_networks(scans) + errors
+
+
+def scan_interfaces(interfaces: Sequence[str], timeout: float = DEFAULT_SCAN_TIMEOUT) -> List[Network]:
+    """Blocking wrapper around scan_interfaces_async for the CLI and GUI threads."""
+    return asyncio.run(scan_interfaces_async(interfaces, timeout))
@@ -1,19 +1,115 @@
 """
 encryption_parser.py
 - Small utilities to interpret security strings into categories.
+- Classification is table-driven: a security string is split into tokens
+  (aliases folded, e.g. "WPA" -> "WPA1", "SAE" -> "WPA3") and the first rule
+  in RULES whose tokens are all present wins.
+- Results are memoized; nmcli prints a handful of distinct strings, repeated
+  across every observation.
+- classify_scan() classifies a whole scan and attaches a risk score.
 """
-from typing import Dict
+import re
+from functools import lru_cache
+from typing import Dict, Iterable, List, Tuple
 
+from src.scanner.network import NetworkLike
+
+WPA3_ENTERPRISE = "WPA3-Enterprise"
+WPA3 = "WPA3"
+WPA2_WPA3 = "WPA2/WPA3"
+WPA2_ENTERPRISE = "WPA2-Enterprise"
+WPA2 = "WPA2"
+WPA_WPA2 = "WPA/WPA2"
+WPA = "WPA"
+WEP = "WEP"
+OWE = "OWE"
+OPEN = "OPEN"
+UNKNOWN = "UNKNOWN"
+
+# strings meaning "no security" (nmcli prints "--" in tabular mode)
+OPEN_STRINGS = frozenset({"--", "OPEN", "NONE"})
+
+_TOKEN_RE = re.compile(r"[A-Z0-9.]+(?:-[A-Z0-9]+)*")
+TOKEN_ALIASES = {
+    "WPA": "WPA1", "WPA-PSK": "WPA1",
+    "RSN": "WPA2", "WPA2-PSK": "WPA2",
+    "SAE": "WPA3", "WPA3-SAE": "WPA3", "WPA3-PERSONAL": "WPA3",
+    "EAP": "802.1X", "WPA-EAP": "802.1X", "ENTERPRISE": "802.1X",
+    "WPA2-EAP": "802.1X", "WPA3-EAP": "802.1X", "WPA3-ENTERPRISE": "802.1X",
+    "OWE-TM": "OWE",
+}
+
+# first match wins, so stronger/more specific combinations come first
+RULES: Tuple[Tuple[str, frozenset], ...] = tuple((cat, frozenset(tokens)) for cat, tokens in (
+    (WPA3_ENTERPRISE, ("WPA3", "802.1X")),
+    (WPA2_ENTERPRISE, ("WPA2", "802.1X")),
+    (WPA2_WPA3, ("WPA2", "WPA3")),  # transition mode: clients may still use WPA2
+    (WPA3, ("WPA3",)),
+    (WPA_WPA2, ("WPA1", "WPA2")),
+    (WPA2, ("WPA2",)),
+    (WPA, ("WPA1",)),
+    (WEP, ("WEP",)),
+    (OWE, ("OWE",)),
+))
+
+# 0 (best) .. 100 (worst); UNKNOWN sits in the middle so it is neither hidden nor alarming
+RISK = {
+    WPA3_ENTERPRISE: 5, WPA3: 10, WPA2_ENTERPRISE: 15, WPA2_WPA3: 20, WPA2: 30,
+    WPA_WPA2: 55, OWE: 60, WPA: 75, WEP: 90, OPEN: 100, UNKNOWN: 50,
+}
+
+
+def _tokens(s: str) -> frozenset:
+    return frozenset(TOKEN_ALIASES.get(t, t) for t in _TOKEN_RE.findall(s.upper()))
+
+
+@lru_cache(maxsize=1024)
 def classify_security(security_str: str) -> str:
-    s = (security_str or "").upper()
-    if "WPA3" in s:
-        return "WPA3"
-    if "WPA2" in s:
-        return "WPA2"
-    if "WPA" in s:
-        return "WPA"
-    if "WEP" in s:
-        return "WEP"
-    if "WPA" not in s and ("WEP" not in s) and ("WPA2" not in s) and s.strip() == "":
-        return "UNKNOWN"
-    return s
+    """One of the category constants above; UNKNOWN for empty or unrecognised strings."""
+    s = (security_str or "").strip()
+    if not s:
+        return UNKNOWN
+    if s.upper() in OPEN_STRINGS:
+        return OPEN
+    tokens = _tokens(s)
+    for category, required in RULES:
+        if required <= tokens:
+            return category
+    return UNKNOWN
+
+
+@lru_cache(maxsize=1024)
+def security_risk(security_str: str) -> Tuple[str, int]:
+    """(category, risk score) for one security string."""
+    category = classify_security(security_str)
+    return category, RISK[category]
+
+
+def classify_batch(security_strings: Iterable[str]) -> List[Tuple[str, int]]:
+    """(category, risk) for each string; each distinct string is classified once."""
+    seen: Dict[str, Tuple[str, int]] = {}
+    out = []
+    for s in security_strings:
+        hit = seen.get(s)
+        if hit is None:
+            hit = seen[s] = security_risk(s)
+        out.append(hit)
+    return out
+
+
+def classify_scan(networks: Iterable[NetworkLike]) -> Dict:
+    """
+    Classify a whole scan. Returns {"assessments": [(category, risk), ...]
+    in network order, "counts": {category: n}, "max_risk": int}; error
+    entries get an assessment but are left out of counts and max_risk.
+    """
+    networks = list(networks)
+    assessments = classify_batch(n.get("security") or "" for n in networks)
+    counts: Dict[str, int] = {}
+    max_risk = 0
+    for n, (category, risk) in zip(networks, assessments):
+        if n.get("error"):
+            continue
+        counts[category] = counts.get(category, 0) + 1
+        max_risk = max(max_risk, risk)
+    return {"assessments": assessments, "counts": counts, "max_risk": max_risk}
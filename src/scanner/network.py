@@ -0,0 +1,91 @@
+"""
+network.py
+- Compact record type for one network observation.
+- Uses __slots__ (no per-instance dict) so long scan histories stay small.
+- Keeps a read-only dict view (n["ssid"], n.get("signal"), dict(n)) so code
+  written against the old List[Dict] results keeps working.
+- Written out by hand rather than with @dataclass: importing dataclasses
+  (and inspect) costs more than the rest of the scan path at CLI start-up.
+"""
+from typing import Dict, Iterator, Optional, Union
+
+_MISSING = object()
+
+FIELD_NAMES = ("ssid", "security", "signal", "bssid", "channel", "frequency", "rate", "mode", "error")
+FIELD_SET = frozenset(FIELD_NAMES)
+
+
+class Network:
+    __slots__ = FIELD_NAMES
+
+    def __init__(self, ssid: str = "<hidden>", security: str = "UNKNOWN", signal: int = 0,
+                 bssid: Optional[str] = None, channel: Optional[int] = None,
+                 frequency: Optional[int] = None, rate: Optional[int] = None,
+                 mode: Optional[str] = None, error: Optional[str] = None):
+        self.ssid = ssid
+        self.security = security
+        self.signal = signal
+        self.bssid = bssid
+        self.channel = channel
+        self.frequency = frequency
+        self.rate = rate
+        self.mode = mode
+        self.error = error
+
+    def _astuple(self):
+        return tuple(getattr(self, k) for k in FIELD_NAMES)
+
+    def __eq__(self, other):
+        if other.__class__ is not self.__class__:
+            return NotImplemented
+        return self._astuple() == other._astuple()
+
+    __hash__ = None  # mutable record, like a non-frozen dataclass
+
+    def __repr__(self):
+        args = ", ".join(f"{k}={v!r}" for k, v in zip(FIELD_NAMES, self._astuple()))
+        return f"Network({args})"
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> "Network":
+        """Build from a dict, ignoring keys that are not Network fields."""
+        return cls(**{k: data[k] for k in FIELD_NAMES if k in data})
+
+    def to_dict(self) -> Dict:
+        """Plain dict of the fields that are set (None fields are omitted)."""
+        return {k: v for k in FIELD_NAMES if (v := getattr(self, k)) is not None}
+
+    # --- dict view for backward compatibility ---
+    def __getitem__(self, key: str):
+        if key in FIELD_SET:
+            value = getattr(self, key)
+            if value is not None:
+                return value
+        raise KeyError(key)
+
+    def get(self, key: str, default=None):
+        value = getattr(self, key, _MISSING) if key in FIELD_SET else _MISSING
+        return default if value is _MISSING or value is None else value
+
+    def __contains__(self, key: str) -> bool:
+        return key in FIELD_SET and getattr(self, key) is not None
+
+    def keys(self) -> Iterator[str]:
+        return (k for k in FIELD_NAMES if getattr(self, k) is not None)
+
+    def items(self):
+        return self.to_dict().items()
+
+    def __iter__(self) -> Iterator[str]:
+        return self.keys()
+
+
+NetworkLike = Union[Network, Dict]
+
+
+def as_network(item: NetworkLike) -> Network:
+    return item if isinstance(item, Network) else Network.from_dict(item)
+
+
+def as_dict(item: NetworkLike) -> Dict:
+    return item.to_dict() if isinstance(item, Network) else item
@@ -0,0 +1,124 @@
+"""
+replay.py - record and replay raw nmcli scans.
+
+- ScanRecorder appends every raw `nmcli -t` scan to an NDJSON file as
+  {"ts", "interface", "raw"}.
+- ReplayBackend stands in for the radio: it returns recorded scans (or
+  synthetic ones with any number of APs) in order, paced to `rate` scans per
+  second, through the same parse/merge path as live scans. Install one with
+  wifi_scanner.set_scan_backend().
+"""
+import json
+import random
+import threading
+import time
+from typing import Dict, Iterator, List, Optional, Tuple
+
+SYNTHETIC_SECURITIES = ("WPA2", "WPA1 WPA2", "WPA2 802.1X", "WPA3", "", "WEP", "OWE")
+SYNTHETIC_CHANNELS = ((1, 2412), (6, 2437), (11, 2462), (36, 5180), (44, 5220), (149, 5745))
+
+
+class ReplayExhausted(EOFError):
+    """A non-looping recording has no scans left."""
+
+
+class ScanRecorder:
+    """Append-only NDJSON log of raw scans; safe to share between threads."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+        self._fh = open(path, "a")
+
+    def record(self, raw: str, interface: Optional[str] = None, ts: Optional[float] = None):
+        line = json.dumps({"ts": time.time() if ts is None else ts, "interface": interface, "raw": raw})
+        with self._lock:
+            self._fh.write(line + "\n")
+            self._fh.flush()
+
+    def close(self):
+        with self._lock:
+            self._fh.close()
+
+
+def load_recording(path: str) -> List[Dict]:
+    """All {"ts", "interface", "raw"} records of a recording, oldest first."""
+    with open(path) as fh:
+        return [json.loads(line) for line in fh if line.strip()]
+
+
+def synthetic_access_points(aps: int, scan_index: int = 0, seed: int = 0) -> Iterator[Tuple[str, str, str, int, int, int]]:
+    """
+    (ssid, bssid, security, signal, channel, frequency) for `aps` access
+    points. The AP set and channels are fixed by `seed`; signals drift from
+    scan to scan. Also the data source of the benchmarks.
+    """
+    layout = random.Random(seed)
+    drift = random.Random(seed * 1_000_003 + scan_index)
+    for i in range(aps):
+        sec = layout.choice(SYNTHETIC_SECURITIES)
+        chan, freq = layout.choice(SYNTHETIC_CHANNELS)
+        base = layout.randint(10, 95)
+        sig = min(100, max(1, base + drift.randint(-4, 4)))
+        bssid = ":".join(f"{b:02X}" for b in i.to_bytes(6, "big"))
+        yield f"lab-{i % 5000}", bssid, sec, sig, chan, freq
+
+
+def synthetic_terse_scan(aps: int, scan_index: int = 0, seed: int = 0) -> str:
+    """nmcli terse output for synthetic_access_points(aps, scan_index, seed)."""
+    lines = []
+    for ssid, bssid, sec, sig, chan, freq in synthetic_access_points(aps, scan_index, seed):
+        bssid = bssid.replace(":", "\\:")
+        lines.append(f"{ssid}:{bssid}:{sec}:{sig}:{chan}:{freq} MHz:130 Mbit/s:Infra")
+    return "\n".join(lines) + "\n"
+
+
+class ReplayBackend:
+    """
+    Callable with the signature of wifi_scanner._nmcli_scan(interface, timeout).
+    `rate` is scans per second (0 = as fast as the caller asks). With `loop`,
+    a recording starts over when exhausted; otherwise ReplayExhausted is raised.
+    """
+
+    def __init__(self, path: Optional[str] = None, synthetic_aps: int = 0, rate: float = 0.0,
+                 loop: bool = False, seed: int = 0):
+        if not path and not synthetic_aps:
+            raise ValueError("ReplayBackend needs a recording path or synthetic_aps")
+        self.records = load_recording(path) if path else None
+        self.synthetic_aps = synthetic_aps
+        self.rate = rate
+        self.loop = loop
+        self.seed = seed
+        self.scans = 0
+        self._next_at = 0.0
+        self._lock = threading.Lock()
+
+    def _raw(self, index: int) -> str:
+        if self.records is None:
+            return synthetic_terse_scan(self.synthetic_aps, index, self.seed)
+        if index >= len(self.records):
+            if not self.loop or not self.records:
+                raise ReplayExhausted(f"recording exhausted after {len(self.records)} scans")
+            index %= len(self.records)
+        return self.records[index]["raw"]
+
+    def __call__(self, interface: Optional[str] = None, timeout: Optional[float] = None) -> str:
+        with self._lock:
+            index = self.scans
+            self.scans += 1
+            if self.rate > 0:
+                now = time.monotonic()
+                wait = self._next_at - now
+                self._next_at = max(now, self._next_at) + 1.0 / self.rate
+            else:
+                wait = 0
+        if wait > 0:
+            time.sleep(wait)
+        return self._raw(index)
+
+    def __iter__(self) -> Iterator[str]:
+        while True:
+            try:
+                yield self()
+            except ReplayExhausted:
+                return
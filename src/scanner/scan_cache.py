@@ -0,0 +1,151 @@
+"""
+scan_cache.py - share recent scan results instead of rescanning.
+
+- Results are cached per interface set for `ttl` seconds.
+- Single-flight: concurrent callers asking for the same interfaces while a
+  scan is running wait for that scan instead of starting another.
+- With `path`, results are also kept in a small JSON file guarded by an
+  flock, so separate CLI processes on the host reuse a fresh scan (and wait
+  for one already in progress) too.
+- Failed scans (error entries) are never cached.
+"""
+import json
+import os
+import threading
+import time
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+from src.scanner.network import Network, as_dict
+from src.utils.metrics import inc
+
+try:
+    import fcntl
+except ImportError:  # not POSIX: the file cache still works, without cross-process coalescing
+    fcntl = None
+
+CACHE_VERSION = 1
+DEFAULT_TTL = 10.0
+
+ScanFn = Callable[[Optional[Sequence[str]], float], List[Network]]
+
+
+def cache_key(interfaces: Optional[Sequence[str]]) -> str:
+    return ",".join(sorted(interfaces)) if interfaces else "default"
+
+
+class _Flight:
+    __slots__ = ("done", "networks", "error")
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.networks: List[Network] = []
+        self.error: Optional[BaseException] = None
+
+
+class ScanCache:
+    def __init__(self, ttl: float = DEFAULT_TTL, path: Optional[str] = None, scan_fn: Optional[ScanFn] = None):
+        self.ttl = ttl
+        self.path = path or None
+        self._scan_fn = scan_fn
+        self._lock = threading.Lock()
+        self._entries: Dict[str, Tuple[float, List[Network]]] = {}
+        self._inflight: Dict[str, _Flight] = {}
+
+    def _fresh(self, entry, now: float) -> bool:
+        return entry is not None and now - entry[0] < self.ttl
+
+    def scan(self, interfaces: Optional[Sequence[str]] = None, timeout: Optional[float] = None,
+             force: bool = False) -> Tuple[List[Network], bool]:
+        """
+        Networks for `interfaces` and whether they came from the cache (or a
+        scan another caller started). `force` skips cached results but still
+        joins a scan that is already running.
+        """
+        key = cache_key(interfaces)
+        with self._lock:
+            entry = self._entries.get(key)
+            if not force and self._fresh(entry, time.time()):
+                inc("scan_cache_total", result="hit")
+                return list(entry[1]), True
+            flight = self._inflight.get(key)
+            leader = flight is None
+            if leader:
+                flight = self._inflight[key] = _Flight()
+        if not leader:
+            inc("scan_cache_total", result="shared")
+            flight.done.wait()
+            if flight.error is not None:
+                raise flight.error
+            return list(flight.networks), True
+
+        try:
+            networks, cached = self._load_or_scan(key, interfaces, timeout, force)
+            flight.networks = networks
+        except BaseException as exc:
+            flight.error = exc
+            raise
+        finally:
+            with self._lock:
+                del self._inflight[key]
+            flight.done.set()
+        return list(networks), cached
+
+    def invalidate(self):
+        with self._lock:
+            self._entries.clear()
+
+    # --- scanning / file backing ---
+    def _run_scan(self, key: str, interfaces, timeout) -> List[Network]:
+        scan_fn = self._scan_fn
+        if scan_fn is None:
+            from src.scanner.wifi_scanner import DEFAULT_SCAN_TIMEOUT, scan_networks
+            scan_fn = scan_networks
+            timeout = timeout or DEFAULT_SCAN_TIMEOUT
+        inc("scan_cache_total", result="miss")
+        networks = scan_fn(interfaces, timeout)
+        if not any(n.get("error") for n in networks):
+            with self._lock:
+                self._entries[key] = (time.time(), networks)
+        return networks
+
+    def _load_or_scan(self, key: str, interfaces, timeout, force: bool) -> Tuple[List[Network], bool]:
+        if not self.path:
+            return self._run_scan(key, interfaces, timeout), False
+        folder = os.path.dirname(self.path)
+        if folder:
+            os.makedirs(folder, exist_ok=True)
+        with open(f"{self.path}.lock", "a") as lock_fh:
+            if fcntl is not None:
+                # another process scanning the same radios holds this until it has written its result
+                fcntl.flock(lock_fh, fcntl.LOCK_EX)
+            entries = self._read_file()
+            entry = entries.get(key)
+            if entry is not None and not force and time.time() - entry["ts"] < self.ttl:
+                networks = [Network.from_dict(d) for d in entry["networks"]]
+                with self._lock:
+                    self._entries[key] = (entry["ts"], networks)
+                inc("scan_cache_total", result="file_hit")
+                return networks, True
+            networks = self._run_scan(key, interfaces, timeout)
+            with self._lock:
+                stored = self._entries.get(key)
+            if stored is not None and stored[1] is networks:
+                entries[key] = {"ts": stored[0], "networks": [as_dict(n) for n in networks]}
+                self._write_file(entries)
+            return networks, False
+
+    def _read_file(self) -> Dict[str, Dict]:
+        try:
+            with open(self.path) as fh:
+                data = json.load(fh)
+        except (OSError, ValueError):
+            return {}
+        if data.get("version") != CACHE_VERSION:
+            return {}
+        return data.get("entries", {})
+
+    def _write_file(self, entries: Dict[str, Dict]):
+        tmp = f"{self.path}.{os.getpid()}.tmp"
+        with open(tmp, "w") as fh:
+            json.dump({"version": CACHE_VERSION, "entries": entries}, fh, separators=(",", ":"))
+        os.replace(tmp, self.path)
@@ -0,0 +1,75 @@
+"""
+scan_diff.py
+- Keys scan results by network identity and computes deltas between scans.
+- Used by the CLI watch mode (main.watch_printer on the scan pipeline) and
+  the API server to emit only what changed each cycle.
+"""
+import json
+import time
+from typing import Dict, List, Optional, Tuple
+
+from src.scanner.network import NetworkLike
+
+
+def network_key(network: NetworkLike) -> str:
+    """Stable identity of a network: its BSSID when known, else its SSID."""
+    bssid = network.get("bssid")
+    if bssid:
+        return bssid.lower()
+    return network.get("ssid") or "<hidden>"
+
+
+def index_networks(networks: List[NetworkLike]) -> Dict[str, NetworkLike]:
+    return {network_key(n): n for n in networks}
+
+
+def diff_scans(previous: Dict[str, NetworkLike], current: Dict[str, NetworkLike],
+               signal_threshold: int = 5) -> Tuple[List[Dict], Dict[str, NetworkLike]]:
+    """
+    Compare two indexed scans.
+    Returns (events, baseline). Each event is a dict with "event" set to
+    "appeared", "vanished" or "changed". Signal changes smaller than
+    `signal_threshold` are ignored, and the baseline keeps the last reported
+    value so slow drift is still reported once it adds up.
+    """
+    events = []
+    baseline = {}
+    for key, net in current.items():
+        old = previous.get(key)
+        if old is None:
+            events.append({"event": "appeared", "key": key, "ssid": net.get("ssid"),
+                           "security": net.get("security"), "signal": net.get("signal")})
+            baseline[key] = net
+            continue
+        changes = {}
+        if net.get("security") != old.get("security"):
+            changes["security"] = [old.get("security"), net.get("security")]
+        if abs((net.get("signal") or 0) - (old.get("signal") or 0)) >= signal_threshold:
+            changes["signal"] = [old.get("signal"), net.get("signal")]
+        if changes:
+            events.append({"event": "changed", "key": key, "ssid": net.get("ssid"), "changes": changes})
+            baseline[key] = net
+        else:
+            baseline[key] = old
+    for key, old in previous.items():
+        if key not in current:
+            events.append({"event": "vanished", "key": key, "ssid": old.get("ssid")})
+    return events, baseline
+
+
+def format_event(event: Dict) -> str:
+    kind = event["event"]
+    if kind == "appeared":
+        return f"+ {event['ssid']!r} | {event['security']} | signal={event['signal']}"
+    if kind == "vanished":
+        return f"- {event['ssid']!r}"
+    parts = [f"{field} {old}->{new}" for field, (old, new) in event["changes"].items()]
+    return f"~ {event['ssid']!r} | " + ", ".join(parts)
+
+
+def append_events(fh, events: List[Dict], ts: Optional[float] = None):
+    """Append events as NDJSON lines to an open file and flush."""
+    ts = time.time() if ts is None else ts
+    for ev in events:
+        fh.write(json.dumps(dict(ev, ts=ts)) + "\n")
+    fh.flush()
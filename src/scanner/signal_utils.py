@@ -2,11 +2,17 @@
 signal_utils.py
 - Helpers to work with RSSI/Signal values (simple demo).
 """
+# lower bounds (inclusive) of each quality bucket, strongest first
+EXCELLENT_MIN = 70
+GOOD_MIN = 50
+FAIR_MIN = 30
+QUALITY_LABELS = ("Weak", "Fair", "Good", "Excellent")
+
 def signal_to_quality(signal_dbm: int) -> str:
-    if signal_dbm >= 70:
+    if signal_dbm >= EXCELLENT_MIN:
         return "Excellent"
-    if signal_dbm >= 50:
+    if signal_dbm >= GOOD_MIN:
         return "Good"
-    if signal_dbm >= 30:
+    if signal_dbm >= FAIR_MIN:
         return "Fair"
     return "Weak"
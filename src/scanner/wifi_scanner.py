@@ -5,16 +5,55 @@ wifi_scanner.py
 """
 import subprocess
 import re
-from typing import List, Dict
+from sys import intern
+from typing import Callable, List, Optional, Sequence
 
-def _nmcli_scan() -> str:
+from src.scanner.network import Network
+from src.utils.metrics import inc, span
+
+# terse (-t) output: one colon-separated record per line, in this field order
+NMCLI_FIELDS = "SSID,BSSID,SECURITY,SIGNAL,CHAN,FREQ,RATE,MODE"
+_TERSE_FIELD_COUNT = NMCLI_FIELDS.count(",") + 1
+DEFAULT_SCAN_TIMEOUT = 20.0
+
+SIMULATED_NETWORKS = [
+    Network("Home_WiFi", "WPA2", 72),
+    Network("Old_WEP", "WEP", 34),
+    Network("Cafe_FreeWiFi", "OPEN", 60),
+]
+
+def nmcli_command(interface: Optional[str] = None) -> List[str]:
+    """nmcli argv for listing networks, optionally restricted to one interface."""
+    cmd = ["nmcli", "-t", "-f", NMCLI_FIELDS, "dev", "wifi", "list"]
+    if interface:
+        cmd += ["ifname", interface]
+    return cmd
+
+def _nmcli_scan(interface: Optional[str] = None, timeout: float = DEFAULT_SCAN_TIMEOUT) -> str:
     """Return raw nmcli output or raise."""
-    return subprocess.check_output(
-        ["nmcli", "-f", "SSID,SECURITY,SIGNAL", "dev", "wifi"], universal_newlines=True
-    )
+    return subprocess.check_output(nmcli_command(interface), universal_newlines=True, timeout=timeout)
+
+# Optional stand-in for the radio (e.g. replay.ReplayBackend) and a recorder
+# (replay.ScanRecorder) that every raw scan is copied to.
+_scan_backend: Optional[Callable[[Optional[str], float], str]] = None
+_scan_recorder = None
 
-def parse_nmcli_output(raw: str) -> List[Dict]:
-    """Parse nmcli output into structured dicts."""
+def set_scan_backend(backend: Optional[Callable[[Optional[str], float], str]]):
+    """Route scans through `backend(interface, timeout)` instead of nmcli; None restores nmcli."""
+    global _scan_backend
+    _scan_backend = backend
+
+def set_scan_recorder(recorder):
+    """Copy every raw scan to `recorder.record(raw, interface)`; None stops recording."""
+    global _scan_recorder
+    _scan_recorder = recorder
+
+def record_raw(raw: str, interface: Optional[str] = None):
+    if _scan_recorder is not None:
+        _scan_recorder.record(raw, interface)
+
+def parse_nmcli_output(raw: str) -> List[Network]:
+    """Parse tabular nmcli output into Network records."""
     lines = raw.strip().splitlines()
     networks = []
     # nmcli output often has a header line - detect and skip if present
@@ -29,19 +68,90 @@ def parse_nmcli_output(raw: str) -> List[Dict]:
                 signal_int = int(signal)
             except Exception:
                 signal_int = 0
-            networks.append({"ssid": ssid or "<hidden>", "security": security or "UNKNOWN", "signal": signal_int})
+            networks.append(Network(ssid or "<hidden>", security or "UNKNOWN", signal_int))
     return networks
 
-def scan_networks() -> List[Dict]:
+def _leading_int(value: str) -> int:
+    """'2412 MHz' -> 2412, '54 Mbit/s' -> 54, '' -> 0."""
     try:
-        raw = _nmcli_scan()
-        return parse_nmcli_output(raw)
+        return int(value.partition(" ")[0])
+    except ValueError:
+        return 0
+
+class _IntCache(dict):
+    def __missing__(self, key: str) -> int:
+        value = self[key] = _leading_int(key)
+        return value
+
+def parse_nmcli_terse(raw: str) -> List[Network]:
+    """
+    Parse `nmcli -t -f NMCLI_FIELDS dev wifi` output.
+    Terse mode escapes ':' and '\\' inside values with a backslash. Escapes are
+    swapped for placeholder characters in one pass over the whole buffer, so
+    each line can then be cut with a plain str.split(':').
+    Text fields are interned, so repeated sightings of the same network across
+    scans share one copy of each string.
+    """
+    escaped = "\\" in raw
+    if escaped:
+        raw = raw.replace("\\\\", "\x00").replace("\\:", "\x01")
+    networks = []
+    append = networks.append
+    # signal/channel/frequency/rate strings repeat heavily; convert each distinct one once
+    num = _IntCache()
+    for line in raw.split("\n"):
+        parts = line.split(":")
+        if len(parts) != _TERSE_FIELD_COUNT:
+            continue
+        ssid, bssid, security, signal, chan, freq, rate, mode = parts
+        if escaped:
+            if "\x00" in ssid or "\x01" in ssid:
+                ssid = ssid.replace("\x01", ":").replace("\x00", "\\")
+            bssid = bssid.replace("\x01", ":")
+        append(Network(
+            intern(ssid) if ssid else "<hidden>",
+            # terse mode prints nothing for open networks; tabular mode prints "--"
+            intern(security) if security else "--",
+            num[signal],
+            intern(bssid),
+            num[chan],
+            num[freq],
+            num[rate],
+            intern(mode),
+        ))
+    return networks
+
+def simulated_networks() -> List[Network]:
+    return [Network.from_dict(n) for n in SIMULATED_NETWORKS]
+
+def _scan_single(interface: Optional[str], timeout: float) -> List[Network]:
+    try:
+        with span("scan"):
+            raw = (_scan_backend or _nmcli_scan)(interface, timeout)
     except FileNotFoundError:
         # nmcli not available — return simulated list
-        return [
-            {"ssid": "Home_WiFi", "security": "WPA2", "signal": 72},
-            {"ssid": "Old_WEP", "security": "WEP", "signal": 34},
-            {"ssid": "Cafe_FreeWiFi", "security": "OPEN", "signal": 60},
-        ]
-    except subprocess.CalledProcessError as exc:
-        return [{"ssid": "(error)", "security": "(none)", "signal": 0, "error": str(exc)}]
+        return simulated_networks()
+    except (subprocess.CalledProcessError, subprocess.TimeoutExpired) as exc:
+        inc("scan_errors_total")
+        return [Network("(error)", "(none)", 0, error=str(exc))]
+    record_raw(raw, interface)
+    with span("parse"):
+        return parse_nmcli_terse(raw)
+
+def scan_networks(interfaces: Optional[Sequence[str]] = None,
+                  timeout: float = DEFAULT_SCAN_TIMEOUT) -> List[Network]:
+    """
+    Scan with nmcli. With several interfaces the radios are scanned
+    concurrently (see async_scanner) and merged by network identity.
+    """
+    if interfaces and len(interfaces) > 1 and _scan_backend is None:
+        from src.scanner.async_scanner import scan_interfaces
+        networks = scan_interfaces(interfaces, timeout)
+    elif interfaces and len(interfaces) > 1:
+        from src.scanner.async_scanner import merge_networks
+        networks = merge_networks([_scan_single(iface, timeout) for iface in interfaces])
+    else:
+        networks = _scan_single(interfaces[0] if interfaces else None, timeout)
+    inc("scans_total")
+    inc("networks_scanned_total", len(networks))
+    return networks
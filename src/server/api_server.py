@@ -0,0 +1,322 @@
+"""
+api_server.py
+- Local HTTP API for dashboards (asyncio, standard library only).
+- ScanService scans on a fixed interval in a worker thread, however many
+  clients are connected: clients only ever read its latest snapshot and
+  delta stream, so the radio is used once per interval.
+- Every scan is serialised once; the same bytes are fanned out to every
+  Server-Sent Events client through a small per-client queue. A client that
+  falls that far behind is disconnected, so one slow screen cannot hold back
+  the others. Last-Event-ID only resumes clients at most CLIENT_QUEUE deltas
+  behind; a dropped client is always further behind than that, so its
+  EventSource gets a fresh snapshot when it reconnects.
+- Routes:
+    GET /             minimal live dashboard
+    GET /api/latest   latest scan {"seq", "ts", "networks"}
+    GET /api/history  networks seen in ?since=&until= (needs a HistoryStore)
+    GET /api/events   SSE: "snapshot" on connect, then one "delta" per scan
+                      (scan_diff events; "appeared" ones carry the full row as
+                      "network"); Last-Event-ID resumes recent deltas
+    GET /metrics      Prometheus text from utils.metrics
+"""
+import asyncio
+import json
+import time
+from collections import deque
+from typing import Callable, Deque, Dict, List, Optional, Set, Tuple
+from urllib.parse import parse_qs, urlsplit
+
+from src.report.report_generator import report_rows
+from src.scanner.network import NetworkLike
+from src.scanner.scan_diff import diff_scans, index_networks
+from src.utils.logger import get_logger
+from src.utils.metrics import inc
+
+log = get_logger(__name__)
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8080
+CLIENT_QUEUE = 32        # messages a client may fall behind before it is dropped (and deltas kept for resume)
+MAX_CLIENTS = 512
+KEEPALIVE_SECONDS = 15.0
+REQUEST_TIMEOUT = 10.0
+RETRY_MS = 3000
+
+REASONS = {200: "OK", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed", 503: "Service Unavailable"}
+
+DASHBOARD_HTML = """<!doctype html>
+<html>
+<head><meta charset="utf-8"><title>WiFi Assessment - live</title>
+<style>body{font-family:sans-serif;margin:1em}table{border-collapse:collapse;width:100%}
+th,td{border-bottom:1px solid #ddd;padding:2px 6px;text-align:left}</style></head>
+<body>
+<h1>WiFi Assessment - live</h1>
+<p id="status">Connecting&hellip;</p>
+<table><thead><tr><th>SSID</th><th>BSSID</th><th>Security</th><th>Signal</th><th>Channel</th></tr></thead>
+<tbody id="rows"></tbody></table>
+<script>
+var nets = {};
+function esc(v) { return String(v == null ? "" : v).replace(/[&<>"]/g, function (c) {
+  return {"&": "&amp;", "<": "&lt;", ">": "&gt;", '"': "&quot;"}[c]; }); }
+function render(msg) {
+  var keys = Object.keys(nets).sort(function (a, b) { return (nets[b].signal || 0) - (nets[a].signal || 0); });
+  document.getElementById("rows").innerHTML = keys.map(function (k) {
+    var n = nets[k];
+    return "<tr><td>" + [n.ssid, n.bssid, n.security, n.signal, n.channel].map(esc).join("</td><td>") + "</td></tr>";
+  }).join("");
+  document.getElementById("status").textContent = keys.length + " networks, scan #" + msg.seq + " at " +
+    new Date(msg.ts * 1000).toLocaleTimeString();
+}
+var es = new EventSource("/api/events");
+es.addEventListener("snapshot", function (e) {
+  var msg = JSON.parse(e.data);
+  nets = {};
+  msg.networks.forEach(function (n) { nets[n.key] = n; });
+  render(msg);
+});
+es.addEventListener("delta", function (e) {
+  var msg = JSON.parse(e.data);
+  msg.events.forEach(function (ev) {
+    if (ev.event === "vanished") { delete nets[ev.key]; return; }
+    if (ev.event === "appeared") { nets[ev.key] = ev.network; return; }
+    var n = nets[ev.key] || (nets[ev.key] = {key: ev.key, ssid: ev.ssid});
+    Object.keys(ev.changes).forEach(function (f) { n[f] = ev.changes[f][1]; });
+  });
+  render(msg);
+});
+es.onerror = function () { document.getElementById("status").textContent = "Reconnecting\\u2026"; };
+</script>
+</body>
+</html>
+"""
+
+
+def sse_frame(event: str, event_id: str, data: Dict) -> bytes:
+    return f"id: {event_id}\nevent: {event}\ndata: {json.dumps(data, separators=(',', ':'))}\n\n".encode()
+
+
+class ScanService:
+    """
+    Scans every `interval` seconds and publishes the result to subscribers.
+    `scan_fn` is blocking (nmcli, replay, cache) and runs in the default executor.
+    """
+
+    def __init__(self, scan_fn: Callable[[], List[NetworkLike]], interval: float = 30.0,
+                 signal_threshold: int = 5, client_queue: int = CLIENT_QUEUE):
+        self.scan_fn = scan_fn
+        self.interval = interval
+        self.signal_threshold = signal_threshold
+        self.client_queue = client_queue
+        # event ids are "<run>-<seq>", so a client of a previous server run gets a snapshot
+        self.run_id = f"{int(time.time() * 1000):x}"
+        self.seq = 0
+        self.latest: Dict = {"seq": 0, "ts": None, "networks": []}
+        self.latest_json = json.dumps(self.latest).encode()
+        self._snapshot_frame = sse_frame("snapshot", self.event_id(0), self.latest)
+        self._baseline: Dict[str, NetworkLike] = {}
+        # a longer backlog would replay deltas to clients that were dropped for lagging
+        self._deltas: Deque[Tuple[int, bytes]] = deque(maxlen=client_queue)
+        self._clients: Set[asyncio.Queue] = set()
+
+    @property
+    def clients(self) -> int:
+        return len(self._clients)
+
+    def event_id(self, seq: int) -> str:
+        return f"{self.run_id}-{seq}"
+
+    # --- scanning ---
+    async def run(self, max_scans: Optional[int] = None):
+        """Scan until cancelled (or `max_scans` scans, or the replay backend runs out)."""
+        loop = asyncio.get_running_loop()
+        scans = 0
+        while max_scans is None or scans < max_scans:
+            started = loop.time()
+            try:
+                networks = await loop.run_in_executor(None, self.scan_fn)
+            except EOFError:
+                # a --replay-scans recording ran out: keep serving the last scan
+                return
+            except Exception:
+                inc("server_scan_errors_total")
+                log.warning("Scan failed", exc_info=True)
+            else:
+                self.publish(networks)
+            scans += 1
+            await asyncio.sleep(max(0.0, self.interval - (loop.time() - started)))
+
+    def publish(self, networks: List[NetworkLike], ts: Optional[float] = None):
+        """Install a new scan as the snapshot and fan its delta out to every client."""
+        current = index_networks(networks)
+        events, self._baseline = diff_scans(self._baseline, current, self.signal_threshold)
+        self.seq += 1
+        ts = time.time() if ts is None else ts
+        rows = {}
+        for key, row in zip(current, report_rows(current.values())):
+            row["key"] = key
+            rows[key] = row
+        for ev in events:
+            if ev["event"] == "appeared":
+                ev["network"] = rows[ev["key"]]
+        rows = list(rows.values())
+        self.latest = {"seq": self.seq, "ts": ts, "networks": rows}
+        self.latest_json = json.dumps(self.latest).encode()
+        self._snapshot_frame = sse_frame("snapshot", self.event_id(self.seq), self.latest)
+        frame = sse_frame("delta", self.event_id(self.seq), {"seq": self.seq, "ts": ts, "events": events})
+        self._deltas.append((self.seq, frame))
+        for queue in list(self._clients):
+            try:
+                queue.put_nowait(frame)
+            except asyncio.QueueFull:
+                self._drop(queue)
+        inc("server_scans_total")
+
+    # --- subscribers ---
+    def subscribe(self, last_event_id: Optional[str] = None) -> Tuple[asyncio.Queue, List[bytes]]:
+        """
+        Register a client. Returns its queue and the frames to send first: the
+        missed deltas when `last_event_id` is at most `client_queue` deltas
+        old, else a snapshot.
+        """
+        queue: asyncio.Queue = asyncio.Queue(self.client_queue)
+        self._clients.add(queue)
+        run_id, _, seq = (last_event_id or "").rpartition("-")
+        if run_id == self.run_id and seq.isdigit():
+            last_seq = int(seq)
+            oldest = self._deltas[0][0] if self._deltas else self.seq + 1
+            if oldest <= last_seq + 1 and last_seq <= self.seq:
+                return queue, [frame for seq, frame in self._deltas if seq > last_seq]
+        return queue, [self._snapshot_frame]
+
+    def unsubscribe(self, queue: asyncio.Queue):
+        self._clients.discard(queue)
+
+    def _drop(self, queue: asyncio.Queue):
+        """Disconnect a client that fell behind (None tells its handler to close)."""
+        self._clients.discard(queue)
+        while not queue.empty():
+            queue.get_nowait()
+        queue.put_nowait(None)
+        inc("server_clients_dropped_total")
+
+    def close(self):
+        for queue in list(self._clients):
+            self._drop(queue)
+
+
+class ApiServer:
+    def __init__(self, service: ScanService, store=None, max_clients: int = MAX_CLIENTS,
+                 keepalive: float = KEEPALIVE_SECONDS):
+        self.service = service
+        self.store = store
+        self.max_clients = max_clients
+        self.keepalive = keepalive
+
+    async def start(self, host: str = DEFAULT_HOST, port: int = DEFAULT_PORT) -> asyncio.AbstractServer:
+        return await asyncio.start_server(self.handle, host, port)
+
+    async def handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        try:
+            request = await self._read_request(reader)
+            if request is None:
+                return
+            method, path, query, headers = request
+            route = path if path in ("/", "/api/latest", "/api/history", "/api/events", "/metrics") else "other"
+            inc("server_requests_total", route=route)
+            if method != "GET":
+                await self._respond(writer, 405, b"only GET is supported\n")
+            elif path == "/":
+                await self._respond(writer, 200, DASHBOARD_HTML.encode(), "text/html; charset=utf-8")
+            elif path == "/api/latest":
+                await self._respond(writer, 200, self.service.latest_json, "application/json")
+            elif path == "/api/history":
+                await self._history(writer, query)
+            elif path == "/api/events":
+                await self._events(writer, headers)
+            elif path == "/metrics":
+                from src.utils.metrics import METRICS
+                await self._respond(writer, 200, METRICS.to_prometheus().encode(), "text/plain; version=0.0.4")
+            else:
+                await self._respond(writer, 404, b"not found\n")
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+            try:
+                await writer.wait_closed()
+            except ConnectionError:
+                pass
+
+    async def _read_request(self, reader: asyncio.StreamReader):
+        """(method, path, query, headers) of the request, or None after answering a bad one."""
+        try:
+            head = await asyncio.wait_for(reader.readuntil(b"\r\n\r\n"), REQUEST_TIMEOUT)
+        except (asyncio.TimeoutError, asyncio.IncompleteReadError, asyncio.LimitOverrunError):
+            return None
+        lines = head.decode("latin-1").split("\r\n")
+        parts = lines[0].split()
+        if len(parts) != 3:
+            return None
+        headers = {}
+        for line in lines[1:]:
+            name, sep, value = line.partition(":")
+            if sep:
+                headers[name.strip().lower()] = value.strip()
+        url = urlsplit(parts[1])
+        return parts[0].upper(), url.path, parse_qs(url.query), headers
+
+    async def _respond(self, writer: asyncio.StreamWriter, status: int, body: bytes,
+                       content_type: str = "text/plain; charset=utf-8"):
+        writer.write((f"HTTP/1.1 {status} {REASONS[status]}\r\nContent-Type: {content_type}\r\n"
+                      f"Content-Length: {len(body)}\r\nCache-Control: no-cache\r\nConnection: close\r\n\r\n").encode())
+        writer.write(body)
+        await writer.drain()
+
+    async def _history(self, writer: asyncio.StreamWriter, query: Dict[str, List[str]]):
+        if self.store is None:
+            await self._respond(writer, 404, b"no history store (run with --record-history)\n")
+            return
+        try:
+            since = float(query["since"][0]) if "since" in query else None
+            until = float(query["until"][0]) if "until" in query else None
+        except ValueError:
+            await self._respond(writer, 400, b"since/until must be unix seconds\n")
+            return
+        rows = await asyncio.get_running_loop().run_in_executor(
+            None, lambda: list(self.store.networks_between(since, until)))
+        await self._respond(writer, 200, json.dumps({"networks": rows}).encode(), "application/json")
+
+    async def _events(self, writer: asyncio.StreamWriter, headers: Dict[str, str]):
+        if self.service.clients >= self.max_clients:
+            await self._respond(writer, 503, b"too many clients\n")
+            return
+        queue, backlog = self.service.subscribe(headers.get("last-event-id"))
+        inc("server_clients_total")
+        try:
+            writer.write(b"HTTP/1.1 200 OK\r\nContent-Type: text/event-stream\r\nCache-Control: no-cache\r\n"
+                         b"Connection: keep-alive\r\n\r\n" + f"retry: {RETRY_MS}\n\n".encode() + b"".join(backlog))
+            await writer.drain()
+            while True:
+                try:
+                    frame = await asyncio.wait_for(queue.get(), self.keepalive)
+                except asyncio.TimeoutError:
+                    frame = b": keepalive\n\n"  # also detects clients that went away
+                if frame is None:
+                    return
+                writer.write(frame)
+                await writer.drain()
+        finally:
+            self.service.unsubscribe(queue)
+
+
+async def serve(service: ScanService, host: str = DEFAULT_HOST, port: int = DEFAULT_PORT, store=None):
+    """Run the scan loop and the HTTP server until cancelled (Ctrl-C)."""
+    server = await ApiServer(service, store).start(host, port)
+    print(f"Serving on http://{host}:{port}/ (scanning every {service.interval:g}s)")
+    scanner = asyncio.create_task(service.run())
+    try:
+        async with server:
+            await server.serve_forever()
+    finally:
+        scanner.cancel()
+        service.close()
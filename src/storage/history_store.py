@@ -0,0 +1,225 @@
+"""
+history_store.py
+- Append-only store of scan results in SQLite (WAL mode).
+- Each scan is inserted in one batched transaction; observations are indexed
+  on timestamp, SSID, BSSID, security and network identity.
+- Query API for audit questions: networks seen in a time window, first/last
+  sightings and security downgrades.
+"""
+import os
+import sqlite3
+import threading
+import time
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+from src.scanner.encryption_parser import RISK, UNKNOWN, security_risk
+from src.scanner.network import NetworkLike
+from src.scanner.scan_diff import network_key
+from src.utils.metrics import span
+
+# higher is stronger (100 - risk score); UNKNOWN gets no rank so it never
+# counts as a downgrade. Databases from before schema version 1 stored ranks
+# on a 0..4 scale; HistoryStore recomputes them when it opens such a file.
+SECURITY_RANK = {category: 100 - risk for category, risk in RISK.items() if category != UNKNOWN}
+SCHEMA_VERSION = 1
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS scans (
+    id INTEGER PRIMARY KEY,
+    ts REAL NOT NULL,
+    networks INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS observations (
+    id INTEGER PRIMARY KEY,
+    scan_id INTEGER NOT NULL REFERENCES scans(id),
+    ts REAL NOT NULL,
+    key TEXT NOT NULL,
+    ssid TEXT,
+    bssid TEXT,
+    security TEXT,
+    security_rank INTEGER,
+    signal INTEGER,
+    channel INTEGER,
+    frequency INTEGER
+);
+CREATE INDEX IF NOT EXISTS idx_obs_ts ON observations(ts);
+CREATE INDEX IF NOT EXISTS idx_obs_ssid ON observations(ssid, ts);
+CREATE INDEX IF NOT EXISTS idx_obs_bssid ON observations(bssid, ts);
+CREATE INDEX IF NOT EXISTS idx_obs_security ON observations(security);
+CREATE INDEX IF NOT EXISTS idx_obs_key ON observations(key, ts);
+"""
+
+INSERT_OBSERVATION = """
+INSERT INTO observations (scan_id, ts, key, ssid, bssid, security, security_rank, signal, channel, frequency)
+VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+"""
+
+
+def security_rank(security: str) -> Optional[int]:
+    return SECURITY_RANK.get(security_risk(security or "")[0])
+
+
+def _rank(network: NetworkLike) -> Optional[int]:
+    # rows classified upstream (CLI pipeline) already carry their category
+    category = network.get("category")
+    return SECURITY_RANK.get(category) if category else security_rank(network.get("security"))
+
+
+def _time_window(since: Optional[float], until: Optional[float]) -> Tuple[float, float]:
+    return (since if since is not None else float("-inf"), until if until is not None else float("inf"))
+
+
+class HistoryStore:
+    def __init__(self, path: str):
+        folder = os.path.dirname(path)
+        if folder:
+            os.makedirs(folder, exist_ok=True)
+        self.path = path
+        # one connection shared by GUI/CLI worker threads, serialised by a lock
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        self._lock = threading.Lock()
+        with self._lock:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+            self._conn.executescript(SCHEMA)
+            self._migrate()
+
+    def _migrate(self):
+        version = self._conn.execute("PRAGMA user_version").fetchone()[0]
+        if version < 1:
+            # version 0 ranked security 0..4; recompute from the stored security string
+            with self._conn:
+                securities = [r[0] for r in self._conn.execute("SELECT DISTINCT security FROM observations")]
+                self._conn.executemany("UPDATE observations SET security_rank = ? WHERE security IS ?",
+                                       [(security_rank(s), s) for s in securities])
+        if version < SCHEMA_VERSION:
+            self._conn.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    # --- writes ---
+    def record_scan(self, networks: Iterable[NetworkLike], ts: Optional[float] = None) -> int:
+        """Store one scan in a single transaction; returns its scan id."""
+        return self.record_scans([(time.time() if ts is None else ts, networks)])[-1]
+
+    def record_scans(self, scans: Iterable[Tuple[float, Iterable[NetworkLike]]]) -> List[int]:
+        """Store several (ts, networks) scans in one transaction."""
+        ids = []
+        with span("persist"):
+            prepared = [(ts, [
+                (network_key(n), n.get("ssid"), n.get("bssid"), n.get("security"), _rank(n),
+                 n.get("signal"), n.get("channel"), n.get("frequency"))
+                for n in networks if not n.get("error")
+            ]) for ts, networks in scans]
+            with self._lock, self._conn:
+                for ts, rows in prepared:
+                    cur = self._conn.execute("INSERT INTO scans (ts, networks) VALUES (?, ?)", (ts, len(rows)))
+                    scan_id = cur.lastrowid
+                    self._conn.executemany(INSERT_OBSERVATION, ((scan_id, ts) + row for row in rows))
+                    ids.append(scan_id)
+        return ids
+
+    # --- queries ---
+    def _query(self, sql: str, params=()) -> List[Dict]:
+        with self._lock:
+            return [dict(r) for r in self._conn.execute(sql, params)]
+
+    def _iter_query(self, sql: str, params=()) -> Iterator[Dict]:
+        """Stream rows on a separate connection; WAL lets it read while scans are written."""
+        conn = sqlite3.connect(self.path)
+        conn.row_factory = sqlite3.Row
+        try:
+            for row in conn.execute(sql, params):
+                yield dict(row)
+        finally:
+            conn.close()
+
+    def iter_observations(self, since: Optional[float] = None, until: Optional[float] = None) -> Iterator[Dict]:
+        """Every stored observation in [since, until], oldest first (for analytics)."""
+        lo, hi = _time_window(since, until)
+        return self._iter_query(
+            "SELECT ts, ssid, bssid, security, signal, channel, frequency FROM observations "
+            "WHERE ts BETWEEN ? AND ? ORDER BY ts", (lo, hi))
+
+    def scan_count(self, since: Optional[float] = None, until: Optional[float] = None) -> int:
+        """Number of scans with at least one observation in [since, until]."""
+        lo, hi = _time_window(since, until)
+        rows = self._query("SELECT COUNT(DISTINCT ts) AS n FROM observations WHERE ts BETWEEN ? AND ?", (lo, hi))
+        return rows[0]["n"]
+
+    def channel_loads(self, since: Optional[float] = None, until: Optional[float] = None) -> Iterator[Dict]:
+        """
+        Per scan and raw (channel, frequency): observations and weight (signal
+        clipped to 0..100, summed, / 100). Input for channels.aggregated_channel_report.
+        """
+        lo, hi = _time_window(since, until)
+        return self._iter_query("""
+            SELECT ts, channel, frequency, COUNT(*) AS observations,
+                   TOTAL(MIN(MAX(signal, 0), 100)) / 100.0 AS weight
+            FROM observations
+            WHERE ts BETWEEN ? AND ? AND (channel IS NOT NULL OR frequency IS NOT NULL)
+            GROUP BY ts, channel, frequency
+        """, (lo, hi))
+
+    def channel_sightings(self, since: Optional[float] = None, until: Optional[float] = None) -> Iterator[Dict]:
+        """Distinct (channel, frequency, key) combinations seen in [since, until]."""
+        lo, hi = _time_window(since, until)
+        return self._iter_query(
+            "SELECT DISTINCT channel, frequency, key FROM observations "
+            "WHERE ts BETWEEN ? AND ? AND (channel IS NOT NULL OR frequency IS NOT NULL)", (lo, hi))
+
+    def networks_between(self, since: Optional[float] = None, until: Optional[float] = None) -> Iterator[Dict]:
+        """
+        Distinct networks seen in [since, until], one row per identity with its
+        most recent SSID/security, strongest signal and first/last sighting.
+        Rows are streamed, so the result can feed generate_report_stream directly.
+        """
+        lo, hi = _time_window(since, until)
+        return self._iter_query("""
+            SELECT o.ssid, o.bssid, o.security, g.signal, o.channel, o.frequency,
+                   g.first_seen, g.last_seen, g.sightings
+            FROM (SELECT key, MAX(signal) AS signal, MIN(ts) AS first_seen, MAX(ts) AS last_seen,
+                         COUNT(*) AS sightings, MAX(id) AS last_id
+                  FROM observations WHERE ts BETWEEN ? AND ? GROUP BY key) g
+            JOIN observations o ON o.id = g.last_id
+            ORDER BY g.first_seen
+        """, (lo, hi))
+
+    def first_last_seen(self, ssid: Optional[str] = None, bssid: Optional[str] = None) -> List[Dict]:
+        """First and last sighting per network, optionally filtered by SSID or BSSID."""
+        where, params = [], []
+        if ssid is not None:
+            where.append("ssid = ?")
+            params.append(ssid)
+        if bssid is not None:
+            where.append("bssid = ?")
+            params.append(bssid)
+        clause = f"WHERE {' AND '.join(where)}" if where else ""
+        return self._query(f"""
+            SELECT key, MAX(ssid) AS ssid, MAX(bssid) AS bssid, MIN(ts) AS first_seen,
+                   MAX(ts) AS last_seen, COUNT(*) AS sightings
+            FROM observations {clause} GROUP BY key ORDER BY first_seen
+        """, params)
+
+    def security_downgrades(self, since: Optional[float] = None, until: Optional[float] = None) -> List[Dict]:
+        """Sightings where a network advertised weaker security than on its previous sighting."""
+        lo, hi = _time_window(since, until)
+        return self._query("""
+            SELECT key, ssid, bssid, ts, prev_security AS from_security, security AS to_security
+            FROM (SELECT key, ssid, bssid, ts, security, security_rank,
+                         LAG(security) OVER w AS prev_security,
+                         LAG(security_rank) OVER w AS prev_rank
+                  FROM observations WHERE security_rank IS NOT NULL
+                  WINDOW w AS (PARTITION BY key ORDER BY ts, id))
+            WHERE security_rank < prev_rank AND ts BETWEEN ? AND ?
+            ORDER BY ts
+        """, (lo, hi))
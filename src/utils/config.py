@@ -2,14 +2,45 @@
 config.py - small loader for environment-based configuration.
 """
 import os
-from dotenv import load_dotenv
+
+def _find_env_file():
+    """Nearest .env walking up from this package, like dotenv's find_dotenv()."""
+    path = os.path.dirname(os.path.abspath(__file__))
+    while True:
+        candidate = os.path.join(path, ".env")
+        if os.path.isfile(candidate):
+            return candidate
+        parent = os.path.dirname(path)
+        if parent == path:
+            return None
+        path = parent
 
 def load_config():
-    load_dotenv()
+    env_file = _find_env_file()
+    if env_file:
+        # python-dotenv (and its logging import) is only loaded when there is a .env to read
+        from dotenv import load_dotenv
+        load_dotenv(env_file)
     cfg = {
         "DEFAULT_INTERFACE": os.getenv("DEFAULT_INTERFACE", "wlan0"),
         "CAPTURE_FOLDER": os.getenv("CAPTURE_FOLDER", "data/captured_handshakes"),
         "SIMULATE_CAPTURE": os.getenv("SIMULATE_CAPTURE", "true").lower() in ("1","true","yes"),
+        "SCAN_INTERFACES": [i.strip() for i in os.getenv("SCAN_INTERFACES", "").split(",") if i.strip()],
+        "SCAN_TIMEOUT": float(os.getenv("SCAN_TIMEOUT", "20")),
+        "SCAN_CACHE_TTL": float(os.getenv("SCAN_CACHE_TTL", "10")),
+        "SCAN_CACHE_FILE": os.getenv("SCAN_CACHE_FILE", ""),
+        "HISTORY_DB": os.getenv("HISTORY_DB", "data/scan_history.db"),
+        "RECORD_HISTORY": os.getenv("RECORD_HISTORY", "false").lower() in ("1","true","yes"),
+        "LOG_MAX_LINES": int(os.getenv("LOG_MAX_LINES", "5000")),
+        "LOG_RATE_LIMIT": float(os.getenv("LOG_RATE_LIMIT", "50")),
+        "LOG_FILE": os.getenv("LOG_FILE", ""),
+        "CAPTURE_WORKERS": int(os.getenv("CAPTURE_WORKERS", "16")),
+        "CAPTURE_TIMEOUT": float(os.getenv("CAPTURE_TIMEOUT", "30")),
+        "AUDIT_CACHE": os.getenv("AUDIT_CACHE", "data/capture_audit_cache.json"),
+        "METRICS_JSON": os.getenv("METRICS_JSON", ""),
+        "METRICS_PROM": os.getenv("METRICS_PROM", ""),
+        "SERVER_HOST": os.getenv("SERVER_HOST", "127.0.0.1"),
+        "SERVER_PORT": int(os.getenv("SERVER_PORT", "8080")),
     }
     return cfg
 
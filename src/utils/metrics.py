@@ -0,0 +1,190 @@
+"""
+metrics.py - lightweight in-process instrumentation.
+
+- span(stage) / @timed(stage): context manager / decorator timing a pipeline stage into the
+  `stage_duration_seconds` histogram (label stage=...).
+- inc()/observe(): counters and histograms with optional labels.
+- Exports a JSON summary and a Prometheus text-format file (suitable for
+  node_exporter's textfile collector).
+
+A process-wide registry, METRICS, is used by the scanner, capture and report
+modules; the CLI writes it out with --metrics-json / --metrics-prom.
+"""
+import functools
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, Tuple
+
+PREFIX = "wifi_"
+DEFAULT_BUCKETS = (0.001, 0.005, 0.01, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+STAGE_METRIC = "stage_duration_seconds"
+INF_LABEL = 'le="+Inf"'
+
+HELP = {
+    STAGE_METRIC: "Time spent in each pipeline stage",
+    "networks_scanned_total": "Networks returned by scans",
+    "scans_total": "Scans performed",
+    "captures_total": "Handshake captures attempted",
+    "reports_total": "Reports written, by format",
+    "scan_errors_total": "nmcli scans that failed or timed out",
+}
+
+Labels = Tuple[Tuple[str, str], ...]
+
+
+class Histogram:
+    __slots__ = ("buckets", "counts", "count", "sum", "min", "max")
+
+    def __init__(self, buckets=DEFAULT_BUCKETS):
+        self.buckets = buckets
+        self.counts = [0] * len(buckets)
+        self.count = 0
+        self.sum = 0.0
+        self.min = float("inf")
+        self.max = 0.0
+
+    def observe(self, value: float):
+        self.count += 1
+        self.sum += value
+        self.min = min(self.min, value)
+        self.max = max(self.max, value)
+        for i, bound in enumerate(self.buckets):
+            if value <= bound:
+                self.counts[i] += 1
+                break
+
+    def summary(self) -> Dict:
+        return {
+            "count": self.count,
+            "sum": self.sum,
+            "mean": self.sum / self.count if self.count else 0.0,
+            "min": self.min if self.count else 0.0,
+            "max": self.max,
+        }
+
+
+def _labels(labels: Dict[str, str]) -> Labels:
+    return tuple(sorted((k, str(v)) for k, v in labels.items()))
+
+
+def _fmt_labels(labels: Labels, extra: str = "") -> str:
+    parts = [f'{k}="{v}"' for k, v in labels]
+    if extra:
+        parts.append(extra)
+    return "{" + ",".join(parts) + "}" if parts else ""
+
+
+class Metrics:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.counters: Dict[Tuple[str, Labels], float] = {}
+        self.histograms: Dict[Tuple[str, Labels], Histogram] = {}
+
+    def inc(self, name: str, value: float = 1, **labels):
+        key = (name, _labels(labels))
+        with self._lock:
+            self.counters[key] = self.counters.get(key, 0) + value
+
+    def observe(self, name: str, value: float, **labels):
+        key = (name, _labels(labels))
+        with self._lock:
+            hist = self.histograms.get(key)
+            if hist is None:
+                hist = self.histograms[key] = Histogram()
+            hist.observe(value)
+
+    @contextmanager
+    def span(self, stage: str):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(STAGE_METRIC, time.perf_counter() - start, stage=stage)
+
+    def reset(self):
+        with self._lock:
+            self.counters.clear()
+            self.histograms.clear()
+
+    # --- export ---
+    def to_dict(self) -> Dict:
+        with self._lock:
+            stages = {dict(l).get("stage", ""): h.summary()
+                      for (n, l), h in self.histograms.items() if n == STAGE_METRIC}
+            histograms = {f"{n}{_fmt_labels(l)}": h.summary()
+                          for (n, l), h in self.histograms.items() if n != STAGE_METRIC}
+            counters = {f"{n}{_fmt_labels(l)}": v for (n, l), v in self.counters.items()}
+        return {"stages": stages, "counters": counters, "histograms": histograms}
+
+    def to_prometheus(self) -> str:
+        lines = []
+        with self._lock:
+            counters = sorted(self.counters.items())
+            histograms = sorted(self.histograms.items(), key=lambda kv: kv[0])
+        seen = set()
+        for (name, labels), value in counters:
+            full = PREFIX + name
+            if full not in seen:
+                seen.add(full)
+                if name in HELP:
+                    lines.append(f"# HELP {full} {HELP[name]}")
+                lines.append(f"# TYPE {full} counter")
+            lines.append(f"{full}{_fmt_labels(labels)} {value:g}")
+        for (name, labels), hist in histograms:
+            full = PREFIX + name
+            if full not in seen:
+                seen.add(full)
+                if name in HELP:
+                    lines.append(f"# HELP {full} {HELP[name]}")
+                lines.append(f"# TYPE {full} histogram")
+            cumulative = 0
+            for bound, count in zip(hist.buckets, hist.counts):
+                cumulative += count
+                le = 'le="%g"' % bound
+                lines.append(f"{full}_bucket{_fmt_labels(labels, le)} {cumulative}")
+            lines.append(f"{full}_bucket{_fmt_labels(labels, INF_LABEL)} {hist.count}")
+            lines.append(f"{full}_sum{_fmt_labels(labels)} {hist.sum:.9g}")
+            lines.append(f"{full}_count{_fmt_labels(labels)} {hist.count}")
+        return "\n".join(lines) + "\n"
+
+    def write_json(self, path: str):
+        _atomic_write(path, json.dumps(self.to_dict(), indent=2) + "\n")
+
+    def write_prometheus(self, path: str):
+        _atomic_write(path, self.to_prometheus())
+
+
+def _atomic_write(path: str, text: str):
+    folder = os.path.dirname(path)
+    if folder:
+        os.makedirs(folder, exist_ok=True)
+    tmp = f"{path}.tmp"
+    with open(tmp, "w") as fh:
+        fh.write(text)
+    os.replace(tmp, path)
+
+
+METRICS = Metrics()
+
+
+def span(stage: str):
+    """Time a stage in the process-wide registry: `with span("scan"): ...`."""
+    return METRICS.span(stage)
+
+
+def timed(stage: str):
+    """Decorator form of span() for functions that are a whole stage."""
+    def decorate(fn):
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            with METRICS.span(stage):
+                return fn(*args, **kwargs)
+        return wrapper
+    return decorate
+
+
+def inc(name: str, value: float = 1, **labels):
+    METRICS.inc(name, value, **labels)
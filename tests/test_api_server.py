@@ -0,0 +1,99 @@
+import asyncio
+import json
+
+from src.scanner.network import Network
+from src.server.api_server import ApiServer, ScanService
+
+
+async def _get(port, path, headers=""):
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    writer.write(f"GET {path} HTTP/1.1\r\nHost: test\r\n{headers}\r\n".encode())
+    await writer.drain()
+    return reader, writer
+
+
+async def _sse_events(reader, count, headers=True):
+    """Parse the next `count` SSE events as (event, id, data)."""
+    if headers:
+        await reader.readuntil(b"\r\n\r\n")
+    events = []
+    while len(events) < count:
+        block = (await reader.readuntil(b"\n\n")).decode()
+        fields = dict(line.split(": ", 1) for line in block.strip().splitlines() if not line.startswith(":"))
+        if "event" in fields:
+            events.append((fields["event"], fields["id"], json.loads(fields["data"])))
+    return events
+
+
+def test_many_clients_share_one_scan_stream():
+    scans = []
+
+    def scan():
+        scans.append(1)
+        return [Network("Lab", "WPA2", 60 + 10 * len(scans), bssid="AA:00:00:00:00:01")] + (
+            [Network("Guest", "--", 30)] if len(scans) == 2 else [])
+
+    async def scenario():
+        service = ScanService(scan, interval=3600)
+        service.publish(scan())
+        server = await ApiServer(service, keepalive=0.5).start("127.0.0.1", 0)
+        port = server.sockets[0].getsockname()[1]
+        async with server:
+            clients = [await _get(port, "/api/events") for _ in range(20)]
+            snapshots = await asyncio.gather(*(_sse_events(r, 1) for r, _ in clients))
+            assert all(s[0][0] == "snapshot" and s[0][2]["networks"][0]["key"] == "aa:00:00:00:00:01"
+                       for s in snapshots)
+            while service.clients < 20:
+                await asyncio.sleep(0.01)
+            service.publish(await asyncio.get_running_loop().run_in_executor(None, scan))
+            deltas = await asyncio.gather(*(_sse_events(r, 1, headers=False) for r, _ in clients))
+            events = {ev["event"]: ev for ev in deltas[0][0][2]["events"]}
+            assert sorted(events) == ["appeared", "changed"] and all(d == deltas[0] for d in deltas)
+            assert (events["appeared"]["network"]["ssid"], events["appeared"]["network"]["category"]) == ("Guest", "OPEN")
+            assert len(scans) == 2  # 20 clients, still one scan per publish
+
+            # a reconnecting client resumes from its last event id instead of a snapshot
+            reader, writer = await _get(port, "/api/events", f"Last-Event-ID: {service.event_id(1)}\r\n")
+            (event, event_id, _), = await _sse_events(reader, 1)
+            assert (event, event_id) == ("delta", service.event_id(2))
+            writer.close()
+
+            reader, writer = await _get(port, "/api/latest")
+            body = (await reader.read()).split(b"\r\n\r\n", 1)[1]
+            assert json.loads(body)["seq"] == 2
+            for _, w in clients:
+                w.close()
+            service.close()
+
+    asyncio.run(scenario())
+
+
+def test_slow_client_is_dropped_and_resyncs_with_a_snapshot():
+    async def scenario():
+        service = ScanService(lambda: [], client_queue=2)
+        queue, backlog = service.subscribe()
+        for i in range(3):
+            service.publish([Network(f"n{i}", "WPA2", 50)])
+        assert service.clients == 0 and queue.get_nowait() is None
+        # its EventSource reconnects with the last id it saw: too far behind to replay
+        _, frames = service.subscribe(service.event_id(0))
+        assert len(frames) == 1 and frames[0].startswith(f"id: {service.event_id(3)}\nevent: snapshot".encode())
+        _, frames = service.subscribe(service.event_id(1))
+        assert [f.split(b"\n")[1] for f in frames] == [b"event: delta"] * 2
+
+    asyncio.run(scenario())
+
+
+def test_scan_errors_are_counted_not_printed(capsys):
+    from src.utils.metrics import METRICS
+
+    def scan():
+        raise RuntimeError("radio gone")
+
+    async def scenario():
+        await ScanService(scan, interval=0).run(max_scans=2)
+
+    before = METRICS.to_dict()["counters"].get("server_scan_errors_total", 0)
+    asyncio.run(scenario())
+    assert capsys.readouterr().out == ""
+    assert METRICS.to_dict()["counters"]["server_scan_errors_total"] == before + 2
@@ -0,0 +1,11 @@
+from benchmarks.run_benchmarks import compare, run_suite
+
+
+def test_smoke_suite_covers_hot_paths_and_compares():
+    current = run_suite("smoke")
+    names = {r["name"] for r in current["results"]}
+    assert {"parse_nmcli_output", "classify_security", "signal_to_quality",
+            "generate_report[json]", "generate_report[html]", "pcap_contains_handshake"} <= names
+    baseline = {"results": [dict(r, best_s=r["best_s"] / 10) for r in current["results"]]}
+    assert len(compare(current, baseline, threshold=1.25)) == len(current["results"])
+    assert compare(current, current, threshold=1.25) == []
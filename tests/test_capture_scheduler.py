@@ -0,0 +1,43 @@
+import threading
+import time
+
+from src.capture.handshake_capture import capture_handshake_simulated
+from src.capture.scheduler import CaptureScheduler, summarize
+from src.scanner.network import Network
+
+
+def test_concurrent_simulated_captures_with_progress(tmp_path, capsys):
+    nets = [Network(f"lab_{i}", "WPA2", 50) for i in range(40)]
+    seen = []
+    sched = CaptureScheduler(capture_handshake_simulated, workers=40,
+                             progress=lambda done, total, r: seen.append((done, total)))
+    start = time.monotonic()
+    results = sched.run(nets, {"CAPTURE_FOLDER": str(tmp_path)})
+    assert time.monotonic() - start < 5  # 40 x 0.5 s serially would take 20 s
+    assert summarize(results) == {"done": 40}
+    assert [r["ssid"] for r in results] == [n.ssid for n in nets]
+    assert seen[-1] == (40, 40)
+    assert len(list((tmp_path / "blobs").rglob("*.cap.gz"))) == 40
+    assert all(r["path"].endswith(".cap.gz") for r in results)
+    assert capsys.readouterr().out == ""  # workers stay quiet; progress reports results
+
+
+def test_timeout_and_cancel():
+    def stuck(network, cfg, cancel):
+        cancel.wait()  # only returns once stopped
+
+    results = CaptureScheduler(stuck, workers=2, timeout=0.1).run([Network("a"), Network("b")], {})
+    assert summarize(results) == {"timeout": 2}
+
+    started = threading.Event()
+
+    def slow(network, cfg, cancel):
+        started.set()
+        cancel.wait(10)
+
+    sched = CaptureScheduler(slow, workers=1, timeout=10)
+    threading.Thread(target=lambda: (started.wait(), sched.cancel()), daemon=True).start()
+    start = time.monotonic()
+    results = sched.run([Network(f"n{i}") for i in range(5)], {})
+    assert time.monotonic() - start < 5
+    assert summarize(results) == {"cancelled": 5}
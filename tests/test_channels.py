@@ -0,0 +1,68 @@
+import json
+
+import numpy as np
+
+from src.analytics.channels import channel_frame, channel_report, overlap_matrix
+from src.analytics.signal_history import history_from_scans
+from src.scanner.network import Network
+
+
+def _scans():
+    a = Network("A", "WPA2", 80, bssid="aa:00:00:00:00:01", channel=1, frequency=2412)
+    b = Network("B", "WPA2", 50, bssid="aa:00:00:00:00:02", channel=6)
+    c = Network("C", "WPA3", 100, bssid="aa:00:00:00:00:03", channel=36, frequency=5180)
+    d = Network("D", "--", 40, bssid="aa:00:00:00:00:04", channel=2, frequency=2417)
+    hidden = Network("E", "WPA2", 90)  # no channel information: ignored
+    return [(0, [a, b, c, d, hidden]), (10, [Network("A", "WPA2", 60, bssid="aa:00:00:00:00:01", channel=1, frequency=2412)])]
+
+
+def test_overlap_matrix_by_band():
+    m = overlap_matrix([2412, 2417, 2437, 2462, 5180, 5200], ["2.4GHz"] * 4 + ["5GHz"] * 2)
+    assert np.allclose(np.diag(m), 1)
+    assert 0.7 < m[0, 1] < 0.8  # adjacent 2.4 GHz channels mostly overlap
+    assert m[0, 2] == 0 and m[2, 3] == 0  # 1/6/11 do not
+    assert m[4, 5] == 0 and m[0, 4] == 0
+
+
+def test_channel_report_occupancy_and_congestion():
+    cf = channel_frame(history_from_scans(_scans()))
+    assert list(cf["frequency"].unique()) == [2412, 2437, 5180, 2417]  # channel 6 frequency filled in
+    report = channel_report(history_from_scans(_scans()))
+    assert report["scans"] == 2 and report["labels"] == ["2.4GHz:1", "2.4GHz:2", "2.4GHz:6", "5GHz:36"]
+    ch1 = report["channels"][0]
+    assert (ch1["observations"], ch1["aps"], ch1["mean_aps"], ch1["load"]) == (2, 1, 1.0, 0.7)
+    assert ch1["congestion"] == round(ch1["load"] + ch1["adjacent"], 3) and ch1["adjacent"] > 0
+    assert report["channels"][3]["adjacent"] == 0.0
+    json.dumps(report)
+
+
+def test_reports_include_channels(tmp_path):
+    import csv
+    from src.report.report_generator import generate_report
+
+    nets = _scans()[0][1]
+    doc = json.loads(open(generate_report(nets, str(tmp_path / "r.json"))).read())
+    assert len(doc["channels"]["channels"]) == 4
+    assert doc["networks"][2]["channel_congestion"] == 1.0 and doc["networks"][4]["channel_congestion"] is None
+    ch6 = next(c["congestion"] for c in doc["channels"]["channels"] if c["channel"] == 6)
+    assert doc["networks"][1]["channel_congestion"] == ch6  # channel 6 without a frequency
+    from src.report.report_generator import report_rows
+    row, = report_rows([{"ssid": "F", "security": "WPA2", "frequency": "2437"}], doc["channels"])
+    assert row["channel_congestion"] == ch6
+    with open(generate_report(nets, str(tmp_path / "r.csv"))) as fh:
+        assert next(csv.DictReader(fh))["channel_congestion"]
+    assert "<h2>Channels (1 scans)</h2>" in open(generate_report(nets, str(tmp_path / "r.html"))).read()
+
+
+def test_history_channels_aggregate_in_sql_like_in_memory(tmp_path):
+    from src.report.report_generator import history_channels
+    from src.storage.history_store import HistoryStore
+
+    scans = _scans() + [(20, [Network("B", "WPA2", 70, bssid="aa:00:00:00:00:02", channel=6, frequency=2437),
+                              Network("G", "WPA2", 120, bssid="aa:00:00:00:00:07", frequency=2437)])]
+    with HistoryStore(str(tmp_path / "h.db")) as store:
+        store.record_scans(scans)
+        report = history_channels(store)
+        assert len(list(store.channel_loads())) < len(list(store.iter_observations()))
+    assert report == channel_report(history_from_scans(scans))
+    assert report["scans"] == 3
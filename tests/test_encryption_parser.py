@@ -0,0 +1,21 @@
+from src.scanner.encryption_parser import classify_scan, classify_security
+from src.scanner.network import Network
+
+
+def test_classify_security_categories():
+    cases = {
+        "WPA2": "WPA2", "WPA1 WPA2": "WPA/WPA2", "WPA2 802.1X": "WPA2-Enterprise",
+        "WPA3": "WPA3", "SAE": "WPA3", "WPA2 WPA3": "WPA2/WPA3", "WPA3 802.1X": "WPA3-Enterprise",
+        "WPA1": "WPA", "WEP": "WEP", "OWE": "OWE", "--": "OPEN", "open": "OPEN",
+        "": "UNKNOWN", "FOO": "UNKNOWN",
+    }
+    assert {s: classify_security(s) for s in cases} == cases
+
+
+def test_classify_scan_scores_and_counts():
+    scan = [Network("a", "WPA2", 50), Network("b", "WEP", 40), Network("c", "WPA2", 30),
+            Network("(error)", "(none)", 0, error="boom")]
+    result = classify_scan(scan)
+    assert result["assessments"][:3] == [("WPA2", 30), ("WEP", 90), ("WPA2", 30)]
+    assert result["counts"] == {"WPA2": 2, "WEP": 1}
+    assert result["max_risk"] == 90
@@ -0,0 +1,39 @@
+from src.report.report_generator import generate_report_from_history
+from src.scanner.network import Network
+from src.storage.history_store import HistoryStore
+
+
+def test_history_queries(tmp_path):
+    with HistoryStore(str(tmp_path / "h.db")) as store:
+        store.record_scans([
+            (100.0, [Network("Home", "WPA2", 60, bssid="AA:00:00:00:00:01"), Network("Cafe", "--", 40)]),
+            (200.0, [Network("Home", "WEP", 70, bssid="aa:00:00:00:00:01")]),
+            (300.0, [Network("Home", "WEP", 65, bssid="aa:00:00:00:00:01"), Network("Cafe", "--", 30)]),
+        ])
+        window = list(store.networks_between(150, 250))
+        assert [(n["ssid"], n["security"]) for n in window] == [("Home", "WEP")]
+
+        seen = {r["key"]: r for r in store.first_last_seen()}
+        assert (seen["Cafe"]["first_seen"], seen["Cafe"]["last_seen"], seen["Cafe"]["sightings"]) == (100.0, 300.0, 2)
+
+        downgrades = store.security_downgrades()
+        assert [(d["ts"], d["from_security"], d["to_security"]) for d in downgrades] == [(200.0, "WPA2", "WEP")]
+
+        out = generate_report_from_history(store, str(tmp_path / "h.ndjson"))
+        assert len(open(out).read().splitlines()) == 2
+
+
+def test_old_rank_scale_is_migrated(tmp_path):
+    import sqlite3
+    path = str(tmp_path / "old.db")
+    with HistoryStore(path) as store:
+        store.record_scan([Network("Home", "WPA2", 60, bssid="aa:00:00:00:00:01")], ts=100.0)
+    conn = sqlite3.connect(path)
+    conn.execute("UPDATE observations SET security_rank = 3")  # WPA2 on the pre-risk-score 0..4 scale
+    conn.execute("PRAGMA user_version = 0")
+    conn.commit()
+    conn.close()
+    with HistoryStore(path) as store:
+        store.record_scan([Network("Home", "WEP", 60, bssid="aa:00:00:00:00:01")], ts=200.0)
+        downgrades = store.security_downgrades()
+    assert [(d["from_security"], d["to_security"]) for d in downgrades] == [("WPA2", "WEP")]
@@ -0,0 +1,16 @@
+from src.gui.log_pipeline import LogPipeline
+
+
+def test_rate_limit_and_spill(tmp_path):
+    spill = tmp_path / "full.log"
+    logs = LogPipeline(max_lines=5, rate_per_sec=0.001, burst=3, spill_path=str(spill))
+    for i in range(10):
+        logs.put(f"capture {i}", source="capture")
+    logs.put("scan done", source="scan")
+    lines = logs.drain()
+    assert lines[:3] == ["capture 0", "capture 1", "capture 2"]
+    assert "scan done" in lines
+    assert lines[-1].startswith("[log] 7 message(s) from capture suppressed")
+    assert logs.drain() == []
+    logs.close()
+    assert len(spill.read_text().splitlines()) == 11
@@ -0,0 +1,26 @@
+import json
+
+from src.utils.metrics import Metrics
+
+
+def test_spans_counters_and_exports(tmp_path):
+    m = Metrics()
+    for _ in range(3):
+        with m.span("scan"):
+            pass
+    m.inc("networks_scanned_total", 5)
+    m.inc("reports_total", format="csv")
+
+    summary = m.to_dict()
+    assert summary["stages"]["scan"]["count"] == 3
+    assert summary["counters"]["networks_scanned_total"] == 5
+    assert summary["counters"]['reports_total{format="csv"}'] == 1
+
+    prom = m.to_prometheus()
+    assert "# TYPE wifi_stage_duration_seconds histogram" in prom
+    assert 'wifi_stage_duration_seconds_bucket{stage="scan",le="+Inf"} 3' in prom
+    assert 'wifi_stage_duration_seconds_count{stage="scan"} 3' in prom
+    assert 'wifi_reports_total{format="csv"} 1' in prom
+
+    m.write_json(str(tmp_path / "m.json"))
+    assert json.loads((tmp_path / "m.json").read_text())["stages"]["scan"]["count"] == 3
@@ -0,0 +1,15 @@
+from src.scanner.network import Network, as_dict
+
+
+def test_network_dict_view_matches_legacy_dicts():
+    n = Network("Home", "WPA2", 71)
+    assert n["ssid"] == "Home" and n.get("signal") == 71
+    assert n.get("bssid") is None and n.get("bssid", "x") == "x"
+    assert "bssid" not in n
+    assert dict(n) == {"ssid": "Home", "security": "WPA2", "signal": 71}
+    assert as_dict(n) == as_dict({"ssid": "Home", "security": "WPA2", "signal": 71})
+    assert Network.from_dict({"ssid": "Home", "security": "WPA2", "signal": 71, "extra": 1}) == n
+
+
+def test_network_has_no_instance_dict():
+    assert not hasattr(Network("a", "b"), "__dict__")
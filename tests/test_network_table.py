@@ -0,0 +1,21 @@
+from src.gui.network_table import NetworkTableModel, plan_updates
+from src.scanner.network import Network
+
+
+def test_filter_sort_and_page():
+    model = NetworkTableModel(page_size=2)
+    model.set_networks([Network(f"net{i}", "WPA2" if i % 2 else "WEP", i * 10) for i in range(5)])
+    model.sort_by("signal")
+    assert [v[0] for _, v in model.visible_rows()] == ["net4", "net3"]
+    assert model.page_count == 3
+    model.set_filter("wep", min_signal=10)
+    assert [v[0] for _, v in model.visible_rows()] == ["net4", "net2"]
+    assert model.match_count == 2
+
+
+def test_plan_updates_touches_only_changed_rows():
+    rendered = {"a": ("A", "WPA2", 50), "b": ("B", "WEP", 40)}
+    rows = [("a", ("A", "WPA2", 50)), ("b", ("B", "WEP", 45)), ("c", ("C", "--", 30))]
+    delete, update, insert = plan_updates(rendered, rows)
+    assert delete == [] and update == [("b", ("B", "WEP", 45))] and insert == [(2, "c", ("C", "--", 30))]
+    assert plan_updates(rendered, rows[:1])[0] == ["b"]
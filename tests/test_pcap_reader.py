@@ -0,0 +1,147 @@
+import struct
+from src.capture.pcap_reader import scan_eapol_file, has_handshake
+from src.capture.pcap_parser import pcap_contains_handshake
+
+AP = bytes.fromhex("001122334455")
+STA = bytes.fromhex("66778899aabb")
+RADIOTAP = b"\x00\x00\x08\x00\x00\x00\x00\x00"
+LLC = b"\xaa\xaa\x03\x00\x00\x00\x88\x8e"
+
+
+def _eapol_frame(key_info, from_ap):
+    if from_ap:
+        hdr = b"\x88\x02\x00\x00" + STA + AP + AP
+    else:
+        hdr = b"\x88\x01\x00\x00" + AP + STA + AP
+    eapol = b"\x02\x03\x00\x5f\x02" + struct.pack(">H", key_info) + b"\x00" * 93
+    return RADIOTAP + hdr + b"\x00\x00" + b"\x00\x00" + LLC + eapol
+
+
+def _write_pcap(path, frames):
+    with open(path, "wb") as fh:
+        fh.write(struct.pack("<IHHiIII", 0xA1B2C3D4, 2, 4, 0, 0, 65535, 127))
+        for f in frames:
+            fh.write(struct.pack("<IIII", 0, 0, len(f), len(f)) + f)
+
+
+def _write_pcapng(path, frames):
+    def block(btype, body):
+        body += b"\x00" * (-len(body) % 4)
+        n = len(body) + 12
+        return struct.pack("<II", btype, n) + body + struct.pack("<I", n)
+    with open(path, "wb") as fh:
+        fh.write(block(0x0A0D0D0A, struct.pack("<IHHq", 0x1A2B3C4D, 1, 0, -1)))
+        fh.write(block(1, struct.pack("<HHI", 127, 0, 65535)))
+        for f in frames:
+            fh.write(block(6, struct.pack("<IIIII", 0, 0, 0, len(f), len(f)) + f))
+
+
+def test_pcap_handshake_per_bssid(tmp_path):
+    path = tmp_path / "hs.cap"
+    _write_pcap(path, [b"\x00" * 40, _eapol_frame(0x008A, True), _eapol_frame(0x010A, False)])
+    summary = scan_eapol_file(str(path))
+    assert summary == {"00:11:22:33:44:55": {"frames": 2, "messages": [1, 2]}}
+    assert pcap_contains_handshake(str(path))
+
+
+def test_pcapng_single_message_is_not_a_handshake(tmp_path):
+    path = tmp_path / "hs.pcapng"
+    _write_pcapng(path, [_eapol_frame(0x008A, True)])
+    summary = scan_eapol_file(str(path))
+    assert summary["00:11:22:33:44:55"]["messages"] == [1]
+    assert not has_handshake(summary)
+
+
+def test_simulated_marker_still_detected(tmp_path):
+    path = tmp_path / "x_simulated.cap"
+    path.write_text("SIMULATED HANDSHAKE FOR x\n")
+    assert pcap_contains_handshake(str(path))
+
+
+def test_audit_uses_cache_for_unchanged_files(tmp_path):
+    from src.capture.capture_audit import audit_captures
+    folder = tmp_path / "caps"
+    folder.mkdir()
+    _write_pcap(folder / "a.cap", [_eapol_frame(0x008A, True), _eapol_frame(0x010A, False)])
+    (folder / "b_simulated.cap").write_text("nothing here\n")
+    cache = str(tmp_path / "cache.json")
+
+    first = audit_captures(str(folder), cache)
+    assert first["analyzed"] == 2 and first["cached"] == 0
+    assert first["results"][str(folder / "a.cap")]["handshake"]
+
+    (folder / "b_simulated.cap").write_text("SIMULATED HANDSHAKE FOR b\n")
+    second = audit_captures(str(folder), cache)
+    assert second["analyzed"] == 1 and second["cached"] == 1
+    assert second["results"][str(folder / "b_simulated.cap")]["handshake"]
+
+
+def test_capture_store_dedupes_and_audit_reads_gzip_blobs(tmp_path):
+    from src.capture.capture_audit import audit_captures
+    from src.capture.capture_store import CaptureStore
+
+    pcap = tmp_path / "hs.cap"
+    _write_pcap(pcap, [_eapol_frame(0x008A, True), _eapol_frame(0x010A, False)])
+    store = CaptureStore(str(tmp_path / "store"))
+    first = store.put_file(str(pcap), ssid="Lab/5G", bssid="00:11:22:33:44:55")
+    again = store.put_file(str(pcap), ssid="Lab/5G", bssid="00:11:22:33:44:55")
+    store.put_bytes(b"SIMULATED HANDSHAKE FOR x\n", ssid="x")
+
+    assert first["digest"] == again["digest"] and again["deduplicated"]
+    assert store.read(first["digest"]) == pcap.read_bytes()
+    assert [e["digest"] for e in store.find(bssid="00:11:22:33:44:55")] == [first["digest"]] * 2
+    assert store.usage()["captures"] == 3 and store.usage()["blobs"] == 2
+
+    blob = store.blob_path(first["digest"])
+    assert pcap_contains_handshake(blob)
+    results = audit_captures(str(tmp_path / "store"), str(tmp_path / "cache.json"))["results"]
+    assert results[blob]["format"] == "pcap" and results[blob]["handshake"]
+    assert sum(r["handshake"] for r in results.values()) == 2
+
+
+def test_gzip_capture_is_streamed_not_copied(tmp_path, monkeypatch):
+    import gzip
+    import tempfile
+    from src.capture.pcap_parser import eapol_summary
+
+    monkeypatch.setattr(tempfile, "mkstemp", lambda *a, **k: (_ for _ in ()).throw(AssertionError("temp copy")))
+    frames = [b"\x00" * 40, _eapol_frame(0x008A, True), _eapol_frame(0x010A, False)]
+    for name, write in (("hs.cap", _write_pcap), ("hs.pcapng", _write_pcapng)):
+        plain = tmp_path / name
+        write(plain, frames)
+        packed = tmp_path / (name + ".gz")
+        packed.write_bytes(gzip.compress(plain.read_bytes()))
+        assert eapol_summary(str(packed)) == scan_eapol_file(str(plain))
+        assert pcap_contains_handshake(str(packed))
+
+
+def test_audit_does_not_cache_failures(tmp_path, monkeypatch):
+    from src.capture import capture_audit
+    folder = tmp_path / "caps"
+    folder.mkdir()
+    _write_pcap(folder / "a.cap", [_eapol_frame(0x008A, True), _eapol_frame(0x010A, False)])
+    cache = str(tmp_path / "cache.json")
+    real = capture_audit.analyze_capture
+    monkeypatch.setattr(capture_audit, "analyze_capture",
+                        lambda path: {"format": "", "handshake": False, "bssids": {}, "error": "Permission denied"})
+    assert "error" in capture_audit.audit_captures(str(folder), cache)["results"][str(folder / "a.cap")]
+    monkeypatch.setattr(capture_audit, "analyze_capture", real)
+    second = capture_audit.audit_captures(str(folder), cache)
+    assert second["analyzed"] == 1 and second["results"][str(folder / "a.cap")]["handshake"]
+
+
+def test_short_pcapng_packet_block_is_skipped(tmp_path):
+    import gzip
+    from src.capture.pcap_parser import eapol_summary
+
+    path = tmp_path / "bad.pcapng"
+    _write_pcapng(path, [_eapol_frame(0x008A, True), _eapol_frame(0x010A, False)])
+    data = path.read_bytes()
+    shb_idb = 28 + 20
+    # an Enhanced Packet Block claiming 16 bytes: too short for its fixed fields
+    bad = struct.pack("<II", 6, 16) + struct.pack("<I", 0) + struct.pack("<I", 16)
+    path.write_bytes(data[:shb_idb] + bad + data[shb_idb:])
+    packed = tmp_path / "bad.pcapng.gz"
+    packed.write_bytes(gzip.compress(path.read_bytes()))
+    for p in (path, packed):
+        assert eapol_summary(str(p))["00:11:22:33:44:55"]["messages"] == [1, 2]
@@ -5,3 +5,89 @@ def test_generate_json(tmp_path):
     networks = [{"ssid":"A","security":"WPA2","signal":50}]
     path = generate_report(networks, str(outfile))
     assert os.path.exists(path)
+
+
+def test_stream_formats_from_generator(tmp_path):
+    import csv
+    import json
+    from src.report.report_generator import generate_report_stream
+    from src.scanner.network import Network
+
+    def rows():
+        for i in range(3):
+            yield Network(f"net{i}", "WPA2", 40 + i, bssid=f"aa:00:00:00:00:0{i}")
+
+    doc = json.loads(open(generate_report_stream(rows(), str(tmp_path / "r.json"))).read())
+    assert [n["ssid"] for n in doc["networks"]] == ["net0", "net1", "net2"]
+    lines = open(generate_report_stream(rows(), str(tmp_path / "r.ndjson"))).read().splitlines()
+    assert json.loads(lines[2])["signal"] == 42
+    with open(generate_report_stream(rows(), str(tmp_path / "r.csv"))) as fh:
+        assert next(csv.DictReader(fh))["bssid"] == "aa:00:00:00:00:00"
+    html = open(generate_report_stream(rows(), str(tmp_path / "r.html"))).read()
+    assert "<strong>net2</strong>" in html
+
+
+def test_fleet_reports_merge_by_bssid_or_ssid_security(tmp_path):
+    import csv
+    from src.report.fleet import write_fleet_report
+    from src.report.report_generator import generate_report_stream
+
+    a = [{"ssid": "Lab", "security": "WPA2", "signal": 40, "bssid": "AA:BB:CC:00:00:01"},
+         {"ssid": "Guest", "security": "--", "signal": 30}]
+    b = [{"ssid": "Lab", "security": "WPA2", "signal": 70, "bssid": "aa:bb:cc:00:00:01"},
+         {"ssid": "Guest", "security": "WPA2", "signal": 20}]
+    (tmp_path / "site1").mkdir()
+    (tmp_path / "site2").mkdir()
+    generate_report(a, str(tmp_path / "site1" / "report.json"))
+    generate_report_stream(b, str(tmp_path / "site2" / "report.ndjson"))
+    (tmp_path / "site2" / "broken.json").write_text("{")
+
+    summary = write_fleet_report([str(tmp_path)], str(tmp_path / "fleet.csv"))
+    assert summary["reports"] == 3 and list(summary["errors"]) == [str(tmp_path / "site2" / "broken.json")]
+    with open(tmp_path / "fleet.csv") as fh:
+        rows = {(r["ssid"], r["security"]): r for r in csv.DictReader(fh)}
+    assert len(rows) == 3
+    lab = rows[("Lab", "WPA2")]
+    assert (lab["signal"], lab["sensors"], lab["best_sensor"]) == ("70", "2", str(tmp_path / "site2" / "report"))
+    with open(tmp_path / "fleet.csv") as fh:
+        # site1 rows carry channel_congestion, site2 rows don't: the header is fixed, not the first row's
+        header = next(csv.reader(fh))
+    assert header[-4:] == ["category", "risk", "sensors", "best_sensor"] and "channel_congestion" not in header
+
+
+def test_sharded_html_reuses_unchanged_shards(tmp_path):
+    from src.report.html_shards import write_sharded_html
+    from src.scanner.network import Network
+
+    nets = [Network(f"net{i}", "WPA2", i % 100, bssid=f"aa:00:00:00:{i // 256:02x}:{i % 256:02x}") for i in range(2500)]
+    out = str(tmp_path / "site")
+    first = write_sharded_html(nets, out, shard_size=1000)
+    assert (first["shards"], first["written"], first["rows"]) == (3, 3, 2500)
+    index = open(first["index"]).read()
+    assert index.count("shards/shard-") == 3 and "net0" not in index
+
+    nets[-1] = Network("renamed", "WEP", 5, bssid="aa:00:00:00:09:c3")
+    second = write_sharded_html(nets, out, shard_size=1000)
+    assert (second["written"], second["reused"], second["removed"]) == (1, 2, 1)
+    assert len(list((tmp_path / "site" / "shards").iterdir())) == 3
+
+
+def test_sharded_html_swaps_index_before_removing_shards(tmp_path, monkeypatch):
+    import os
+    from src.report.html_shards import write_sharded_html
+    from src.scanner.network import Network
+
+    out = tmp_path / "site"
+    write_sharded_html([Network("old", "WPA2", 50, bssid="aa:00:00:00:00:01")], str(out))
+    removed = []
+    real_remove = os.remove
+
+    def remove(path):
+        # the live index must already point at the new shards
+        assert os.path.basename(path) not in (out / "index.html").read_text()
+        removed.append(path)
+        real_remove(path)
+    monkeypatch.setattr(os, "remove", remove)
+    result = write_sharded_html([Network("new", "WPA2", 50, bssid="aa:00:00:00:00:02")], str(out))
+    assert result["removed"] == len(removed) == 1
+    assert sorted(p.name for p in out.iterdir()) == ["index.html", "shards"]
@@ -0,0 +1,44 @@
+import threading
+import time
+
+from src.scanner.network import Network
+from src.scanner.scan_cache import ScanCache
+
+
+def _slow_scanner(calls):
+    def scan(interfaces, timeout):
+        calls.append(interfaces)
+        time.sleep(0.2)
+        return [Network("Lab", "WPA2", 60, bssid="aa:bb:cc:dd:ee:ff")]
+    return scan
+
+
+def test_single_flight_and_ttl():
+    calls = []
+    cache = ScanCache(ttl=0.5, scan_fn=_slow_scanner(calls))
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(cache.scan(["wlan0"], 5))) for _ in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert len(calls) == 1
+    assert sorted(cached for _, cached in results) == [False] + [True] * 7
+    assert cache.scan(["wlan0"], 5) == (results[0][0], True)
+    assert cache.scan(["wlan0"], 5, force=True)[1] is False
+    time.sleep(0.6)
+    assert cache.scan(["wlan0"], 5)[1] is False
+    assert len(calls) == 3
+
+
+def test_file_backed_cache_shared_between_instances(tmp_path):
+    path = str(tmp_path / "scan_cache.json")
+    calls = []
+    nets, cached = ScanCache(ttl=30, path=path, scan_fn=_slow_scanner(calls)).scan(None, 5)
+    other = ScanCache(ttl=30, path=path, scan_fn=_slow_scanner(calls))
+    assert other.scan(None, 5) == (nets, True)
+    assert len(calls) == 1
+
+    errors = ScanCache(ttl=30, scan_fn=lambda i, t: [Network("(error)", "(none)", 0, error="boom")])
+    errors.scan(None, 5)
+    assert errors.scan(None, 5)[1] is False
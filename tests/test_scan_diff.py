@@ -0,0 +1,45 @@
+import argparse
+import json
+
+from src.scanner.scan_diff import diff_scans, index_networks
+
+
+def test_diff_reports_only_changes():
+    prev = index_networks([
+        {"ssid": "A", "security": "WPA2", "signal": 70},
+        {"ssid": "B", "security": "WPA2", "signal": 50},
+        {"ssid": "C", "security": "WEP", "signal": 40},
+    ])
+    cur = index_networks([
+        {"ssid": "A", "security": "WPA2", "signal": 72},
+        {"ssid": "B", "security": "WEP", "signal": 50},
+        {"ssid": "D", "security": "OPEN", "signal": 30},
+    ])
+    events, baseline = diff_scans(prev, cur, signal_threshold=5)
+    kinds = {(e["event"], e["key"]) for e in events}
+    assert kinds == {("changed", "B"), ("appeared", "D"), ("vanished", "C")}
+    # small signal jitter keeps the previously reported value as baseline
+    assert baseline["A"]["signal"] == 70
+
+
+def test_watch_pipeline_reports_everything_then_only_changes(tmp_path, capsys):
+    from src.main import run_assessment
+
+    scans = iter([
+        [{"ssid": "A", "security": "WPA2", "signal": 70}],
+        [{"ssid": "A", "security": "WPA2", "signal": 71}],
+        [{"ssid": "A", "security": "WEP", "signal": 71}, {"ssid": "B", "security": "WPA2", "signal": 40}],
+    ])
+
+    def scan():
+        try:
+            return next(scans), False
+        except StopIteration:
+            raise EOFError  # ends the watch like an exhausted replay
+    out = tmp_path / "watch.ndjson"
+    args = argparse.Namespace(watch=True, scan=False, interval=0, signal_threshold=5, watch_output=str(out),
+                              simulate_capture=False, capture_workers=None, report_format=None)
+    run_assessment(args, {}, scan, None, None)
+    assert capsys.readouterr().out.splitlines() == [
+        "+ 'A' | WPA2 | signal=70", "~ 'A' | security WPA2->WEP", "+ 'B' | WPA2 | signal=40"]
+    assert [json.loads(line)["event"] for line in out.read_text().splitlines()] == ["appeared", "changed", "appeared"]
@@ -0,0 +1,34 @@
+import pandas as pd
+
+from src.analytics.signal_history import (
+    history_from_scans, quality_buckets, rolling_signal_stats, uptime_and_flaps,
+)
+from src.scanner.network import Network
+from src.scanner.signal_utils import signal_to_quality
+
+
+def _history():
+    a = Network("A", "WPA2", 70, bssid="AA:00:00:00:00:01")
+    b = Network("B", "WEP", 30)
+    scans = [(0, [a, b]), (60, [a]), (120, [Network("A", "WPA2", 40, bssid="aa:00:00:00:00:01"), b]), (180, [b])]
+    return history_from_scans(scans)
+
+
+def test_quality_buckets_match_scalar_helper():
+    df = _history()
+    signals = [0, 29, 30, 49, 50, 69, 70, 100]
+    assert list(quality_buckets(pd.Series(signals))) == [signal_to_quality(s) for s in signals]
+    assert len(quality_buckets(df["signal"])) == len(df)
+
+
+def test_rolling_stats_per_network():
+    stats = rolling_signal_stats(_history(), window=2)
+    a = stats[stats["key"] == "aa:00:00:00:00:01"]
+    assert list(a["rolling_mean"]) == [70.0, 70.0, 55.0]
+
+
+def test_uptime_and_flaps():
+    out = uptime_and_flaps(_history())
+    assert out.loc["A", "scans_seen"] == 3 and out.loc["A", "flaps"] == 0
+    assert out.loc["B", "flaps"] == 1
+    assert out.loc["B", "uptime"] == 0.75
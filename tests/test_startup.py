@@ -0,0 +1,13 @@
+from benchmarks.bench_startup import SCENARIOS, load_budget, measure
+
+
+def test_cli_startup_does_not_import_heavy_modules(tmp_path):
+    # replayed scans and a throwaway environment: no radio scan, and no writes
+    # to the history DB / caches a local .env may configure
+    env = {"RECORD_HISTORY": "false", "HISTORY_DB": str(tmp_path / "history.db"), "SCAN_CACHE_FILE": "",
+           "METRICS_JSON": "", "METRICS_PROM": ""}
+    forbidden = set(load_budget()["forbidden_modules"])
+    for name, argv in (("import", SCENARIOS["import"]), ("scan", SCENARIOS["scan"] + ["--replay-synthetic", "50"])):
+        _, extra = measure(argv, runs=1, env=env)
+        assert not forbidden & {m.split(".")[0] for m in extra}, name
+        assert "src.scanner.replay" in extra or name != "scan"
@@ -7,3 +7,64 @@ def test_parse_nmcli_output_basic():
     assert isinstance(networks, list)
     assert networks[0]["ssid"] == "Home"
     assert networks[0]["security"].strip() == "WPA2"
+
+
+def test_scan_interfaces_merges_and_times_out(tmp_path, monkeypatch):
+    from src.scanner.async_scanner import scan_interfaces
+    fake = tmp_path / "nmcli"
+    fake.write_text(
+        "#!/bin/sh\n"
+        'case "$*" in\n'
+        "  *wlan0*) printf '%s\\n' 'Home:AA\\:BB\\:CC\\:00\\:00\\:01:WPA2:60:1:2412 MHz:54 Mbit/s:Infra'\n"
+        "           printf '%s\\n' 'Cafe:AA\\:BB\\:CC\\:00\\:00\\:02::40:6:2437 MHz:54 Mbit/s:Infra' ;;\n"
+        "  *wlan1*) printf '%s\\n' 'Home:AA\\:BB\\:CC\\:00\\:00\\:01:WPA2:75:36:5180 MHz:270 Mbit/s:Infra' ;;\n"
+        "  *) exec sleep 10 ;;\n"
+        "esac\n"
+    )
+    fake.chmod(0o755)
+    monkeypatch.setenv("PATH", f"{tmp_path}:/usr/bin:/bin")
+    networks = scan_interfaces(["wlan0", "wlan1", "wlan2"], timeout=0.5)
+    by_ssid = {n["ssid"]: n for n in networks}
+    assert by_ssid["Home"]["signal"] == 75
+    assert "Cafe" in by_ssid
+    assert "wlan2" in by_ssid["(error)"]["error"]
+
+
+def test_parse_nmcli_terse_unescapes_and_extracts_fields():
+    from src.scanner.wifi_scanner import parse_nmcli_terse
+    raw = (
+        "My\\:Net  2:AA\\:BB\\:CC\\:DD\\:EE\\:FF:WPA1 WPA2:71:11:2462 MHz:130 Mbit/s:Infra\n"
+        ":11\\:22\\:33\\:44\\:55\\:66::20:36:5180 MHz:54 Mbit/s:Infra\n"
+    )
+    first, hidden = parse_nmcli_terse(raw)
+    assert first["ssid"] == "My:Net  2"
+    assert first["bssid"] == "AA:BB:CC:DD:EE:FF"
+    assert (first["security"], first["signal"], first["channel"]) == ("WPA1 WPA2", 71, 11)
+    assert (first["frequency"], first["rate"], first["mode"]) == (2462, 130, "Infra")
+    assert hidden["ssid"] == "<hidden>" and hidden["security"] == "--"
+
+
+def test_record_and_replay_scans(tmp_path):
+    from src.scanner import wifi_scanner
+    from src.scanner.replay import ReplayBackend, ReplayExhausted, ScanRecorder, synthetic_terse_scan
+
+    recording = str(tmp_path / "scans.ndjson")
+    recorder = ScanRecorder(recording)
+    wifi_scanner.set_scan_recorder(recorder)
+    wifi_scanner.set_scan_backend(ReplayBackend(synthetic_aps=300))
+    try:
+        first = wifi_scanner.scan_networks()
+        wifi_scanner.scan_networks()
+        wifi_scanner.set_scan_recorder(None)
+        recorder.close()
+
+        wifi_scanner.set_scan_backend(ReplayBackend(recording))
+        assert wifi_scanner.scan_networks() == first
+        wifi_scanner.scan_networks()
+        with pytest.raises(ReplayExhausted):
+            wifi_scanner.scan_networks()
+    finally:
+        wifi_scanner.set_scan_backend(None)
+        wifi_scanner.set_scan_recorder(None)
+    assert len(first) == 300 and first[0].bssid == "00:00:00:00:00:00"
+    assert synthetic_terse_scan(5, 0) != synthetic_terse_scan(5, 1)